@@ -0,0 +1,130 @@
+from typing import Dict, Optional, Tuple, cast
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Board, Player
+from mancala.position import Position, get_canonical_position, get_successors
+from mancala.tables import get_game_tables
+
+# Only search for a decided outcome once this few pieces remain in the bins,
+# which keeps the exhaustive search over every continuation cheap.
+DECIDED_SEARCH_PIECE_LIMIT = 4
+
+Outcome = Optional[Player]
+# Outcomes for the player to move: they win, tie or lose
+MoverOutcome = int
+MOVER_WINS = 1
+MOVER_TIES = 0
+MOVER_LOSES = -1
+# The least and the most the player to move gains over their opponent from
+# the pieces left in the bins, over every continuation of the game
+MarginRange = Tuple[int, int]
+# Keyed on the bins seen from the player to move, see `get_canonical_position`
+OutcomeMemo = Dict[Position, MarginRange]
+
+# Searched positions are the same from game to game, so every game of a
+# config shares one memo. It holds an entry for at most every way to spread
+# up to `DECIDED_SEARCH_PIECE_LIMIT` pieces over the bins, 1820 on the default
+# board, so it needs no bound
+_outcome_memos: Dict[GameConfig, OutcomeMemo] = {}
+
+
+def _get_mover_outcome(player_goal: int, opponent_goal: int) -> MoverOutcome:
+    if player_goal > opponent_goal:
+        return MOVER_WINS
+    elif player_goal < opponent_goal:
+        return MOVER_LOSES
+    return MOVER_TIES
+
+
+def _get_outcome(mover_outcome: MoverOutcome, player: Player) -> Outcome:
+    if mover_outcome == MOVER_TIES:
+        return None
+    if mover_outcome == MOVER_WINS:
+        return player
+    return Player.ONE if player == Player.TWO else Player.TWO
+
+
+def _get_margin_range(
+    position: Position, memo: OutcomeMemo, config: GameConfig
+) -> MarginRange:
+    """The margins the player to move can gain from the bins of `position`.
+
+    `position` is seen from the player to move and has empty goals. Goals
+    only ever grow, so the first goal over half of the pieces wins just as
+    if the game was played out to its end. The winner therefore only
+    depends on the goals and the margins gained from the bins, which lets
+    every position with the same bins share an entry of the memo.
+
+    """
+    if position in memo:
+        return memo[position]
+
+    number_of_bins = config.number_of_bins
+    if not any(position[:number_of_bins]):
+        # The game ends and both players keep the pieces left on their side
+        margin = -sum(position[number_of_bins + 1 : -1])
+        margin_range = (margin, margin)
+    else:
+        lowest: Optional[int] = None
+        highest: Optional[int] = None
+        for _, child, next_player, _ in get_successors(position, Player.ONE, config):
+            gained = child[number_of_bins]
+            child_bins = (*child[:number_of_bins], 0, *child[number_of_bins + 1 :])
+            if next_player == Player.ONE:
+                low, high = _get_margin_range(child_bins, memo, config)
+            else:
+                canonical_bins, _ = get_canonical_position(
+                    child_bins, next_player, config
+                )
+                opponent_low, opponent_high = _get_margin_range(
+                    canonical_bins, memo, config
+                )
+                low, high = -opponent_high, -opponent_low
+            lowest = gained + low if lowest is None else min(lowest, gained + low)
+            highest = gained + high if highest is None else max(highest, gained + high)
+        margin_range = (cast(int, lowest), cast(int, highest))
+
+    memo[position] = margin_range
+    return margin_range
+
+
+def get_decided_outcome(
+    board: Board,
+    player_to_move: Player,
+    memo: Optional[OutcomeMemo] = None,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Tuple[bool, Outcome]:
+    """Check whether every continuation of the game ends with the same winner.
+
+    Returns a tuple of whether the outcome is decided and, if so, the winning
+    player (`None` for a tie). Positions with more than
+    `DECIDED_SEARCH_PIECE_LIMIT` pieces left in the bins are only decided once
+    a goal passes half of the pieces. Without a `memo`, searches share one
+    with every other game of the same config.
+
+    """
+    player_one_goal = board[Player.ONE].goal
+    player_two_goal = board[Player.TWO].goal
+    winning_threshold = get_game_tables(config).winning_threshold
+    if player_one_goal > winning_threshold or player_two_goal > winning_threshold:
+        return True, _get_outcome(
+            _get_mover_outcome(player_one_goal, player_two_goal), Player.ONE
+        )
+
+    pieces_in_bins = sum(board[Player.ONE].bins) + sum(board[Player.TWO].bins)
+    if pieces_in_bins > DECIDED_SEARCH_PIECE_LIMIT:
+        return False, None
+
+    if memo is None:
+        memo = _outcome_memos.setdefault(config, {})
+    opponent = Player.ONE if player_to_move == Player.TWO else Player.TWO
+    player_row = board[player_to_move]
+    opponent_row = board[opponent]
+    lowest, highest = _get_margin_range(
+        (*player_row.bins, 0, *opponent_row.bins, 0), memo, config
+    )
+    goal_margin = player_row.goal - opponent_row.goal
+    mover_outcome = _get_mover_outcome(goal_margin + lowest, 0)
+    if mover_outcome == _get_mover_outcome(goal_margin + highest, 0):
+        return True, _get_outcome(mover_outcome, player_to_move)
+    return False, None
@@ -0,0 +1,119 @@
+from typing import Dict, List, Optional, Tuple
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import PlayerRow, play_move
+from mancala.position import Position
+from mancala.tables import LANDS_IN_GOAL, get_game_tables
+
+_PlayedMove = Tuple[PlayerRow, PlayerRow, int]
+
+
+class MoveAnalysis:
+    """What each legal move does from one position, worked out on demand.
+
+    Every field is computed the first time it is asked for and kept, so
+    strategies and the engine can share one analysis of the position
+    instead of each sowing the same moves again. Rows are from the point of
+    view of the player to move. The capture and the resulting rows need the
+    opponent's row; the other fields only depend on the player's row.
+
+    """
+
+    def __init__(
+        self,
+        player_row: PlayerRow,
+        opponent_row: Optional[PlayerRow] = None,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+    ):
+        self._player_row = player_row
+        self._opponent_row = opponent_row
+        self._config = config
+        self._tables = get_game_tables(config)
+        self._legal_bins: Optional[List[int]] = None
+        self._played: Dict[int, _PlayedMove] = {}
+
+    @property
+    def player_row(self) -> PlayerRow:
+        return self._player_row
+
+    @property
+    def opponent_row(self) -> Optional[PlayerRow]:
+        return self._opponent_row
+
+    @property
+    def config(self) -> GameConfig:
+        return self._config
+
+    @property
+    def legal_bins(self) -> List[int]:
+        """The player's non-empty bins, in order."""
+        if self._legal_bins is None:
+            self._legal_bins = [
+                i for i, b_i in enumerate(self._player_row.bins) if b_i > 0
+            ]
+        return self._legal_bins
+
+    def _get_pieces(self, selected_bin: int) -> int:
+        upper_bound = self._config.number_of_bins - 1
+        if selected_bin < 0 or selected_bin > upper_bound:
+            raise ValueError(f"bin must be between 0 and {upper_bound}, inclusive")
+        pieces = self._player_row.bins[selected_bin]
+        if pieces == 0:
+            raise ValueError("selected bin must contain pieces")
+        return pieces
+
+    def landing(self, selected_bin: int) -> int:
+        """Where the last piece lands: one of the player's bins or a `LANDS_IN_*`."""
+        pieces = self._get_pieces(selected_bin)
+        return self._tables.landing[selected_bin][
+            (pieces - 1) % self._tables.lap_length
+        ]
+
+    def extra_turn(self, selected_bin: int) -> bool:
+        return self.landing(selected_bin) == LANDS_IN_GOAL
+
+    def seeds_to_opponent(self, selected_bin: int) -> int:
+        """How many of the pieces are sown into the opponent's row."""
+        pieces = self._get_pieces(selected_bin)
+        number_of_bins = self._config.number_of_bins
+        full_laps, remaining_pieces = divmod(pieces, self._tables.lap_length)
+        pieces_past_goal = max(remaining_pieces - selected_bin - 1, 0)
+        return full_laps * number_of_bins + min(pieces_past_goal, number_of_bins)
+
+    def _play(self, selected_bin: int) -> _PlayedMove:
+        if selected_bin not in self._played:
+            self._get_pieces(selected_bin)
+            if self._opponent_row is None:
+                raise ValueError("analysis requires opponent_row be provided")
+            player_bins = list(self._player_row.bins)
+            opponent_bins = list(self._opponent_row.bins)
+            goal_pieces, _, captured_pieces = play_move(
+                player_bins, opponent_bins, selected_bin, self._config
+            )
+            self._played[selected_bin] = (
+                PlayerRow.trusted(
+                    player_bins, self._player_row.goal + goal_pieces, self._config
+                ),
+                PlayerRow.trusted(opponent_bins, self._opponent_row.goal, self._config),
+                captured_pieces,
+            )
+        return self._played[selected_bin]
+
+    def captured_pieces(self, selected_bin: int) -> int:
+        """How many of the opponent's pieces the move captures."""
+        return self._play(selected_bin)[2]
+
+    def resulting_rows(self, selected_bin: int) -> Tuple[PlayerRow, PlayerRow]:
+        """The player's and the opponent's rows once the move is played."""
+        player_row, opponent_row, _ = self._play(selected_bin)
+        return player_row, opponent_row
+
+    def resulting_position(self, selected_bin: int) -> Position:
+        """The position once the move is played, with the player's row first."""
+        player_row, opponent_row = self.resulting_rows(selected_bin)
+        return (
+            *player_row.bins,
+            player_row.goal,
+            *opponent_row.bins,
+            opponent_row.goal,
+        )
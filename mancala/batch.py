@@ -0,0 +1,421 @@
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player
+from mancala.position import (
+    apply_move,
+    get_final_margin,
+    get_new_position,
+    get_row_offset,
+)
+from mancala.rng import get_rng, use_thread_rng
+from mancala.shared_results import SharedResultTable
+from mancala.simulation import GameResult, SimulationLoop
+from mancala.strategy import PlayerStrategy, get_simple_strategies
+from mancala.tables import get_game_tables
+
+# Games are seeded individually so results do not depend on how a run is split up
+_GAME_SEED_STRIDE = 2 ** 32
+
+
+def _seed_game(seed: int, game_index: int) -> None:
+    get_rng().seed(seed * _GAME_SEED_STRIDE + game_index)
+
+
+@contextmanager
+def _games_rng(seed: Optional[int]) -> Iterator[None]:
+    """Draw seeded games from a generator of their own.
+
+    Reseeding the caller's generator, the global one outside threads, would
+    make the caller's own random draws repeat. Unseeded games draw from the
+    calling thread's generator as usual.
+
+    """
+    if seed is None:
+        yield
+        return
+    with use_thread_rng(random.Random()):
+        yield
+
+
+def play_games(
+    player_one: PlayerStrategy,
+    player_two: PlayerStrategy,
+    games: int,
+    starting_player: Optional[Player] = None,
+    adjudicate_when_decided: bool = False,
+    seed: Optional[int] = None,
+    first_game: int = 0,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Iterator[SimulationLoop]:
+    """Lazily play `games` games, seeding each one from `seed` and its index.
+
+    Yields every finished `SimulationLoop`, with the turns and boards of
+    its game.
+
+    """
+    for game_index in range(first_game, first_game + games):
+        with _games_rng(seed):
+            if seed is not None:
+                _seed_game(seed, game_index)
+            loop = SimulationLoop(
+                player_one=player_one,
+                player_two=player_two,
+                starting_player=starting_player,
+                adjudicate_when_decided=adjudicate_when_decided,
+                config=config,
+            )
+            loop.run()
+        yield loop
+
+
+def simulate_games(
+    player_one: PlayerStrategy,
+    player_two: PlayerStrategy,
+    games: int,
+    starting_player: Optional[Player] = None,
+    adjudicate_when_decided: bool = False,
+    seed: Optional[int] = None,
+    first_game: int = 0,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Iterator[GameResult]:
+    """Lazily play `games` games, seeding each one from `seed` and its index."""
+    loops = play_games(
+        player_one,
+        player_two,
+        games,
+        starting_player,
+        adjudicate_when_decided,
+        seed,
+        first_game,
+        config,
+    )
+    for loop in loops:
+        yield loop.get_result()
+
+
+def simulate_games_in_step(
+    player_one: PlayerStrategy,
+    player_two: PlayerStrategy,
+    games: int,
+    starting_player: Optional[Player] = None,
+    seed: Optional[int] = None,
+    first_game: int = 0,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> List[GameResult]:
+    """Play `games` games side by side, one ply of every game at a time.
+
+    Each ply, every strategy chooses the moves of all the games it is to
+    move in with one `choose_bins` call, so strategies valuing positions in
+    batches value those of every game together. Starting players are drawn
+    as in `simulate_games`, so deterministic strategies play the same games,
+    while random choices are drawn in a different order. Games are played on
+    flat positions, without boards, turns or adjudication.
+
+    """
+    if player_one.config != config or player_two.config != config:
+        raise ValueError("player strategies must use the same config as the games")
+    with _games_rng(seed):
+        return _play_games_in_step(
+            player_one, player_two, games, starting_player, seed, first_game, config
+        )
+
+
+def _play_games_in_step(
+    player_one: PlayerStrategy,
+    player_two: PlayerStrategy,
+    games: int,
+    starting_player: Optional[Player],
+    seed: Optional[int],
+    first_game: int,
+    config: GameConfig,
+) -> List[GameResult]:
+    number_of_bins = config.number_of_bins
+    winning_threshold = get_game_tables(config).winning_threshold
+    strategies = {Player.ONE: player_one, Player.TWO: player_two}
+    starting_players = []
+    for game_index in range(first_game, first_game + games):
+        if starting_player is not None:
+            starting_players.append(starting_player)
+            continue
+        if seed is not None:
+            _seed_game(seed, game_index)
+        starting_players.append(get_rng().choice([Player.ONE, Player.TWO]))
+
+    positions = [get_new_position(config)] * games
+    players = list(starting_players)
+    plies = [0] * games
+    results: List[Optional[GameResult]] = [None] * games
+    playing = list(range(games))
+    while playing:
+        # Games are split by who is to move before any of them moves
+        movers = {
+            player: [game for game in playing if players[game] == player]
+            for player in strategies
+        }
+        for player, games_to_move in movers.items():
+            if not games_to_move:
+                continue
+            offset = get_row_offset(player, config)
+            chosen_bins = strategies[player].choose_bins(
+                [(positions[game], player) for game in games_to_move]
+            )
+            for game, selected_bin in zip(games_to_move, chosen_bins):
+                if positions[game][offset + selected_bin] == 0:
+                    raise ValueError(
+                        "Player strategies need to ensure they pick non-empty bins"
+                    )
+                positions[game], players[game] = apply_move(
+                    positions[game], player, selected_bin, config
+                )
+                plies[game] += 1
+
+        still_playing = []
+        for game in playing:
+            position = positions[game]
+            if get_final_margin(position, players[game], config) is None:
+                still_playing.append(game)
+                continue
+            player_one_goal = position[number_of_bins]
+            player_two_goal = position[-1]
+            if max(player_one_goal, player_two_goal) <= winning_threshold:
+                # The player to move cannot, so the bins go to their own side
+                player_one_goal += sum(position[:number_of_bins])
+                player_two_goal += sum(position[number_of_bins + 1 : -1])
+            if player_one_goal > player_two_goal:
+                winning_player: Optional[Player] = Player.ONE
+            elif player_two_goal > player_one_goal:
+                winning_player = Player.TWO
+            else:
+                winning_player = None
+            results[game] = GameResult(
+                winning_player=winning_player,
+                starting_player=starting_players[game],
+                plies=plies[game],
+                player_one_goal=player_one_goal,
+                player_two_goal=player_two_goal,
+            )
+        playing = still_playing
+    return [result for result in results if result is not None]
+
+
+def _write_results(
+    table: SharedResultTable,
+    start: int,
+    stop: int,
+    player_one: PlayerStrategy,
+    player_two: PlayerStrategy,
+    starting_player: Optional[Player],
+    adjudicate_when_decided: bool,
+    seed: int,
+    config: GameConfig,
+) -> None:
+    results = simulate_games(
+        player_one,
+        player_two,
+        stop - start,
+        starting_player=starting_player,
+        adjudicate_when_decided=adjudicate_when_decided,
+        seed=seed,
+        first_game=start,
+        config=config,
+    )
+    for game_index, result in enumerate(results, start=start):
+        table.write(game_index, result)
+
+
+def _simulate_into_table(
+    table_name: str, games: int, start: int, stop: int, *settings
+) -> None:
+    table = SharedResultTable.attach(table_name, games)
+    try:
+        _write_results(table, start, stop, *settings)
+    finally:
+        table.close()
+
+
+def simulate_games_in_processes(
+    player_one: PlayerStrategy,
+    player_two: PlayerStrategy,
+    games: int,
+    starting_player: Optional[Player] = None,
+    adjudicate_when_decided: bool = False,
+    seed: int = 0,
+    processes: Optional[int] = None,
+    chunk_size: int = 1000,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> SharedResultTable:
+    """Play `games` games across a process pool into a shared result table.
+
+    Workers only receive an index range and write each game's row straight
+    into the table, so results are aggregated without pickling them back.
+    The caller owns the returned table and should `close` it when done.
+    Using a single process plays every range in the calling process.
+
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size should be positive")
+    processes = processes or os.cpu_count() or 1
+    table = SharedResultTable(games)
+    index_ranges = [
+        (start, min(start + chunk_size, games)) for start in range(0, games, chunk_size)
+    ]
+    settings = (
+        player_one,
+        player_two,
+        starting_player,
+        adjudicate_when_decided,
+        seed,
+        config,
+    )
+    try:
+        if processes == 1:
+            for start, stop in index_ranges:
+                _simulate_into_table(table.name, games, start, stop, *settings)
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                futures = [
+                    executor.submit(
+                        _simulate_into_table, table.name, games, start, stop, *settings
+                    )
+                    for start, stop in index_ranges
+                ]
+                for future in futures:
+                    future.result()
+    except BaseException:
+        table.close()
+        raise
+    return table
+
+
+def is_free_threaded() -> bool:
+    """Whether Python threads run in parallel, on a build of CPython without a GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def simulate_games_in_threads(
+    player_one: PlayerStrategy,
+    player_two: PlayerStrategy,
+    games: int,
+    starting_player: Optional[Player] = None,
+    adjudicate_when_decided: bool = False,
+    seed: int = 0,
+    threads: Optional[int] = None,
+    chunk_size: int = 1000,
+    fall_back_to_processes: bool = True,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> SharedResultTable:
+    """Play `games` games across a thread pool into a result table.
+
+    Nothing is pickled and no process is started, but both strategies must
+    be `thread_safe`. Each thread draws from a random generator of its own,
+    seeded per game as in `simulate_games_in_processes`, so both return the
+    same results. Threads only play in parallel on free-threaded builds, so
+    elsewhere the games are handed to `simulate_games_in_processes` with
+    `threads` processes, unless `fall_back_to_processes` is false.
+
+    """
+    if not (player_one.thread_safe and player_two.thread_safe):
+        raise ValueError("strategies must be thread_safe to be played in threads")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size should be positive")
+    settings = (
+        player_one,
+        player_two,
+        starting_player,
+        adjudicate_when_decided,
+        seed,
+        config,
+    )
+    if fall_back_to_processes and not is_free_threaded():
+        return simulate_games_in_processes(
+            player_one,
+            player_two,
+            games,
+            starting_player=starting_player,
+            adjudicate_when_decided=adjudicate_when_decided,
+            seed=seed,
+            processes=threads,
+            chunk_size=chunk_size,
+            config=config,
+        )
+
+    threads = threads or os.cpu_count() or 1
+    table = SharedResultTable(games)
+    index_ranges = [
+        (start, min(start + chunk_size, games)) for start in range(0, games, chunk_size)
+    ]
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # Seeded games draw from a generator of their own in each thread
+            futures = [
+                executor.submit(_write_results, table, start, stop, *settings)
+                for start, stop in index_ranges
+            ]
+            for future in futures:
+                future.result()
+    except BaseException:
+        table.close()
+        raise
+    return table
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.batch",
+        description="Compare the process and thread backends of the batch simulator.",
+    )
+    parser.add_argument("--player-one", default="random-selection")
+    parser.add_argument("--player-two", default="random-selection")
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=250)
+    args = parser.parse_args(argv)
+
+    strategies = get_simple_strategies()
+    for name in (args.player_one, args.player_two):
+        if name not in strategies:
+            parser.error(f"strategies must be one of {', '.join(sorted(strategies))}")
+    player_one = strategies[args.player_one]
+    player_two = strategies[args.player_two]
+
+    print(f"Free-threaded: {'yes' if is_free_threaded() else 'no'}")
+    backends: Dict[str, Callable[[], SharedResultTable]] = {
+        "processes": lambda: simulate_games_in_processes(
+            player_one,
+            player_two,
+            args.games,
+            processes=args.workers,
+            chunk_size=args.chunk_size,
+        ),
+        "threads": lambda: simulate_games_in_threads(
+            player_one,
+            player_two,
+            args.games,
+            threads=args.workers,
+            chunk_size=args.chunk_size,
+            fall_back_to_processes=False,
+        ),
+    }
+    for backend, simulate in backends.items():
+        started = time.perf_counter()
+        with simulate() as table:
+            elapsed = time.perf_counter() - started
+            winners = table.count_winners()
+        print(
+            f"{backend:<9} {args.games / elapsed:>10.0f} games/s"
+            f" ({winners[Player.ONE]} / {winners[Player.TWO]} / {winners[None]})"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
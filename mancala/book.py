@@ -0,0 +1,252 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Set, Tuple
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player, PlayerRow
+from mancala.position import (
+    decode_position,
+    ensure_keys_fit_in_64_bits,
+    get_canonical_key,
+    get_final_margin,
+    rank_position,
+    unrank_position,
+)
+from mancala.reachable import enumerate_reachable_positions, read_keys
+from mancala.search import AlphaBetaSearch
+from mancala.strategy import PlayerStrategy
+
+# magic, format version, number of bins, starting pieces, search depth, entries
+BOOK_HEADER_FORMAT = "<4sHHHHQ"
+BOOK_HEADER_SIZE = struct.calcsize(BOOK_HEADER_FORMAT)
+# position key, score, best bin
+BOOK_ENTRY_FORMAT = "<QbB"
+BOOK_ENTRY_SIZE = struct.calcsize(BOOK_ENTRY_FORMAT)
+
+_BOOK_MAGIC = b"MCOB"
+_BOOK_FORMAT_VERSION = 1
+_KEY_FORMAT = "<Q"
+
+BookRecord = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class BookEntry:
+    best_bin: int
+    score: int
+
+
+def _search_positions(
+    ranks: List[int], depth: int, config: GameConfig
+) -> List[BookRecord]:
+    records = []
+    for rank in ranks:
+        search = AlphaBetaSearch(config)
+        result = search.search(unrank_position(rank, config), Player.ONE, depth)
+        records.append((rank, result.score, result.best_bin))
+    return records
+
+
+def build_book(
+    path: str,
+    plies: int,
+    depth: int,
+    processes: int = 1,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+    chunk_size: int = 256,
+) -> int:
+    """Search every position within `plies` plies of the opening and write the book.
+
+    Positions are searched `depth` plies deep in chunks across `processes`
+    worker processes, and written sorted by their key from the point of view
+    of the player to move. Each position gets a table of its own, since
+    deeper entries left by other positions would make its score depend on
+    how the positions were chunked. Returns the number of entries.
+
+    """
+    if config.total_pieces > 127:
+        raise ValueError("book scores are stored in a byte, so at most 127 pieces")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size should be positive")
+    ensure_keys_fit_in_64_bits(config)
+    ranks: Set[int] = set()
+    with tempfile.TemporaryDirectory(prefix="mancala-book-") as work_dir:
+        layers = enumerate_reachable_positions(
+            config, max_depth=plies, work_dir=work_dir, dump_states=True
+        )
+        for layer in layers:
+            assert layer.path is not None
+            for key in read_keys(layer.path):
+                position, player = decode_position(key, config)
+                if get_final_margin(position, player, config) is None:
+                    ranks.add(get_canonical_key(position, player, config))
+
+    sorted_ranks = sorted(ranks)
+    chunks = [
+        sorted_ranks[start : start + chunk_size]
+        for start in range(0, len(sorted_ranks), chunk_size)
+    ]
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            searched = list(
+                executor.map(
+                    _search_positions,
+                    chunks,
+                    [depth] * len(chunks),
+                    [config] * len(chunks),
+                )
+            )
+    else:
+        searched = [_search_positions(chunk, depth, config) for chunk in chunks]
+
+    with open(path, "wb") as f:
+        f.write(
+            struct.pack(
+                BOOK_HEADER_FORMAT,
+                _BOOK_MAGIC,
+                _BOOK_FORMAT_VERSION,
+                config.number_of_bins,
+                config.number_of_starting_pieces,
+                depth,
+                len(sorted_ranks),
+            )
+        )
+        for records in searched:
+            for record in records:
+                f.write(struct.pack(BOOK_ENTRY_FORMAT, *record))
+    return len(sorted_ranks)
+
+
+class OpeningBook:
+    """Read-only view of a book file, searched in place through `mmap`."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            number_of_bins,
+            number_of_starting_pieces,
+            self._depth,
+            self._entries,
+        ) = struct.unpack_from(BOOK_HEADER_FORMAT, self._map)
+        if magic != _BOOK_MAGIC or version != _BOOK_FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not an opening book")
+        self._config = GameConfig(number_of_bins, number_of_starting_pieces)
+        try:
+            ensure_keys_fit_in_64_bits(self._config)
+        except ValueError:
+            self._map.close()
+            raise
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def close(self) -> None:
+        self._map.close()
+
+    @property
+    def config(self) -> GameConfig:
+        return self._config
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def lookup(
+        self, player_row: PlayerRow, opponent_row: PlayerRow
+    ) -> Optional[BookEntry]:
+        """Binary search for the position with `player_row` to move."""
+        key = rank_position(
+            (*player_row.bins, player_row.goal, *opponent_row.bins, opponent_row.goal),
+            self._config,
+        )
+        low, high = 0, self._entries
+        while low < high:
+            middle = (low + high) // 2
+            offset = BOOK_HEADER_SIZE + middle * BOOK_ENTRY_SIZE
+            middle_key = struct.unpack_from(_KEY_FORMAT, self._map, offset)[0]
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                _, score, best_bin = struct.unpack_from(
+                    BOOK_ENTRY_FORMAT, self._map, offset
+                )
+                return BookEntry(best_bin=best_bin, score=score)
+        return None
+
+
+class BookPlayerStrategy(PlayerStrategy):
+    """Plays the book move where there is one, and `fallback` elsewhere."""
+
+    def __init__(self, book: OpeningBook, fallback: PlayerStrategy):
+        if book.config != fallback.config:
+            raise ValueError("book and fallback strategy must use the same config")
+        super().__init__(book.config)
+        self._book = book
+        self._fallback = fallback
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def strategy_name(self) -> str:
+        return f"{self._fallback.strategy_name}-with-book"
+
+    def choose_bin(
+        self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
+    ) -> int:
+        if all(b_i == 0 for b_i in player_row.bins):
+            raise ValueError("player_row does not contain any non-empty-bins")
+        if opponent_row is not None:
+            entry = self._book.lookup(player_row, opponent_row)
+            if entry is not None:
+                self.hits += 1
+                return entry.best_bin
+        self.misses += 1
+        return self._fallback.choose_bin(player_row, opponent_row)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.book",
+        description="Build an opening book by searching the first plies deeply.",
+    )
+    parser.add_argument("path")
+    parser.add_argument("--plies", type=int, default=6)
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins)
+    parser.add_argument(
+        "--pieces", type=int, default=DEFAULT_GAME_CONFIG.number_of_starting_pieces
+    )
+    args = parser.parse_args(argv)
+
+    entries = build_book(
+        args.path,
+        args.plies,
+        args.depth,
+        args.processes,
+        GameConfig(args.bins, args.pieces),
+    )
+    print(f"Wrote {entries} positions searched {args.depth} plies deep to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
@@ -0,0 +1,196 @@
+import struct
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Deque, Iterable, Optional, Tuple
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player, PlayerRow
+from mancala.position import (
+    Position,
+    apply_move,
+    encode_position,
+    ensure_keys_fit_in_64_bits,
+    get_new_position,
+    get_row_offset,
+    is_game_over,
+    rank_position,
+)
+from mancala.reachable import CompactKeySet
+from mancala.strategy import PlayerStrategy
+
+# magic, format version, number of bins, starting pieces, number of positions
+_POLICY_HEADER_FORMAT = "<4sHHHQ"
+_POLICY_MAGIC = b"MCPT"
+_POLICY_FORMAT_VERSION = 1
+_KEY_TYPECODE = "Q"
+_CHOICE_TYPECODE = "B"
+
+
+def _get_rows_key(
+    player_row: PlayerRow, opponent_row: PlayerRow, config: GameConfig
+) -> int:
+    return rank_position(
+        (*player_row.bins, player_row.goal, *opponent_row.bins, opponent_row.goal),
+        config,
+    )
+
+
+class CompiledPolicy:
+    """A strategy's choices in a sorted array keyed by position rank.
+
+    Positions are taken from the point of view of the player to move, so one
+    table serves the strategy from either seat. Lookups are a binary search
+    over 8-byte keys with a 1-byte choice each.
+
+    """
+
+    def __init__(
+        self,
+        keys: array,
+        choices: array,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+    ):
+        ensure_keys_fit_in_64_bits(config)
+        if len(keys) != len(choices):
+            raise ValueError("keys and choices must be the same length")
+        if any(keys[i] >= keys[i + 1] for i in range(len(keys) - 1)):
+            raise ValueError("keys must be sorted and unique")
+        self._keys = keys
+        self._choices = choices
+        self._config = config
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def config(self) -> GameConfig:
+        return self._config
+
+    def get(self, player_row: PlayerRow, opponent_row: PlayerRow) -> Optional[int]:
+        """The compiled choice for the position, or `None` if it was not compiled."""
+        key = _get_rows_key(player_row, opponent_row, self._config)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._choices[index]
+        return None
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(
+                struct.pack(
+                    _POLICY_HEADER_FORMAT,
+                    _POLICY_MAGIC,
+                    _POLICY_FORMAT_VERSION,
+                    self._config.number_of_bins,
+                    self._config.number_of_starting_pieces,
+                    len(self._keys),
+                )
+            )
+            self._keys.tofile(f)
+            self._choices.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledPolicy":
+        with open(path, "rb") as f:
+            magic, version, number_of_bins, starting_pieces, positions = struct.unpack(
+                _POLICY_HEADER_FORMAT, f.read(struct.calcsize(_POLICY_HEADER_FORMAT))
+            )
+            if magic != _POLICY_MAGIC or version != _POLICY_FORMAT_VERSION:
+                raise ValueError(f"{path} is not a compiled policy")
+            keys = array(_KEY_TYPECODE)
+            keys.fromfile(f, positions)
+            choices = array(_CHOICE_TYPECODE)
+            choices.fromfile(f, positions)
+        return cls(keys, choices, GameConfig(number_of_bins, starting_pieces))
+
+
+def compile_strategy(
+    strategy: PlayerStrategy,
+    opponent: Optional[PlayerStrategy] = None,
+    max_depth: Optional[int] = None,
+    starting_players: Iterable[Player] = (Player.ONE, Player.TWO),
+) -> CompiledPolicy:
+    """Record `strategy`'s choice in every position it can reach.
+
+    `strategy` plays Player.ONE from the opening, against every legal move
+    of Player.TWO or, given a deterministic `opponent`, only its choices.
+    Only positions within `max_depth` plies of the opening are compiled.
+
+    """
+    config = strategy.config
+    ensure_keys_fit_in_64_bits(config)
+    number_of_bins = config.number_of_bins
+    choices = {}
+    seen = CompactKeySet()
+    frontier: Deque[Tuple[Position, Player, int]] = deque()
+    for player in starting_players:
+        position = get_new_position(config)
+        seen.add(encode_position(position, player, config))
+        frontier.append((position, player, 0))
+
+    while frontier:
+        position, player, depth = frontier.popleft()
+        if is_game_over(position, player, config):
+            continue
+        player_row = PlayerRow.trusted(
+            list(position[:number_of_bins]), position[number_of_bins], config
+        )
+        opponent_row = PlayerRow.trusted(
+            list(position[number_of_bins + 1 : -1]), position[-1], config
+        )
+        if player == Player.ONE:
+            selected_bins = [strategy.choose_bin(player_row, opponent_row)]
+            choices[rank_position(position, config)] = selected_bins[0]
+        elif opponent is not None:
+            selected_bins = [opponent.choose_bin(opponent_row, player_row)]
+        else:
+            offset = get_row_offset(player, config)
+            selected_bins = [
+                b for b in range(number_of_bins) if position[offset + b] > 0
+            ]
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for selected_bin in selected_bins:
+            child, next_player = apply_move(position, player, selected_bin, config)
+            if seen.add(encode_position(child, next_player, config)):
+                frontier.append((child, next_player, depth + 1))
+
+    keys = array(_KEY_TYPECODE, sorted(choices))
+    return CompiledPolicy(
+        keys, array(_CHOICE_TYPECODE, (choices[k] for k in keys)), config
+    )
+
+
+class CompiledPlayerStrategy(PlayerStrategy):
+    """Plays a `CompiledPolicy`, asking the original strategy on a miss.
+
+    It keeps the original strategy's name, since it makes the same choices.
+
+    """
+
+    def __init__(self, policy: CompiledPolicy, fallback: PlayerStrategy):
+        if policy.config != fallback.config:
+            raise ValueError("policy and fallback strategy must use the same config")
+        super().__init__(policy.config)
+        self._policy = policy
+        self._fallback = fallback
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def strategy_name(self) -> str:
+        return self._fallback.strategy_name
+
+    def choose_bin(
+        self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
+    ) -> int:
+        if all(b_i == 0 for b_i in player_row.bins):
+            raise ValueError("player_row does not contain any non-empty-bins")
+        if opponent_row is not None:
+            selected_bin = self._policy.get(player_row, opponent_row)
+            if selected_bin is not None:
+                self.hits += 1
+                return selected_bin
+        self.misses += 1
+        return self._fallback.choose_bin(player_row, opponent_row)
@@ -1,5 +1,30 @@
+from dataclasses import dataclass
 from typing import Final
 
 
 NUMBER_OF_BINS: Final[int] = 6
 NUMBER_OF_STARTING_PIECES: Final[int] = 4
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    number_of_bins: int = NUMBER_OF_BINS
+    number_of_starting_pieces: int = NUMBER_OF_STARTING_PIECES
+
+    def __post_init__(self):
+        if self.number_of_bins <= 0:
+            raise ValueError("number_of_bins should be positive")
+        if self.number_of_starting_pieces <= 0:
+            raise ValueError("number_of_starting_pieces should be positive")
+
+    @property
+    def total_pieces(self) -> int:
+        return 2 * self.number_of_bins * self.number_of_starting_pieces
+
+    @property
+    def winning_threshold(self) -> int:
+        """A goal with more pieces than this has won, being over half of them."""
+        return self.number_of_bins * self.number_of_starting_pieces
+
+
+DEFAULT_GAME_CONFIG: Final[GameConfig] = GameConfig()
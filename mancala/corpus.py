@@ -0,0 +1,300 @@
+import argparse
+import gzip
+import importlib
+import json
+import random
+import sys
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import (
+    Board,
+    Player,
+    PlayerRow,
+    Turn,
+    take_turn,
+    take_turn_trusted,
+    who_gets_next_turn,
+)
+from mancala.position import board_to_position, position_to_board
+
+Engine = Callable[[Board, Turn], Tuple[Board, Player]]
+
+CORPUS_FORMAT_VERSION = 1
+
+# Mostly small amounts of pieces, so that empty bins and captures are common
+_BIN_PIECE_CHOICES = (0, 0, 0, 1, 1, 2, 3, 4, 5, 8)
+_MAXIMUM_GOAL = 24
+_GENERATED_LAPS = 3
+
+
+def _get_board_config(board: Board) -> GameConfig:
+    # Moves only depend on the number of bins, not on the starting pieces
+    return GameConfig(number_of_bins=len(board[Player.ONE].bins))
+
+
+def reference_engine(board: Board, turn: Turn) -> Tuple[Board, Player]:
+    config = _get_board_config(board)
+    new_board = take_turn(board, turn, config)
+    return new_board, who_gets_next_turn(board, turn, new_board, config)
+
+
+def trusted_engine(board: Board, turn: Turn) -> Tuple[Board, Player]:
+    config = _get_board_config(board)
+    new_board = take_turn_trusted(board, turn, config)
+    return new_board, who_gets_next_turn(board, turn, new_board, config)
+
+
+def load_engine(path: str) -> Engine:
+    """Import an engine given as 'package.module:function'."""
+    module_name, _, function_name = path.partition(":")
+    if not function_name:
+        raise ValueError("engine must be given as 'package.module:function'")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def get_maximum_generated_pieces(
+    selected_bin: int, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> int:
+    """Selected bins hold enough pieces to sow past the goal on the third lap."""
+    return selected_bin + _GENERATED_LAPS * (2 * config.number_of_bins + 1) + 1
+
+
+@dataclass
+class CorpusCase:
+    board: Board
+    turn: Turn
+    result: Board
+    next_player: Player
+
+    def to_row(self) -> List[int]:
+        return [
+            self.turn.player.value,
+            self.turn.selected_bin,
+            *board_to_position(self.board),
+            *board_to_position(self.result),
+            self.next_player.value,
+        ]
+
+    @classmethod
+    def from_row(
+        cls, row: Sequence[int], config: GameConfig = DEFAULT_GAME_CONFIG
+    ) -> "CorpusCase":
+        position_length = 2 * (config.number_of_bins + 1)
+        return cls(
+            board=position_to_board(tuple(row[2 : 2 + position_length]), config),
+            turn=Turn(Player(row[0]), row[1], config),
+            result=position_to_board(tuple(row[2 + position_length : -1]), config),
+            next_player=Player(row[-1]),
+        )
+
+
+@dataclass
+class Divergence:
+    case_index: int
+    case: CorpusCase
+    actual_result: Board
+    actual_next_player: Player
+    reproducer: CorpusCase
+
+    def __str__(self) -> str:
+        reproducer = self.reproducer
+        return "\n".join(
+            [
+                f"Divergence at corpus case {self.case_index}",
+                f"  board:           {_describe_board(self.case.board)}",
+                f"  turn:            {_describe_turn(self.case.turn)}",
+                f"  expected result: {_describe_board(self.case.result)}"
+                f" next {self.case.next_player.name}",
+                f"  actual result:   {_describe_board(self.actual_result)}"
+                f" next {self.actual_next_player.name}",
+                "Minimal reproducer",
+                f"  board:           {_describe_board(reproducer.board)}",
+                f"  turn:            {_describe_turn(reproducer.turn)}",
+                f"  expected result: {_describe_board(reproducer.result)}"
+                f" next {reproducer.next_player.name}",
+            ]
+        )
+
+
+def _describe_board(board: Board) -> str:
+    return f"ONE {board[Player.ONE]} TWO {board[Player.TWO]}"
+
+
+def _describe_turn(turn: Turn) -> str:
+    return f"{turn.player.name} selects bin {turn.selected_bin}"
+
+
+def _get_reference_case(board: Board, turn: Turn) -> CorpusCase:
+    result, next_player = reference_engine(board, turn)
+    return CorpusCase(board=board, turn=turn, result=result, next_player=next_player)
+
+
+def _generate_case(rng: random.Random, config: GameConfig) -> CorpusCase:
+    number_of_bins = config.number_of_bins
+    player = rng.choice([Player.ONE, Player.TWO])
+    selected_bin = rng.randrange(number_of_bins)
+    rows = {
+        p: [rng.choice(_BIN_PIECE_CHOICES) for _ in range(number_of_bins)]
+        for p in Player
+    }
+    # Spread the selected bin over every sowing branch, across several laps
+    rows[player][selected_bin] = rng.randint(
+        1, get_maximum_generated_pieces(selected_bin, config)
+    )
+    board = Board(
+        {
+            p: PlayerRow(
+                bins=rows[p], goal=rng.randint(0, _MAXIMUM_GOAL), config=config
+            )
+            for p in Player
+        }
+    )
+    return _get_reference_case(board, Turn(player, selected_bin, config))
+
+
+def generate_corpus(
+    cases: int, seed: int = 0, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> Iterator[CorpusCase]:
+    rng = random.Random(seed)
+    for _ in range(cases):
+        yield _generate_case(rng, config)
+
+
+def write_corpus(
+    path: str,
+    corpus_cases: Iterable[CorpusCase],
+    seed: int,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> int:
+    written = 0
+    with gzip.open(path, "wt") as f:
+        header = {
+            "version": CORPUS_FORMAT_VERSION,
+            "number_of_bins": config.number_of_bins,
+            "seed": seed,
+        }
+        f.write(json.dumps(header) + "\n")
+        for case in corpus_cases:
+            f.write(json.dumps(case.to_row(), separators=(",", ":")) + "\n")
+            written += 1
+    return written
+
+
+def read_corpus(
+    path: str, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> Iterator[CorpusCase]:
+    with gzip.open(path, "rt") as f:
+        header = json.loads(f.readline())
+        if header["version"] != CORPUS_FORMAT_VERSION:
+            raise ValueError(f"unsupported corpus version {header['version']}")
+        if header["number_of_bins"] != config.number_of_bins:
+            raise ValueError(
+                f"corpus was generated for {header['number_of_bins']} bins"
+            )
+        for line in f:
+            yield CorpusCase.from_row(json.loads(line), config)
+
+
+def _diverges(case: CorpusCase, engine: Engine) -> bool:
+    result, next_player = engine(case.board, case.turn)
+    return result != case.result or next_player != case.next_player
+
+
+def _get_smaller_values(value: int) -> List[int]:
+    return [v for v in sorted({0, value // 2, value - 1}) if 0 <= v < value]
+
+
+def shrink_case(case: CorpusCase, engine: Engine) -> CorpusCase:
+    """Greedily remove pieces from a diverging case while it still diverges."""
+    config = _get_board_config(case.board)
+    player_offset = 0 if case.turn.player == Player.ONE else config.number_of_bins + 1
+    selected_index = player_offset + case.turn.selected_bin
+    position = list(board_to_position(case.board))
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for index, value in enumerate(position):
+            for smaller_value in _get_smaller_values(value):
+                if index == selected_index and smaller_value == 0:
+                    continue
+                candidate_position = list(position)
+                candidate_position[index] = smaller_value
+                candidate = _get_reference_case(
+                    position_to_board(tuple(candidate_position), config), case.turn
+                )
+                if _diverges(candidate, engine):
+                    position = candidate_position
+                    case = candidate
+                    shrunk = True
+                    break
+    return case
+
+
+def find_first_divergence(
+    corpus_cases: Iterable[CorpusCase], engine: Engine
+) -> Optional[Divergence]:
+    for case_index, case in enumerate(corpus_cases):
+        result, next_player = engine(case.board, case.turn)
+        if result != case.result or next_player != case.next_player:
+            return Divergence(
+                case_index=case_index,
+                case=case,
+                actual_result=result,
+                actual_next_player=next_player,
+                reproducer=shrink_case(case, engine),
+            )
+    return None
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.corpus",
+        description="Generate and replay the golden corpus of engine moves.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser("generate", help="write a new corpus")
+    generate_parser.add_argument("path")
+    generate_parser.add_argument("--cases", type=int, default=1_000_000)
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument(
+        "--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins
+    )
+
+    check_parser = subparsers.add_parser("check", help="replay a corpus")
+    check_parser.add_argument("path")
+    check_parser.add_argument(
+        "--engine",
+        default="mancala.corpus:trusted_engine",
+        help="engine to check, given as 'package.module:function'",
+    )
+    check_parser.add_argument(
+        "--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins
+    )
+
+    args = parser.parse_args(argv)
+    config = GameConfig(number_of_bins=args.bins)
+    if args.command == "generate":
+        written = write_corpus(
+            args.path,
+            generate_corpus(args.cases, args.seed, config),
+            args.seed,
+            config,
+        )
+        print(f"Wrote {written} cases to {args.path}")
+        return 0
+
+    divergence = find_first_divergence(
+        read_corpus(args.path, config), load_engine(args.engine)
+    )
+    if divergence is not None:
+        print(divergence)
+        return 1
+    print(f"{args.engine} matches every case in {args.path}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
@@ -0,0 +1,268 @@
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player, PlayerRow, Turn
+from mancala.position import (
+    Position,
+    apply_move,
+    get_final_margin,
+    get_new_position,
+    get_successors,
+)
+from mancala.strategy import (
+    AlwaysMaximumPlayerStrategy,
+    AlwaysMinimumPlayerStrategy,
+    EvenGoalOrPiecesOnOtherSideStrategy,
+    EvenGoalStealAndPiecesOnOtherSideStrategy,
+    PlayerStrategy,
+)
+
+# The responder always plays as Player.ONE against the fixed strategy
+RESPONDER = Player.ONE
+FIXED_PLAYER = Player.TWO
+
+SearchKey = Tuple[Position, Player]
+
+
+@dataclass(frozen=True)
+class BestResponse:
+    strategy_name: str
+    responder_moves_first: bool
+    margin: int
+    turns: Tuple[Turn, ...]
+    positions_searched: int
+
+
+class _BestResponseSearch:
+    """Search for the largest margin over a fixed strategy.
+
+    Only the responder has a choice, so the search asks whether some line
+    finishes at least `m` pieces ahead, stopping at the first that does, and
+    narrows `m` down by bisection. Each position keeps the bounds on its
+    margin learnt by earlier searches.
+
+    """
+
+    def __init__(self, strategy: PlayerStrategy):
+        self._strategy = strategy
+        self._config = strategy.config
+        self._bounds: Dict[SearchKey, Tuple[int, int]] = {}
+        self._choices: Dict[Position, int] = {}
+
+    @property
+    def positions_searched(self) -> int:
+        return len(self._bounds)
+
+    def get_terminal_margin(self, position: Position, player: Player) -> Optional[int]:
+        margin = get_final_margin(position, player, self._config)
+        if margin is None or player == RESPONDER:
+            return margin
+        return -margin
+
+    def _get_initial_bounds(
+        self, position: Position, player: Player
+    ) -> Tuple[int, int]:
+        terminal_margin = self.get_terminal_margin(position, player)
+        if terminal_margin is not None:
+            return terminal_margin, terminal_margin
+        number_of_bins = self._config.number_of_bins
+        margin = position[number_of_bins] - position[-1]
+        pieces_in_bins = (
+            self._config.total_pieces - position[number_of_bins] - position[-1]
+        )
+        return margin - pieces_in_bins, margin + pieces_in_bins
+
+    def get_fixed_choice(self, position: Position) -> int:
+        if position not in self._choices:
+            number_of_bins = self._config.number_of_bins
+            self._choices[position] = self._strategy.choose_bin(
+                PlayerRow.trusted(
+                    list(position[number_of_bins + 1 : -1]), position[-1], self._config
+                ),
+                PlayerRow.trusted(
+                    list(position[:number_of_bins]),
+                    position[number_of_bins],
+                    self._config,
+                ),
+            )
+        return self._choices[position]
+
+    def get_responder_children(
+        self, position: Position
+    ) -> List[Tuple[int, Position, Player]]:
+        number_of_bins = self._config.number_of_bins
+        children = [
+            (selected_bin, child, next_player)
+            for selected_bin, child, next_player, _ in get_successors(
+                position, RESPONDER, self._config
+            )
+        ]
+        # Try extra turns first, then the moves scoring the most
+        children.sort(
+            key=lambda c: (c[2] != RESPONDER, c[1][-1] - c[1][number_of_bins])
+        )
+        return children
+
+    def reaches(self, position: Position, player: Player, margin: int) -> bool:
+        """Whether the responder can finish at least `margin` pieces ahead."""
+        key = (position, player)
+        if key not in self._bounds:
+            self._bounds[key] = self._get_initial_bounds(position, player)
+        lower, upper = self._bounds[key]
+        if lower >= margin:
+            return True
+        if upper < margin:
+            return False
+
+        if player == RESPONDER:
+            reached = False
+            for _, child, next_player in self.get_responder_children(position):
+                if self.reaches(child, next_player, margin):
+                    reached = True
+                    break
+        else:
+            child, next_player = apply_move(
+                position, player, self.get_fixed_choice(position), self._config
+            )
+            reached = self.reaches(child, next_player, margin)
+
+        lower, upper = self._bounds[key]
+        if reached:
+            self._bounds[key] = (max(lower, margin), upper)
+        else:
+            self._bounds[key] = (lower, min(upper, margin - 1))
+        return reached
+
+    def get_margin(self, position: Position, player: Player) -> int:
+        lower, upper = -self._config.total_pieces, self._config.total_pieces
+        while lower < upper:
+            margin = (lower + upper + 1) // 2
+            if self.reaches(position, player, margin):
+                lower = margin
+            else:
+                upper = margin - 1
+        return lower
+
+
+def compute_best_response(
+    strategy: PlayerStrategy, responder_moves_first: bool = True
+) -> BestResponse:
+    """Exact best response to a deterministic strategy, in its config.
+
+    The counter-strategy plays Player.ONE and the margin is how far ahead of
+    `strategy` it finishes under the simulation's rules. A strategy choosing
+    at random is searched against one fixed draw of its choices per position,
+    so its margin is not guaranteed.
+
+    """
+    search = _BestResponseSearch(strategy)
+    position = get_new_position(strategy.config)
+    player = RESPONDER if responder_moves_first else FIXED_PLAYER
+    margin = search.get_margin(position, player)
+
+    # Replay the single line of the game that reaches the margin
+    turns = []
+    while search.get_terminal_margin(position, player) is None:
+        if player == RESPONDER:
+            selected_bin = next(
+                selected_bin
+                for selected_bin, child, next_player in search.get_responder_children(
+                    position
+                )
+                if search.reaches(child, next_player, margin)
+            )
+        else:
+            selected_bin = search.get_fixed_choice(position)
+        turns.append(Turn.trusted(player, selected_bin, strategy.config))
+        position, player = apply_move(position, player, selected_bin, strategy.config)
+
+    return BestResponse(
+        strategy_name=strategy.strategy_name,
+        responder_moves_first=responder_moves_first,
+        margin=margin,
+        turns=tuple(turns),
+        positions_searched=search.positions_searched,
+    )
+
+
+def get_exploitability(strategy: PlayerStrategy) -> float:
+    """Average margin a best response wins by, over both starting players."""
+    return (
+        compute_best_response(strategy, responder_moves_first=True).margin
+        + compute_best_response(strategy, responder_moves_first=False).margin
+    ) / 2
+
+
+class BestResponseStrategy(PlayerStrategy):
+    """Strategy replaying a `BestResponse` against the strategy it was computed for."""
+
+    def __init__(
+        self, best_response: BestResponse, config: GameConfig = DEFAULT_GAME_CONFIG
+    ):
+        super().__init__(config)
+        self._best_response = best_response
+        self._moves: Dict[Position, int] = {}
+        position = get_new_position(config)
+        for turn in best_response.turns:
+            if turn.player == RESPONDER:
+                self._moves[position] = turn.selected_bin
+            position, _ = apply_move(position, turn.player, turn.selected_bin, config)
+
+    @property
+    def strategy_name(self) -> str:
+        return f"best-response-to-{self._best_response.strategy_name}"
+
+    def choose_bin(
+        self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
+    ) -> int:
+        if all(b_i == 0 for b_i in player_row.bins):
+            raise ValueError("player_row does not contain any non-empty-bins")
+        elif not isinstance(opponent_row, PlayerRow):
+            raise ValueError("strategy requires opponent_row be provided")
+
+        position = (
+            *player_row.bins,
+            player_row.goal,
+            *opponent_row.bins,
+            opponent_row.goal,
+        )
+        if position not in self._moves:
+            raise ValueError("position is not on the line of the best response")
+        return self._moves[position]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.exploit",
+        description="Compute best responses to the deterministic strategies.",
+    )
+    parser.add_argument("--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins)
+    parser.add_argument(
+        "--pieces", type=int, default=DEFAULT_GAME_CONFIG.number_of_starting_pieces
+    )
+    args = parser.parse_args(argv)
+
+    config = GameConfig(args.bins, args.pieces)
+    strategies: List[PlayerStrategy] = [
+        AlwaysMinimumPlayerStrategy(config),
+        AlwaysMaximumPlayerStrategy(config),
+        EvenGoalOrPiecesOnOtherSideStrategy(config),
+        EvenGoalStealAndPiecesOnOtherSideStrategy(config),
+    ]
+    for strategy in strategies:
+        margins = [
+            compute_best_response(strategy, responder_moves_first).margin
+            for responder_moves_first in (True, False)
+        ]
+        print(
+            f"{strategy.strategy_name:<45} loses by {margins[0]:>3} moving second"
+            f" and {margins[1]:>3} moving first"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
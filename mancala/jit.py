@@ -0,0 +1,351 @@
+import argparse
+import importlib
+import sys
+import time
+from typing import Any, Callable, List, Optional, Sequence
+
+from mancala.batch import simulate_games
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player
+from mancala.simulation import GameResult
+from mancala.strategy import PlayerStrategy, get_simple_strategies
+
+try:
+    import numba  # type: ignore
+except ImportError:
+    numba = None
+# numpy is a dependency of numba, for the arrays compiled code works on
+numpy = None if numba is None else importlib.import_module("numpy")
+
+BACKEND = "python" if numba is None else "numba"
+
+# The built-in strategies the game loop below plays, by name
+STRATEGY_CODES = {
+    "random-selection": 0,
+    "always-minimum": 1,
+    "always-maximum": 2,
+    "even-goal-or-more-pieces-to-opponent": 3,
+    "even-goal-then-stealing-finally-shedding": 4,
+}
+_RANDOM, _MINIMUM, _MAXIMUM, _EVEN_GOAL, _EVEN_GOAL_STEAL = range(5)
+
+_NO_STARTING_PLAYER = -1
+_TIE = -1
+# winner, starting player, plies, goals for each player
+_RESULT_FIELDS = 5
+
+# Games draw from a Lehmer generator small enough for 64-bit integers, the
+# same with or without numba, rather than from the `random` module
+_RNG_MODULUS = 2 ** 31 - 1
+_RNG_MULTIPLIER = 48271
+_SEED_MULTIPLIER = 2654435761
+
+
+def _jit(function: Callable) -> Callable:
+    return function if numba is None else numba.njit(cache=True)(function)
+
+
+def _new_buffer(size: int) -> Any:
+    return [0] * size if numpy is None else numpy.zeros(size, dtype=numpy.int64)
+
+
+@_jit
+def _next_state(state):
+    return state * _RNG_MULTIPLIER % _RNG_MODULUS
+
+
+@_jit
+def _seed_state(seed, game_index):
+    state = (seed * _SEED_MULTIPLIER + game_index) % _RNG_MODULUS
+    return 1 if state == 0 else state
+
+
+@_jit
+def _play_move(values, offset, opponent_offset, selected_bin, number_of_bins):
+    """`play_move` on the rows of a flat position, in place.
+
+    Returns whether the player gets another turn and the pieces captured.
+
+    """
+    lap_length = 2 * number_of_bins + 1
+    pieces = values[offset + selected_bin]
+    values[offset + selected_bin] = 0
+    full_laps = pieces // lap_length
+    remaining_pieces = pieces % lap_length
+    if full_laps > 0:
+        for bin_index in range(number_of_bins):
+            values[offset + bin_index] += full_laps
+            values[opponent_offset + bin_index] += full_laps
+        values[offset + number_of_bins] += full_laps
+
+    # The k-th piece of a lap goes along the player's row towards the goal,
+    # into the goal, along the opponent's row and back to the player's row
+    for k in range(remaining_pieces):
+        if k < selected_bin:
+            values[offset + selected_bin - 1 - k] += 1
+        elif k == selected_bin:
+            values[offset + number_of_bins] += 1
+        elif k <= selected_bin + number_of_bins:
+            values[opponent_offset + number_of_bins - k + selected_bin] += 1
+        else:
+            values[offset + lap_length - 1 - k + selected_bin] += 1
+
+    last_position = (pieces - 1) % lap_length
+    if last_position < selected_bin:
+        landing_bin = selected_bin - 1 - last_position
+    elif last_position > selected_bin + number_of_bins:
+        landing_bin = lap_length - 1 - last_position + selected_bin
+    else:
+        landing_bin = -1
+    captured_pieces = 0
+    if landing_bin >= 0 and values[offset + landing_bin] == 1:
+        captured_pieces = values[opponent_offset + landing_bin]
+        if captured_pieces > 0:
+            values[offset + landing_bin] = 0
+            values[opponent_offset + landing_bin] = 0
+            values[offset + number_of_bins] += captured_pieces + 1
+    return last_position == selected_bin, captured_pieces
+
+
+@_jit
+def _choose_bin(code, values, scratch, offset, opponent_offset, number_of_bins, state):
+    """The bin the strategy of `code` chooses, or -1 without a legal move."""
+    lap_length = 2 * number_of_bins + 1
+    legal_bins = 0
+    for bin_index in range(number_of_bins):
+        if values[offset + bin_index] > 0:
+            legal_bins += 1
+    if legal_bins == 0:
+        return -1, state
+
+    if code == _RANDOM:
+        state = _next_state(state)
+        choice = state % legal_bins
+        for bin_index in range(number_of_bins):
+            if values[offset + bin_index] > 0:
+                if choice == 0:
+                    return bin_index, state
+                choice -= 1
+
+    chosen_bin = -1
+    if code == _MINIMUM or code == _MAXIMUM:
+        for bin_index in range(number_of_bins):
+            pieces = values[offset + bin_index]
+            if pieces > 0 and (
+                chosen_bin < 0
+                or (code == _MINIMUM and pieces < values[offset + chosen_bin])
+                or (code == _MAXIMUM and pieces > values[offset + chosen_bin])
+            ):
+                chosen_bin = bin_index
+        return chosen_bin, state
+
+    # Goal making, then for one of the strategies stealing, then shedding
+    for bin_index in range(number_of_bins):
+        pieces = values[offset + bin_index]
+        if pieces > 0 and (pieces - 1) % lap_length == bin_index:
+            return bin_index, state
+    if code == _EVEN_GOAL_STEAL:
+        most_captured = 0
+        for bin_index in range(number_of_bins):
+            # Only steals landing without leaving the player's row count
+            pieces = values[offset + bin_index]
+            if pieces == 0 or pieces > bin_index:
+                continue
+            for index in range(2 * number_of_bins + 2):
+                scratch[index] = values[index]
+            _, captured_pieces = _play_move(
+                scratch, offset, opponent_offset, bin_index, number_of_bins
+            )
+            if captured_pieces > most_captured:
+                chosen_bin = bin_index
+                most_captured = captured_pieces
+        if chosen_bin >= 0:
+            return chosen_bin, state
+    best_seeds = -1
+    best_reach = 0
+    for bin_index in range(number_of_bins):
+        pieces = values[offset + bin_index]
+        if pieces == 0:
+            continue
+        seeds = (pieces // lap_length) * number_of_bins + min(
+            max(pieces % lap_length - bin_index - 1, 0), number_of_bins
+        )
+        reach = pieces - bin_index - 1
+        if seeds > best_seeds or (seeds == best_seeds and reach > best_reach):
+            chosen_bin = bin_index
+            best_seeds = seeds
+            best_reach = reach
+    return chosen_bin, state
+
+
+@_jit
+def _play_games(
+    player_one_code,
+    player_two_code,
+    starting_player,
+    seed,
+    first_game,
+    games,
+    number_of_bins,
+    number_of_starting_pieces,
+    values,
+    results,
+):
+    winning_threshold = number_of_bins * number_of_starting_pieces
+    player_one_goal = number_of_bins
+    player_two_goal = 2 * number_of_bins + 1
+    scratch = values[2 * number_of_bins + 2 :]
+    for game in range(games):
+        state = _seed_state(seed, first_game + game)
+        for bin_index in range(number_of_bins):
+            values[bin_index] = number_of_starting_pieces
+            values[player_two_goal - 1 - bin_index] = number_of_starting_pieces
+        values[player_one_goal] = 0
+        values[player_two_goal] = 0
+        player = starting_player
+        if player == _NO_STARTING_PLAYER:
+            state = _next_state(state)
+            player = state % 2
+        game_starting_player = player
+
+        plies = 0
+        winner = _TIE
+        while True:
+            offset = 0 if player == 0 else number_of_bins + 1
+            opponent_offset = number_of_bins + 1 - offset
+            code = player_one_code if player == 0 else player_two_code
+            selected_bin, state = _choose_bin(
+                code, values, scratch, offset, opponent_offset, number_of_bins, state
+            )
+            if selected_bin < 0:
+                # Whoever cannot move ends the game, and the pieces left go
+                # to the goal on their side
+                for bin_index in range(number_of_bins):
+                    values[player_one_goal] += values[bin_index]
+                    values[player_two_goal] += values[player_one_goal + 1 + bin_index]
+                    values[bin_index] = 0
+                    values[player_one_goal + 1 + bin_index] = 0
+                if values[player_one_goal] > values[player_two_goal]:
+                    winner = 0
+                elif values[player_one_goal] < values[player_two_goal]:
+                    winner = 1
+                break
+
+            extra_turn, _ = _play_move(
+                values, offset, opponent_offset, selected_bin, number_of_bins
+            )
+            plies += 1
+            if values[player_one_goal] > winning_threshold:
+                winner = 0
+                break
+            if values[player_two_goal] > winning_threshold:
+                winner = 1
+                break
+            if not extra_turn:
+                player = 1 - player
+
+        row = game * _RESULT_FIELDS
+        results[row] = winner
+        results[row + 1] = game_starting_player
+        results[row + 2] = plies
+        results[row + 3] = values[player_one_goal]
+        results[row + 4] = values[player_two_goal]
+
+
+def simulate_games_compiled(
+    player_one: PlayerStrategy,
+    player_two: PlayerStrategy,
+    games: int,
+    starting_player: Optional[Player] = None,
+    seed: int = 0,
+    first_game: int = 0,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> List[GameResult]:
+    """Play `games` games of built-in strategies in a single compiled loop.
+
+    The loop is compiled with numba when it is installed, and runs as plain
+    Python otherwise, playing the same games either way. Deterministic
+    strategies play exactly as in `SimulationLoop`. Random choices and
+    starting players come from a generator of the loop's own, seeded from
+    `seed` and the game index, so they are reproducible but differ from
+    the games `mancala.batch.simulate_games` plays.
+
+    """
+    for strategy in (player_one, player_two):
+        if strategy.strategy_name not in STRATEGY_CODES:
+            raise ValueError(f"{strategy.strategy_name} has no compiled equivalent")
+        if strategy.config != config:
+            raise ValueError("player strategies must use the same config as the games")
+    if not 0 <= seed < _RNG_MODULUS or not 0 <= first_game < _RNG_MODULUS - games:
+        raise ValueError(f"seed and game indices must be below {_RNG_MODULUS}")
+
+    values = _new_buffer(2 * (2 * config.number_of_bins + 2))
+    results = _new_buffer(games * _RESULT_FIELDS)
+    _play_games(
+        STRATEGY_CODES[player_one.strategy_name],
+        STRATEGY_CODES[player_two.strategy_name],
+        _NO_STARTING_PLAYER if starting_player is None else starting_player.value,
+        seed,
+        first_game,
+        games,
+        config.number_of_bins,
+        config.number_of_starting_pieces,
+        values,
+        results,
+    )
+    return [
+        GameResult(
+            winning_player=None if winner == _TIE else Player(winner),
+            starting_player=Player(int(game_starting_player)),
+            plies=int(plies),
+            player_one_goal=int(player_one_goal),
+            player_two_goal=int(player_two_goal),
+        )
+        for winner, game_starting_player, plies, player_one_goal, player_two_goal in (
+            results[row : row + _RESULT_FIELDS]
+            for row in range(0, len(results), _RESULT_FIELDS)
+        )
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.jit",
+        description="Compare the compiled game loop with SimulationLoop.",
+    )
+    parser.add_argument("--player-one", default="always-minimum")
+    parser.add_argument(
+        "--player-two", default="even-goal-then-stealing-finally-shedding"
+    )
+    parser.add_argument("--games", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    strategies = get_simple_strategies()
+    for name in (args.player_one, args.player_two):
+        if name not in strategies:
+            parser.error(f"strategies must be one of {', '.join(sorted(strategies))}")
+    player_one = strategies[args.player_one]
+    player_two = strategies[args.player_two]
+
+    # Compile, where numba is installed, before timing anything
+    simulate_games_compiled(player_one, player_two, 1)
+    timings = {}
+    for backend, simulate in (
+        (
+            "simulation-loop",
+            lambda: list(simulate_games(player_one, player_two, args.games, seed=0)),
+        ),
+        (
+            f"compiled-{BACKEND}",
+            lambda: simulate_games_compiled(player_one, player_two, args.games),
+        ),
+    ):
+        started = time.perf_counter()
+        simulate()
+        timings[backend] = time.perf_counter() - started
+        print(f"{backend:<20} {args.games / timings[backend]:>10.0f} games/s")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
@@ -0,0 +1,213 @@
+import argparse
+import math
+import os
+import sys
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from mancala.batch import simulate_games_in_processes
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player
+from mancala.simulation import GameResult
+from mancala.strategy import PlayerStrategy, get_simple_strategies
+
+INITIAL_RATING = 1500.0
+INITIAL_DEVIATION = 350.0
+# Ratings are reported within this many deviations, about 95% of the time
+INTERVAL_DEVIATIONS = 1.96
+
+_Q = math.log(10) / 400
+
+
+def _get_g(deviation: float) -> float:
+    return 1 / math.sqrt(1 + 3 * (_Q * deviation) ** 2 / math.pi ** 2)
+
+
+@dataclass(frozen=True)
+class Rating:
+    rating: float = INITIAL_RATING
+    deviation: float = INITIAL_DEVIATION
+    games: int = 0
+
+    @property
+    def interval(self) -> Tuple[float, float]:
+        margin = INTERVAL_DEVIATIONS * self.deviation
+        return self.rating - margin, self.rating + margin
+
+
+class RatingLadder:
+    """Glicko ratings of named strategies, updated after every game.
+
+    Each game is its own rating period, so results can be streamed in as
+    they are played and the ladder is always up to date. Ties count as half
+    a win for each side. Strategies do not change between games, so the
+    deviations never grow back as they would for human players.
+
+    """
+
+    def __init__(self, names: Sequence[str]):
+        if len(set(names)) != len(names):
+            raise ValueError("strategy names must be unique")
+        self._ratings = {name: Rating() for name in names}
+
+    def __getitem__(self, name: str) -> Rating:
+        return self._ratings[name]
+
+    def __len__(self) -> int:
+        return len(self._ratings)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._ratings)
+
+    def expected_score(self, name: str, opponent_name: str) -> float:
+        """The share of the games against `opponent_name` that `name` should win."""
+        rating = self._ratings[name]
+        opponent_rating = self._ratings[opponent_name]
+        difference = rating.rating - opponent_rating.rating
+        exponent = -_get_g(opponent_rating.deviation) * difference / 400
+        return 1 / (1 + 10 ** exponent)
+
+    def _get_precision_gain(self, name: str, opponent_name: str) -> float:
+        """How much one game adds to the inverse variance of `name`'s rating."""
+        expected = self.expected_score(name, opponent_name)
+        g = _get_g(self._ratings[opponent_name].deviation)
+        return _Q ** 2 * g ** 2 * expected * (1 - expected)
+
+    def expected_information(self, name: str, opponent_name: str) -> float:
+        """The drop in the two ratings' variances expected from one more game."""
+        information = 0.0
+        for player, opponent in ((name, opponent_name), (opponent_name, name)):
+            variance = self._ratings[player].deviation ** 2
+            gain = self._get_precision_gain(player, opponent)
+            information += variance - 1 / (1 / variance + gain)
+        return information
+
+    def record(self, player_one: str, player_two: str, result: GameResult) -> None:
+        """Update both ratings from a game `player_one` played as Player.ONE."""
+        if result.winning_player is None:
+            player_one_score = 0.5
+        else:
+            player_one_score = 1.0 if result.winning_player == Player.ONE else 0.0
+        updates = {}
+        for name, opponent, score in (
+            (player_one, player_two, player_one_score),
+            (player_two, player_one, 1 - player_one_score),
+        ):
+            rating = self._ratings[name]
+            expected = self.expected_score(name, opponent)
+            precision = 1 / rating.deviation ** 2 + self._get_precision_gain(
+                name, opponent
+            )
+            g = _get_g(self._ratings[opponent].deviation)
+            updates[name] = Rating(
+                rating=rating.rating + _Q / precision * g * (score - expected),
+                deviation=math.sqrt(1 / precision),
+                games=rating.games + 1,
+            )
+        self._ratings.update(updates)
+
+    def get_ranked(self) -> List[Tuple[str, Rating]]:
+        """Strategies from the highest rating to the lowest."""
+        return sorted(self._ratings.items(), key=lambda item: -item[1].rating)
+
+
+def schedule_matchups(
+    strategies: Sequence[PlayerStrategy],
+    ladder: RatingLadder,
+    target_deviation: float = 50.0,
+    games_per_round: int = 100,
+    max_games: int = 100_000,
+    seed: int = 0,
+    processes: Optional[int] = None,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Iterator[Tuple[str, str]]:
+    """Play rounds of the most informative pairing until every rating is known.
+
+    Each round plays `games_per_round` games of the pairing expected to
+    shrink the ratings' variances the most, with the batch simulator, and
+    records them in `ladder`. Rounds stop once every deviation is at most
+    `target_deviation` or `max_games` games were played. Yields the names
+    of each round's Player.ONE and Player.TWO.
+
+    """
+    if games_per_round <= 0:
+        raise ValueError("games_per_round should be positive")
+    by_name: Dict[str, PlayerStrategy] = {s.strategy_name: s for s in strategies}
+    if sorted(by_name) != sorted(ladder.names):
+        raise ValueError("the ladder must rate exactly the strategies given")
+    if len(by_name) < 2:
+        raise ValueError("at least two strategies are needed")
+
+    games_played = 0
+    rounds = 0
+    while games_played < max_games and any(
+        ladder[name].deviation > target_deviation for name in by_name
+    ):
+        name, opponent_name = max(
+            combinations(by_name, 2),
+            key=lambda pair: ladder.expected_information(*pair),
+        )
+        # Alternate the seats, so neither strategy always plays Player.ONE
+        if rounds % 2 == 1:
+            name, opponent_name = opponent_name, name
+        games = min(games_per_round, max_games - games_played)
+        with simulate_games_in_processes(
+            by_name[name],
+            by_name[opponent_name],
+            games,
+            seed=seed + rounds,
+            processes=processes,
+            config=config,
+        ) as table:
+            for result in table:
+                ladder.record(name, opponent_name, result)
+        games_played += games
+        rounds += 1
+        yield name, opponent_name
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.ladder",
+        description="Rate the built-in strategies, playing the most informative games.",
+    )
+    parser.add_argument("--target-deviation", type=float, default=50.0)
+    parser.add_argument("--games-per-round", type=int, default=100)
+    parser.add_argument("--max-games", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins)
+    parser.add_argument(
+        "--pieces", type=int, default=DEFAULT_GAME_CONFIG.number_of_starting_pieces
+    )
+    args = parser.parse_args(argv)
+
+    config = GameConfig(args.bins, args.pieces)
+    strategies = list(get_simple_strategies(config).values())
+    ladder = RatingLadder([s.strategy_name for s in strategies])
+    rounds = list(
+        schedule_matchups(
+            strategies,
+            ladder,
+            target_deviation=args.target_deviation,
+            games_per_round=args.games_per_round,
+            max_games=args.max_games,
+            seed=args.seed,
+            processes=args.processes,
+            config=config,
+        )
+    )
+    print(f"Played {len(rounds)} rounds")
+    for rank, (name, rating) in enumerate(ladder.get_ranked(), start=1):
+        low, high = rating.interval
+        print(
+            f"{rank:>2}. {name:<45} {rating.rating:>7.1f}"
+            f" [{low:>7.1f}, {high:>7.1f}] from {rating.games} games"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
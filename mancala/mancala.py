@@ -1,9 +1,10 @@
-import copy
-from dataclasses import dataclass
+import os
+from dataclasses import InitVar, dataclass
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
-from mancala.config import NUMBER_OF_BINS, NUMBER_OF_STARTING_PIECES
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.tables import LANDS_IN_GOAL, get_game_tables
 
 
 class Player(Enum):
@@ -11,8 +12,21 @@ class Player(Enum):
     TWO = 1
 
 
-def _ensure_bin_selection_is_correct(selected_bin: int) -> None:
-    upper_bound = NUMBER_OF_BINS - 1
+_debug_checks = os.environ.get("MANCALA_DEBUG_CHECKS", "0") != "0"
+
+
+def set_debug_checks(enabled: bool) -> None:
+    """Re-enable every validation on the trusted engine-internal paths."""
+    global _debug_checks
+    _debug_checks = enabled
+
+
+def debug_checks_enabled() -> bool:
+    return _debug_checks
+
+
+def _ensure_bin_selection_is_correct(selected_bin: int, number_of_bins: int) -> None:
+    upper_bound = number_of_bins - 1
     if selected_bin < 0 or selected_bin > upper_bound:
         raise ValueError(f"bin must be between 0 and {upper_bound}, inclusive")
 
@@ -21,15 +35,33 @@ def _ensure_bin_selection_is_correct(selected_bin: int) -> None:
 class Turn:
     player: Player
     selected_bin: int
+    config: InitVar[GameConfig] = DEFAULT_GAME_CONFIG
 
-    def __post_init__(self):
-        _ensure_bin_selection_is_correct(self.selected_bin)
+    def __post_init__(self, config: GameConfig):
+        _ensure_bin_selection_is_correct(self.selected_bin, config.number_of_bins)
+
+    @classmethod
+    def trusted(
+        cls,
+        player: Player,
+        selected_bin: int,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+    ) -> "Turn":
+        """Builds a Turn without validation, for engine-internal use."""
+        if _debug_checks:
+            return cls(player, selected_bin, config)
+        turn = cls.__new__(cls)
+        turn.player = player
+        turn.selected_bin = selected_bin
+        return turn
 
 
 class PlayerRow:
-    def __init__(self, bins: List[int], goal: int):
-        if len(bins) != NUMBER_OF_BINS:
-            raise ValueError(f"bins must be of length {NUMBER_OF_BINS}")
+    def __init__(
+        self, bins: List[int], goal: int, config: GameConfig = DEFAULT_GAME_CONFIG
+    ):
+        if len(bins) != config.number_of_bins:
+            raise ValueError(f"bins must be of length {config.number_of_bins}")
         if not all(b >= 0 for b in bins):
             raise ValueError("All bins must have a non-negative amount of pieces")
         if goal < 0:
@@ -47,7 +79,8 @@ class PlayerRow:
         if not isinstance(other, PlayerRow):
             return False
         return (
-            all([b == other_b for b, other_b in zip(self.bins, other.bins)])
+            len(self.bins) == len(other.bins)
+            and all([b == other_b for b, other_b in zip(self.bins, other.bins)])
             and self.goal == other.goal
         )
 
@@ -60,10 +93,23 @@ class PlayerRow:
         return self._goal
 
     @classmethod
-    def get_new_player_row(cls) -> "PlayerRow":
+    def trusted(
+        cls, bins: List[int], goal: int, config: GameConfig = DEFAULT_GAME_CONFIG
+    ) -> "PlayerRow":
+        """Builds a PlayerRow without validation, for engine-internal use."""
+        if _debug_checks:
+            return cls(bins, goal, config)
+        player_row = cls.__new__(cls)
+        player_row._bins = bins
+        player_row._goal = goal
+        return player_row
+
+    @classmethod
+    def get_new_player_row(
+        cls, config: GameConfig = DEFAULT_GAME_CONFIG
+    ) -> "PlayerRow":
         return cls(
-            bins=[NUMBER_OF_STARTING_PIECES for _ in range(NUMBER_OF_BINS)],
-            goal=0,
+            bins=list(get_game_tables(config).starting_bins), goal=0, config=config
         )
 
     def add_pieces_to_goal(self, pieces: int = 1) -> None:
@@ -72,7 +118,7 @@ class PlayerRow:
         self._goal += pieces
 
     def add_piece_in_bin(self, bin: int) -> None:
-        _ensure_bin_selection_is_correct(bin)
+        _ensure_bin_selection_is_correct(bin, len(self._bins))
         self._bins[bin] += 1
 
 
@@ -80,129 +126,151 @@ class Board(Dict[Player, PlayerRow]):
     pass
 
 
-def get_new_board() -> Board:
+def get_new_board(config: GameConfig = DEFAULT_GAME_CONFIG) -> Board:
     return Board(
         {
-            Player.ONE: PlayerRow.get_new_player_row(),
-            Player.TWO: PlayerRow.get_new_player_row(),
+            Player.ONE: PlayerRow.get_new_player_row(config),
+            Player.TWO: PlayerRow.get_new_player_row(config),
         }
     )
 
 
-def take_turn(board: Board, turn: Turn) -> Board:
-    new_board = copy.deepcopy(board)
-    opponent = Player.ONE if turn.player == Player.TWO else Player.TWO
+def sow(
+    player_bins: List[int],
+    opponent_bins: List[int],
+    selected_bin: int,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Tuple[int, Optional[int]]:
+    """Sows the pieces of the selected bin in place, for any number of laps.
 
-    # 'Pick up' the pieces
-    pieces = new_board[turn.player].bins[turn.selected_bin]
-    new_board[turn.player].bins[turn.selected_bin] -= pieces
-
-    bin_indexes_to_increment = range(
-        max(0, turn.selected_bin - pieces), turn.selected_bin
-    )
-    pieces -= len(bin_indexes_to_increment)
-    for bin_index in bin_indexes_to_increment:
-        new_board[turn.player].add_piece_in_bin(bin_index)
-
-    # If there are no pieces, then stop; otherwise, add 1 piece to the goal
-    if pieces == 0:
-        last_piece_landed_in = list(bin_indexes_to_increment)[0]
-        landed_in_previously_empty_bin = (
-            new_board[turn.player].bins[last_piece_landed_in] == 1
-        )
-        opponent_has_pieces_in_same_bin = (
-            new_board[opponent].bins[last_piece_landed_in] > 0
-        )
-        if landed_in_previously_empty_bin and opponent_has_pieces_in_same_bin:
-            new_board[turn.player].bins[last_piece_landed_in] -= 1
-            stolen_pieces = new_board[opponent].bins[last_piece_landed_in]
-            new_board[opponent].bins[last_piece_landed_in] -= stolen_pieces
-            new_board[turn.player].add_pieces_to_goal(stolen_pieces + 1)
-        return new_board
-    new_board[turn.player].add_pieces_to_goal(1)
-    pieces -= 1
-
-    # If there are no pieces, then stop; otherwise, continue to opponent's row
-    if pieces == 0:
-        return new_board
-
-    last_bin_index = len(new_board[opponent].bins) - 1
-    bin_indexes_to_increment = range(
-        last_bin_index, max(-1, last_bin_index - pieces), -1
-    )
-    pieces -= len(bin_indexes_to_increment)
-    for bin_index in bin_indexes_to_increment:
-        new_board[opponent].add_piece_in_bin(bin_index)
-
-    # Potentially reach back around to the player's row, but this time
-    # we're starting at the bin furthest from the goal
-    if pieces == 0:
-        return new_board
-    last_bin_index = len(new_board[turn.player].bins) - 1
-    bin_indexes_to_increment = range(
-        last_bin_index, max(-1, last_bin_index - pieces), -1
-    )
-    pieces -= len(bin_indexes_to_increment)
-    for bin_index in bin_indexes_to_increment:
-        new_board[turn.player].add_piece_in_bin(bin_index)
-
-    if pieces == 0:
-        last_piece_landed_in = list(bin_indexes_to_increment)[-1]
-        landed_in_previously_empty_bin = (
-            new_board[turn.player].bins[last_piece_landed_in] == 1
-        )
-        opponent_has_pieces_in_same_bin = (
-            new_board[opponent].bins[last_piece_landed_in] > 0
-        )
-        if landed_in_previously_empty_bin and opponent_has_pieces_in_same_bin:
-            new_board[turn.player].bins[last_piece_landed_in] -= 1
-            stolen_pieces = new_board[opponent].bins[last_piece_landed_in]
-            new_board[opponent].bins[last_piece_landed_in] -= stolen_pieces
-            new_board[turn.player].add_pieces_to_goal(stolen_pieces + 1)
-        return new_board
-    new_board[turn.player].add_pieces_to_goal(1)
-    pieces -= 1
-
-    # If there are no pieces, then stop; otherwise, continue to opponent's row
-    if pieces == 0:
-        return new_board
-
-    last_bin_index = len(new_board[opponent].bins) - 1
-    bin_indexes_to_increment = range(
-        last_bin_index, max(-1, last_bin_index - pieces), -1
-    )
-    pieces -= len(bin_indexes_to_increment)
-    for bin_index in bin_indexes_to_increment:
-        new_board[opponent].add_piece_in_bin(bin_index)
-
-    return new_board
+    Whole laps around the board are added arithmetically and only the
+    remaining pieces are placed one bin at a time, so the work is
+    proportional to the number of bins rather than the number of pieces.
+    Returns the pieces to add to the player's goal and the player's bin the
+    last piece landed in, if it landed in the player's row.
 
+    """
+    tables = get_game_tables(config)
+    number_of_bins = config.number_of_bins
 
-def who_gets_next_turn(prior_board: Board, turn: Turn, new_board: Board) -> Player:
-    opponent = Player.ONE if turn.player == Player.TWO else Player.TWO
-
-    prior_player_bins = prior_board[turn.player].bins
-    prior_player_goal = prior_board[turn.player].goal
-    new_player_bins = new_board[turn.player].bins
-    new_player_goal = new_board[turn.player].goal
-
-    single_wrap_conditions = (
-        new_player_goal == prior_player_goal + 1
-        and prior_board[opponent].bins == new_board[opponent].bins
+    # 'Pick up' the pieces
+    pieces = player_bins[selected_bin]
+    player_bins[selected_bin] = 0
+
+    full_laps, remaining_pieces = divmod(pieces, tables.lap_length)
+    if full_laps > 0:
+        for bin_index in range(number_of_bins):
+            player_bins[bin_index] += full_laps
+            opponent_bins[bin_index] += full_laps
+    goal_pieces = full_laps
+
+    # Sow towards the goal, then into it, along the opponent's row starting
+    # at the bin furthest from their goal and back around to the player's row
+    pieces_in_row = min(remaining_pieces, selected_bin)
+    for bin_index in range(selected_bin - pieces_in_row, selected_bin):
+        player_bins[bin_index] += 1
+    remaining_pieces -= pieces_in_row
+    if remaining_pieces > 0:
+        goal_pieces += 1
+        remaining_pieces -= 1
+        pieces_in_opponents_row = min(remaining_pieces, number_of_bins)
+        for bin_index in range(
+            number_of_bins - pieces_in_opponents_row, number_of_bins
+        ):
+            opponent_bins[bin_index] += 1
+        remaining_pieces -= pieces_in_opponents_row
+        for bin_index in range(number_of_bins - remaining_pieces, number_of_bins):
+            player_bins[bin_index] += 1
+
+    landing = tables.landing[selected_bin][(pieces - 1) % tables.lap_length]
+    return goal_pieces, (landing if landing >= 0 else None)
+
+
+def play_move(
+    player_bins: List[int],
+    opponent_bins: List[int],
+    selected_bin: int,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Tuple[int, bool, int]:
+    """Sows the selected bin and applies any capture, in place on both rows.
+
+    Returns the pieces to add to the player's goal, whether the player gets
+    another turn and how many of the opponent's pieces were captured.
+
+    """
+    tables = get_game_tables(config)
+    pieces = player_bins[selected_bin]
+    goal_pieces, last_piece_landed_in = sow(
+        player_bins, opponent_bins, selected_bin, config
     )
-
-    double_wrap_conditions = (
-        new_player_goal == prior_player_goal + 2
-        and new_player_bins[turn.selected_bin] == 1
-        and all(
-            [
-                new_player_bins[i] == prior_player_bins[i] + 2
-                for i in range(turn.selected_bin)
-            ]
-        )
+    extra_turn = (
+        tables.landing[selected_bin][(pieces - 1) % tables.lap_length] == LANDS_IN_GOAL
     )
 
-    if single_wrap_conditions or double_wrap_conditions:
+    # Landing in a previously empty bin steals the opponent's pieces opposite it
+    captured_pieces = 0
+    if last_piece_landed_in is not None and player_bins[last_piece_landed_in] == 1:
+        capture_bin = tables.capture_bins[last_piece_landed_in]
+        captured_pieces = opponent_bins[capture_bin]
+        if captured_pieces > 0:
+            player_bins[last_piece_landed_in] = 0
+            opponent_bins[capture_bin] = 0
+            goal_pieces += captured_pieces + 1
+    return goal_pieces, extra_turn, captured_pieces
+
+
+def take_turn(
+    board: Board, turn: Turn, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> Board:
+    _ensure_bin_selection_is_correct(turn.selected_bin, config.number_of_bins)
+    if board[turn.player].bins[turn.selected_bin] == 0:
+        raise ValueError("selected bin must contain pieces")
+    return take_turn_trusted(board, turn, config)
+
+
+def take_turn_trusted(
+    board: Board, turn: Turn, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> Board:
+    """Performs the turn without validating the board or the selected bin.
+
+    This is the move path used inside the engine, where the turn has been
+    chosen from a board it produced itself. Enabling debug checks validates
+    the turn and both resulting rows.
+
+    """
+    if _debug_checks:
+        _ensure_bin_selection_is_correct(turn.selected_bin, config.number_of_bins)
+        if board[turn.player].bins[turn.selected_bin] == 0:
+            raise ValueError("selected bin must contain pieces")
+    opponent = Player.ONE if turn.player == Player.TWO else Player.TWO
+    player_bins = list(board[turn.player].bins)
+    opponent_bins = list(board[opponent].bins)
+
+    goal_pieces, _, _ = play_move(player_bins, opponent_bins, turn.selected_bin, config)
+    player_goal = board[turn.player].goal + goal_pieces
+
+    new_rows = {
+        turn.player: PlayerRow.trusted(player_bins, player_goal, config),
+        opponent: PlayerRow.trusted(opponent_bins, board[opponent].goal, config),
+    }
+    return Board({player: new_rows[player] for player in board})
+
+
+def who_gets_next_turn(
+    prior_board: Board,
+    turn: Turn,
+    new_board: Board,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Player:
+    """The player gets another turn when their last piece is sown into their goal.
+
+    Where the last piece lands only depends on the selected bin of the prior
+    board, so `new_board` is not inspected.
+
+    """
+    tables = get_game_tables(config)
+    pieces = prior_board[turn.player].bins[turn.selected_bin]
+    landing = tables.landing[turn.selected_bin][(pieces - 1) % tables.lap_length]
+    if landing == LANDS_IN_GOAL:
         return turn.player
-    else:
-        return opponent
+    return Player.ONE if turn.player == Player.TWO else Player.TWO
@@ -0,0 +1,343 @@
+import argparse
+import asyncio
+import random
+import shlex
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+from mancala.analysis import MoveAnalysis
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player, PlayerRow
+from mancala.position import (
+    Position,
+    apply_move,
+    get_canonical_position,
+    get_final_margin,
+    get_new_position,
+)
+from mancala.simulation import GameResult
+from mancala.strategy import PlayerStrategy, get_simple_strategies
+
+# Requests are "<id> <mover's bins> <mover's goal> <opponent's bins> <opponent's
+# goal>" and answers are "<id> <bin>", one per line. A bot may answer the
+# requests it has been sent in any order.
+_ENCODING = "ascii"
+
+
+class BotConnection:
+    """One long-lived bot, over a subprocess' stdin and stdout or a socket.
+
+    Requests from any number of games are written without waiting for the
+    answers to earlier ones, and each answer is matched back to its request
+    by id.
+
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        process: Optional[asyncio.subprocess.Process] = None,
+    ):
+        self._reader = reader
+        self._writer = writer
+        self._process = process
+        self._pending: Dict[int, "asyncio.Future[str]"] = {}
+        self._next_request_id = 0
+        self._reading = asyncio.ensure_future(self._read_answers())
+
+    @classmethod
+    async def spawn(cls, command: Sequence[str]) -> "BotConnection":
+        process = await asyncio.create_subprocess_exec(
+            *command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE
+        )
+        assert process.stdin is not None and process.stdout is not None
+        return cls(process.stdout, process.stdin, process)
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> "BotConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    @property
+    def outstanding(self) -> int:
+        """Requests sent and not answered yet."""
+        return len(self._pending)
+
+    async def _read_answers(self) -> None:
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            request_id, _, answer = line.decode(_ENCODING).strip().partition(" ")
+            future = (
+                self._pending.get(int(request_id)) if request_id.isdigit() else None
+            )
+            if future is not None and not future.done():
+                future.set_result(answer)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("the bot closed the connection"))
+
+    async def choose_bin(self, position: Position, timeout: Optional[float]) -> int:
+        """Ask for the bin to play in `position`, with the player to move first.
+
+        Raises `asyncio.TimeoutError` without an answer within `timeout`
+        seconds, `ConnectionError` once the bot is gone and `ValueError` for
+        an answer that is not a bin number.
+
+        """
+        request_id = self._next_request_id
+        self._next_request_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            if self._reading.done():
+                raise ConnectionError("the bot closed the connection")
+            values = " ".join(str(value) for value in position)
+            self._writer.write(f"{request_id} {values}\n".encode(_ENCODING))
+            await self._writer.drain()
+            return int(await asyncio.wait_for(future, timeout))
+        finally:
+            del self._pending[request_id]
+
+    async def close(self) -> None:
+        self._writer.close()
+        if self._process is not None:
+            await self._process.wait()
+        await self._reading
+
+
+class BotPool:
+    """Long-lived bots sharing the decisions of every game being played.
+
+    Each decision goes to the bot with the fewest unanswered requests, so
+    one slow game does not hold up the others.
+
+    """
+
+    def __init__(self, connections: Sequence[BotConnection], name: str):
+        if len(connections) == 0:
+            raise ValueError("a pool needs at least one bot")
+        self._connections = list(connections)
+        self._name = name
+
+    @classmethod
+    async def spawn(
+        cls, command: Sequence[str], bots: int = 1, name: Optional[str] = None
+    ) -> "BotPool":
+        connections = [await BotConnection.spawn(command) for _ in range(bots)]
+        return cls(connections, name or " ".join(command))
+
+    @property
+    def strategy_name(self) -> str:
+        return self._name
+
+    @property
+    def connections(self) -> List[BotConnection]:
+        return self._connections
+
+    async def choose_bin(self, position: Position, timeout: Optional[float]) -> int:
+        connection = min(self._connections, key=lambda c: c.outstanding)
+        return await connection.choose_bin(position, timeout)
+
+    async def close(self) -> None:
+        for connection in self._connections:
+            await connection.close()
+
+
+Contestant = Union[PlayerStrategy, BotPool]
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    game: GameResult
+    # The player whose bot timed out, failed or chose an empty bin, losing the game
+    forfeited_by: Optional[Player] = None
+
+
+async def _choose_bin(
+    contestant: Contestant,
+    position: Position,
+    timeout: Optional[float],
+    config: GameConfig,
+) -> int:
+    if isinstance(contestant, BotPool):
+        return await contestant.choose_bin(position, timeout)
+    number_of_bins = config.number_of_bins
+    return contestant.choose_bin_from_analysis(
+        MoveAnalysis(
+            PlayerRow.trusted(
+                list(position[:number_of_bins]), position[number_of_bins], config
+            ),
+            PlayerRow.trusted(
+                list(position[number_of_bins + 1 : -1]), position[-1], config
+            ),
+            config,
+        )
+    )
+
+
+def _get_result(
+    position: Position,
+    starting_player: Player,
+    plies: int,
+    winning_player: Optional[Player],
+    config: GameConfig,
+) -> GameResult:
+    return GameResult(
+        winning_player=winning_player,
+        starting_player=starting_player,
+        plies=plies,
+        player_one_goal=position[config.number_of_bins],
+        player_two_goal=position[-1],
+    )
+
+
+async def play_match(
+    contestants: Dict[Player, Contestant],
+    starting_player: Player,
+    move_timeout: Optional[float] = None,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> MatchResult:
+    """Play one game to the end, as `SimulationLoop.run` would."""
+    number_of_bins = config.number_of_bins
+    position = get_new_position(config)
+    player = starting_player
+    plies = 0
+    while True:
+        margin = get_final_margin(position, player, config)
+        if margin is not None:
+            break
+        opponent = Player.ONE if player == Player.TWO else Player.TWO
+        mover_position, _ = get_canonical_position(position, player, config)
+        try:
+            selected_bin = await _choose_bin(
+                contestants[player], mover_position, move_timeout, config
+            )
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            selected_bin = -1
+        if not 0 <= selected_bin < number_of_bins or mover_position[selected_bin] == 0:
+            return MatchResult(
+                _get_result(position, starting_player, plies, opponent, config),
+                forfeited_by=player,
+            )
+        position, player = apply_move(position, player, selected_bin, config)
+        plies += 1
+
+    # Pieces left in the bins go to their own side when the mover cannot move
+    winning_threshold = config.winning_threshold
+    if (
+        position[number_of_bins] <= winning_threshold
+        and position[-1] <= winning_threshold
+    ):
+        position = (
+            *([0] * number_of_bins),
+            sum(position[: number_of_bins + 1]),
+            *([0] * number_of_bins),
+            sum(position[number_of_bins + 1 :]),
+        )
+    if margin == 0:
+        winning_player = None
+    else:
+        opponent = Player.ONE if player == Player.TWO else Player.TWO
+        winning_player = player if margin > 0 else opponent
+    return MatchResult(
+        _get_result(position, starting_player, plies, winning_player, config)
+    )
+
+
+async def run_matches(
+    player_one: Contestant,
+    player_two: Contestant,
+    games: int,
+    starting_player: Optional[Player] = None,
+    move_timeout: Optional[float] = None,
+    concurrency: int = 1000,
+    seed: Optional[int] = None,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> List[MatchResult]:
+    """Play `games` games, up to `concurrency` of them at once.
+
+    Games waiting on a bot let the others carry on, so a pool of a few bot
+    processes is kept busy with decisions pipelined from many games. Games
+    without a `starting_player` have one drawn from `seed`.
+
+    """
+    if concurrency <= 0:
+        raise ValueError("concurrency should be positive")
+    for contestant in (player_one, player_two):
+        if isinstance(contestant, PlayerStrategy) and contestant.config != config:
+            raise ValueError("player strategies must use the same config as the games")
+    rng = random.Random(seed)
+    starting_players = [
+        starting_player or rng.choice([Player.ONE, Player.TWO]) for _ in range(games)
+    ]
+    contestants = {Player.ONE: player_one, Player.TWO: player_two}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _play(game_starting_player: Player) -> MatchResult:
+        async with semaphore:
+            return await play_match(
+                contestants, game_starting_player, move_timeout, config
+            )
+
+    return list(await asyncio.gather(*(_play(p) for p in starting_players)))
+
+
+async def _run_from_arguments(args: argparse.Namespace) -> List[MatchResult]:
+    config = GameConfig(args.bins, args.pieces)
+    strategies = get_simple_strategies(config)
+    contestants: List[Contestant] = []
+    try:
+        for player in (args.player_one, args.player_two):
+            if player in strategies:
+                contestants.append(strategies[player])
+            else:
+                contestants.append(await BotPool.spawn(shlex.split(player), args.bots))
+        return await run_matches(
+            contestants[0],
+            contestants[1],
+            args.games,
+            move_timeout=args.move_timeout,
+            concurrency=args.concurrency,
+            seed=args.seed,
+            config=config,
+        )
+    finally:
+        for contestant in contestants:
+            if isinstance(contestant, BotPool):
+                await contestant.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.match_server",
+        description="Play games between built-in strategies and external bots.",
+        epilog="A player is a built-in strategy name or a command starting a bot.",
+    )
+    parser.add_argument("player_one")
+    parser.add_argument("player_two")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--bots", type=int, default=1, help="processes per bot")
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--move-timeout", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins)
+    parser.add_argument(
+        "--pieces", type=int, default=DEFAULT_GAME_CONFIG.number_of_starting_pieces
+    )
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(_run_from_arguments(args))
+    for player, name in ((Player.ONE, args.player_one), (Player.TWO, args.player_two)):
+        wins = sum(r.game.winning_player == player for r in results)
+        forfeits = sum(r.forfeited_by == player for r in results)
+        print(f"{name}: {wins} wins, {forfeits} forfeits")
+    print(f"ties: {sum(r.game.winning_player is None for r in results)}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
@@ -0,0 +1,355 @@
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Board, Player, PlayerRow, play_move
+from mancala.tables import get_game_tables
+
+# A board laid out flat as Player.ONE's bins and goal then Player.TWO's
+Position = Tuple[int, ...]
+# The bin played, the resulting position, who moves next and the pieces captured
+Successor = Tuple[int, Position, Player, int]
+
+
+def board_to_position(board: Board) -> Position:
+    return (
+        *board[Player.ONE].bins,
+        board[Player.ONE].goal,
+        *board[Player.TWO].bins,
+        board[Player.TWO].goal,
+    )
+
+
+def position_to_board(
+    position: Position, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> Board:
+    number_of_bins = config.number_of_bins
+    return Board(
+        {
+            Player.ONE: PlayerRow(
+                bins=list(position[:number_of_bins]),
+                goal=position[number_of_bins],
+                config=config,
+            ),
+            Player.TWO: PlayerRow(
+                bins=list(position[number_of_bins + 1 : -1]),
+                goal=position[-1],
+                config=config,
+            ),
+        }
+    )
+
+
+def get_new_position(config: GameConfig = DEFAULT_GAME_CONFIG) -> Position:
+    starting_bins = get_game_tables(config).starting_bins
+    return (*starting_bins, 0, *starting_bins, 0)
+
+
+def get_row_offset(player: Player, config: GameConfig = DEFAULT_GAME_CONFIG) -> int:
+    return 0 if player == Player.ONE else config.number_of_bins + 1
+
+
+def get_canonical_position(
+    position: Position, player: Player, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> Tuple[Position, bool]:
+    """The position seen from the player to move, with their row and goal first.
+
+    Both players play the same game from their own side, so a position and
+    its mirror image with the other player to move share everything derived
+    from the mover's point of view. Also returns whether the rows were
+    swapped, to be passed to `restore_position`.
+
+    """
+    if player == Player.ONE:
+        return position, False
+    offset = get_row_offset(Player.TWO, config)
+    return (*position[offset:], *position[:offset]), True
+
+
+def restore_position(
+    canonical_position: Position,
+    swapped: bool,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Tuple[Position, Player]:
+    """Undo `get_canonical_position`, giving the position and player to move."""
+    if not swapped:
+        return canonical_position, Player.ONE
+    offset = get_row_offset(Player.TWO, config)
+    return (*canonical_position[offset:], *canonical_position[:offset]), Player.TWO
+
+
+def get_canonical_key(
+    position: Position, player: Player, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> int:
+    """Compact integer key shared by a position and its mirror image."""
+    return rank_position(get_canonical_position(position, player, config)[0], config)
+
+
+def apply_move(
+    position: Position,
+    player: Player,
+    selected_bin: int,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Tuple[Position, Player]:
+    """Flat-position equivalent of `take_turn` and `who_gets_next_turn`."""
+    number_of_bins = config.number_of_bins
+    opponent = Player.ONE if player == Player.TWO else Player.TWO
+    player_offset = get_row_offset(player, config)
+    opponent_offset = get_row_offset(opponent, config)
+    values = list(position)
+    player_bins = values[player_offset : player_offset + number_of_bins]
+    opponent_bins = values[opponent_offset : opponent_offset + number_of_bins]
+
+    goal_pieces, extra_turn, _ = play_move(
+        player_bins, opponent_bins, selected_bin, config
+    )
+
+    values[player_offset : player_offset + number_of_bins] = player_bins
+    values[player_offset + number_of_bins] += goal_pieces
+    values[opponent_offset : opponent_offset + number_of_bins] = opponent_bins
+    return tuple(values), (player if extra_turn else opponent)
+
+
+def _add_successors(
+    position: Position,
+    player: Player,
+    config: GameConfig,
+    player_bins: List[int],
+    opponent_bins: List[int],
+    successors: List[Successor],
+) -> None:
+    number_of_bins = config.number_of_bins
+    opponent = Player.ONE if player == Player.TWO else Player.TWO
+    player_offset = get_row_offset(player, config)
+    opponent_offset = get_row_offset(opponent, config)
+    player_row = position[player_offset : player_offset + number_of_bins]
+    opponent_row = position[opponent_offset : opponent_offset + number_of_bins]
+    player_goal = position[player_offset + number_of_bins]
+    opponent_goal = position[opponent_offset + number_of_bins]
+    for selected_bin in range(number_of_bins):
+        if player_row[selected_bin] == 0:
+            continue
+        player_bins[:] = player_row
+        opponent_bins[:] = opponent_row
+        goal_pieces, extra_turn, captured_pieces = play_move(
+            player_bins, opponent_bins, selected_bin, config
+        )
+        if player == Player.ONE:
+            child = (
+                *player_bins,
+                player_goal + goal_pieces,
+                *opponent_bins,
+                opponent_goal,
+            )
+        else:
+            child = (
+                *opponent_bins,
+                opponent_goal,
+                *player_bins,
+                player_goal + goal_pieces,
+            )
+        successors.append(
+            (
+                selected_bin,
+                child,
+                player if extra_turn else opponent,
+                captured_pieces,
+            )
+        )
+
+
+def get_successors(
+    position: Position, player: Player, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> List[Successor]:
+    """Every legal move of `player` from `position`, in the order of the bins.
+
+    The rows are split out of the position once and every move is sown into
+    the same pair of row buffers, rather than copying the whole position for
+    each move as `apply_move` does.
+
+    """
+    number_of_bins = config.number_of_bins
+    successors: List[Successor] = []
+    _add_successors(
+        position,
+        player,
+        config,
+        [0] * number_of_bins,
+        [0] * number_of_bins,
+        successors,
+    )
+    return successors
+
+
+def get_successors_batch(
+    parents: Iterable[Tuple[Position, Player]],
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> List[List[Successor]]:
+    """`get_successors` for each of `parents`, sharing the row buffers between them."""
+    number_of_bins = config.number_of_bins
+    player_bins = [0] * number_of_bins
+    opponent_bins = [0] * number_of_bins
+    batch = []
+    for position, player in parents:
+        successors: List[Successor] = []
+        _add_successors(
+            position, player, config, player_bins, opponent_bins, successors
+        )
+        batch.append(successors)
+    return batch
+
+
+def is_game_over(
+    position: Position, player: Player, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> bool:
+    """The game is over once a goal holds over half the pieces or `player` cannot move."""
+    number_of_bins = config.number_of_bins
+    winning_threshold = get_game_tables(config).winning_threshold
+    if position[number_of_bins] > winning_threshold or position[-1] > winning_threshold:
+        return True
+    offset = get_row_offset(player, config)
+    return not any(position[offset : offset + number_of_bins])
+
+
+def get_final_margin(
+    position: Position, player: Player, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> Optional[int]:
+    """How far `player`, to move, finishes ahead if the game is over, else `None`.
+
+    Pieces left in the bins go to their own side once `player` cannot move.
+
+    """
+    number_of_bins = config.number_of_bins
+    player_offset = get_row_offset(player, config)
+    opponent_offset = number_of_bins + 1 - player_offset
+    player_goal = position[player_offset + number_of_bins]
+    opponent_goal = position[opponent_offset + number_of_bins]
+    winning_threshold = get_game_tables(config).winning_threshold
+    if player_goal > winning_threshold or opponent_goal > winning_threshold:
+        return player_goal - opponent_goal
+    if any(position[player_offset : player_offset + number_of_bins]):
+        return None
+    return (
+        player_goal
+        - opponent_goal
+        - sum(position[opponent_offset : opponent_offset + number_of_bins])
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_binomials(config: GameConfig) -> Tuple[Tuple[int, ...], ...]:
+    size = config.total_pieces + 2 * (config.number_of_bins + 1)
+    binomials: List[List[int]] = [[1] + [0] * size]
+    for n in range(1, size + 1):
+        previous = binomials[-1]
+        binomials.append(
+            [1] + [previous[k - 1] + previous[k] for k in range(1, size + 1)]
+        )
+    return tuple(tuple(row) for row in binomials)
+
+
+def count_compositions(
+    total: int, parts: int, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> int:
+    """Number of ways to spread `total` pieces over `parts` slots."""
+    return _get_binomials(config)[total + parts - 1][parts - 1]
+
+
+def rank_composition(
+    values: Sequence[int], total: int, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> int:
+    """Lexicographic rank of `values` among the ways to spread `total` pieces.
+
+    `total` must be at most `config.total_pieces`, which bounds the cached
+    binomial table, and ranks run from zero up to `count_compositions`.
+
+    """
+    binomials = _get_binomials(config)
+    slots = len(values)
+    remaining_pieces = total
+    rank = 0
+    for index in range(slots - 1):
+        parts = slots - index
+        pieces = values[index]
+        # Count the compositions sharing the prefix with fewer pieces in this slot
+        rank += (
+            binomials[remaining_pieces + parts - 1][parts - 1]
+            - binomials[remaining_pieces - pieces + parts - 1][parts - 1]
+        )
+        remaining_pieces -= pieces
+    return rank
+
+
+def unrank_composition(
+    rank: int, total: int, parts: int, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> Tuple[int, ...]:
+    binomials = _get_binomials(config)
+    remaining_pieces = total
+    values = []
+    for index in range(parts - 1):
+        remaining_parts = parts - index
+        pieces = 0
+        while True:
+            # Compositions with `pieces` in this slot and the rest spread after it
+            count = binomials[remaining_pieces - pieces + remaining_parts - 2][
+                remaining_parts - 2
+            ]
+            if rank < count:
+                break
+            rank -= count
+            pieces += 1
+        values.append(pieces)
+        remaining_pieces -= pieces
+    values.append(remaining_pieces)
+    return tuple(values)
+
+
+def count_positions(config: GameConfig = DEFAULT_GAME_CONFIG) -> int:
+    """Number of ways to spread every piece of the game over the bins and goals."""
+    return count_compositions(
+        config.total_pieces, 2 * (config.number_of_bins + 1), config
+    )
+
+
+def ensure_keys_fit_in_64_bits(config: GameConfig = DEFAULT_GAME_CONFIG) -> None:
+    """Reject configs whose `encode_position` keys do not fit in 64 bits.
+
+    Key sets, tables and files store keys as unsigned 64-bit integers, with
+    one value to spare to mark empty slots.
+
+    """
+    if 2 * count_positions(config) + 1 >= 2 ** 64:
+        raise ValueError(
+            f"positions of {config.number_of_bins} bins and "
+            f"{config.number_of_starting_pieces} pieces do not fit in 64-bit keys"
+        )
+
+
+def rank_position(position: Position, config: GameConfig = DEFAULT_GAME_CONFIG) -> int:
+    """Lexicographic rank of `position` among all positions of the game.
+
+    Positions must hold exactly `config.total_pieces` pieces, and ranks run
+    from zero up to `count_positions(config)`.
+
+    """
+    return rank_composition(position, config.total_pieces, config)
+
+
+def unrank_position(rank: int, config: GameConfig = DEFAULT_GAME_CONFIG) -> Position:
+    return unrank_composition(
+        rank, config.total_pieces, 2 * (config.number_of_bins + 1), config
+    )
+
+
+def encode_position(
+    position: Position, player: Player, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> int:
+    """Compact integer key for a position and the player to move."""
+    return 2 * rank_position(position, config) + player.value
+
+
+def decode_position(
+    key: int, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> Tuple[Position, Player]:
+    rank, player = divmod(key, 2)
+    return unrank_position(rank, config), Player(player)
@@ -0,0 +1,327 @@
+import argparse
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player
+from mancala.position import (
+    decode_position,
+    encode_position,
+    ensure_keys_fit_in_64_bits,
+    get_new_position,
+    get_successors,
+    is_game_over,
+)
+
+_KEY_TYPECODE = "Q"
+_KEY_SIZE = array(_KEY_TYPECODE).itemsize
+_READ_CHUNK_KEYS = 1 << 16
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK_64 = (1 << 64) - 1
+
+
+class CompactKeySet:
+    """Open-addressing hash set of 64-bit keys kept in a flat array.
+
+    Each key costs 8 bytes per slot rather than a full Python object, with
+    the table doubling whenever it becomes half full. Keys must be below
+    2 ** 64 - 1, since slots store `key + 1` so that zero marks an empty slot.
+
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._bits = max(capacity - 1, 1).bit_length()
+        self._slots = array(_KEY_TYPECODE, bytes(_KEY_SIZE << self._bits))
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[int]:
+        return (slot - 1 for slot in self._slots if slot)
+
+    def _find_slot(self, stored: int) -> int:
+        mask = (1 << self._bits) - 1
+        index = ((stored * _HASH_MULTIPLIER) & _MASK_64) >> (64 - self._bits)
+        slots = self._slots
+        while slots[index] and slots[index] != stored:
+            index = (index + 1) & mask
+        return index
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, int):
+            return False
+        return self._slots[self._find_slot(key + 1)] != 0
+
+    def add(self, key: int) -> bool:
+        """Add `key`, returning whether it was not already in the set."""
+        stored = key + 1
+        index = self._find_slot(stored)
+        if self._slots[index]:
+            return False
+        self._slots[index] = stored
+        self._size += 1
+        if 2 * self._size > len(self._slots):
+            self._grow()
+        return True
+
+    def _grow(self) -> None:
+        old_slots = self._slots
+        self._bits += 1
+        self._slots = array(_KEY_TYPECODE, bytes(_KEY_SIZE << self._bits))
+        for stored in old_slots:
+            if stored:
+                self._slots[self._find_slot(stored)] = stored
+
+    def clear(self) -> None:
+        self._slots = array(_KEY_TYPECODE, bytes(len(self._slots) * _KEY_SIZE))
+        self._size = 0
+
+    def sorted_keys(self) -> array:
+        return array(_KEY_TYPECODE, sorted(self))
+
+
+@dataclass
+class DepthCount:
+    depth: int
+    positions: int
+    terminal_positions: int
+    positions_by_pieces_in_bins: Dict[int, int] = field(default_factory=dict)
+    path: Optional[str] = None
+
+
+def _write_keys(path: str, keys: Iterable[int]) -> int:
+    written = 0
+    buffer = array(_KEY_TYPECODE)
+    with open(path, "wb") as f:
+        for key in keys:
+            buffer.append(key)
+            if len(buffer) == _READ_CHUNK_KEYS:
+                buffer.tofile(f)
+                written += len(buffer)
+                del buffer[:]
+        buffer.tofile(f)
+        written += len(buffer)
+    return written
+
+
+def read_keys(path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[int]:
+    """Stream the sorted keys of a layer or run file, optionally a slice of them."""
+    if stop is None:
+        stop = os.path.getsize(path) // _KEY_SIZE
+    with open(path, "rb") as f:
+        f.seek(start * _KEY_SIZE)
+        while start < stop:
+            keys = array(_KEY_TYPECODE)
+            keys.fromfile(f, min(_READ_CHUNK_KEYS, stop - start))
+            start += len(keys)
+            yield from keys
+
+
+def _merge_unique(sorted_streams: Sequence[Iterable[int]]) -> Iterator[int]:
+    previous = None
+    for key in heapq.merge(*sorted_streams):
+        if key != previous:
+            yield key
+            previous = key
+
+
+def _subtract(keys: Iterable[int], seen_keys: Iterable[int]) -> Iterator[int]:
+    """Sorted `keys` that are not in the sorted `seen_keys`."""
+    seen = iter(seen_keys)
+    seen_key = next(seen, None)
+    for key in keys:
+        while seen_key is not None and seen_key < key:
+            seen_key = next(seen, None)
+        if seen_key != key:
+            yield key
+
+
+def _expand_layer_slice(
+    layer_path: str,
+    start: int,
+    stop: int,
+    run_prefix: str,
+    memory_limit: int,
+    config: GameConfig,
+    expand: bool,
+) -> Tuple[List[str], int, Dict[int, int]]:
+    """Expand one slice of a layer into sorted runs of child keys.
+
+    Children are deduplicated in a CompactKeySet that is spilled to a new
+    sorted run file whenever it holds `memory_limit` keys. Returns the run
+    paths, the number of terminal positions and the positions in the slice
+    counted by the pieces left in the bins.
+
+    """
+    number_of_bins = config.number_of_bins
+    children = CompactKeySet()
+    run_paths: List[str] = []
+    terminal_positions = 0
+    by_pieces_in_bins: Counter = Counter()
+
+    def _spill() -> None:
+        run_path = f"{run_prefix}-{len(run_paths)}.run"
+        _write_keys(run_path, children.sorted_keys())
+        run_paths.append(run_path)
+        children.clear()
+
+    for key in read_keys(layer_path, start, stop):
+        position, player = decode_position(key, config)
+        by_pieces_in_bins[
+            config.total_pieces - position[number_of_bins] - position[-1]
+        ] += 1
+        if is_game_over(position, player, config):
+            terminal_positions += 1
+            continue
+        if not expand:
+            continue
+        for _, child, next_player, _ in get_successors(position, player, config):
+            children.add(encode_position(child, next_player, config))
+            if len(children) >= memory_limit:
+                _spill()
+    if len(children) > 0:
+        _spill()
+    return run_paths, terminal_positions, dict(by_pieces_in_bins)
+
+
+def enumerate_reachable_positions(
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+    max_depth: Optional[int] = None,
+    processes: int = 1,
+    memory_limit: int = 1_000_000,
+    work_dir: Optional[str] = None,
+    dump_states: bool = False,
+    starting_players: Sequence[Player] = (Player.ONE, Player.TWO),
+) -> Iterator[DepthCount]:
+    """Breadth-first enumeration of the positions reachable from a new board.
+
+    Positions are counted at the first ply they can be reached, with the
+    player to move being part of the position. Each layer is kept on disk as
+    a sorted file of position keys, built by merging the sorted runs the
+    expansion spilled and removing keys seen at earlier depths. Layers are
+    expanded in slices across `processes` worker processes. With
+    `dump_states`, every layer file is kept in `work_dir` and its path is
+    reported, to be read back with `read_keys` and `decode_position`.
+
+    """
+    if memory_limit <= 0:
+        raise ValueError("memory_limit should be positive")
+    ensure_keys_fit_in_64_bits(config)
+    created_work_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="mancala-reachable-")
+    os.makedirs(work_dir, exist_ok=True)
+    executor = ProcessPoolExecutor(max_workers=processes) if processes > 1 else None
+    layer_paths: List[str] = []
+    try:
+        layer_path = os.path.join(work_dir, "depth-0.keys")
+        new_position = get_new_position(config)
+        layer_size = _write_keys(
+            layer_path,
+            sorted(
+                {encode_position(new_position, p, config) for p in starting_players}
+            ),
+        )
+        depth = 0
+        while layer_size > 0:
+            layer_paths.append(layer_path)
+            expand = max_depth is None or depth < max_depth
+            slice_size = -(-layer_size // processes)
+            slices = [
+                (
+                    layer_path,
+                    start,
+                    min(start + slice_size, layer_size),
+                    os.path.join(work_dir, f"depth-{depth + 1}-slice-{start}"),
+                    memory_limit,
+                    config,
+                    expand,
+                )
+                for start in range(0, layer_size, slice_size)
+            ]
+            if executor is None:
+                expansions = [_expand_layer_slice(*s) for s in slices]
+            else:
+                expansions = list(executor.map(_expand_layer_slice, *zip(*slices)))
+
+            by_pieces_in_bins: Counter = Counter()
+            for _, _, slice_by_pieces_in_bins in expansions:
+                by_pieces_in_bins.update(slice_by_pieces_in_bins)
+            yield DepthCount(
+                depth=depth,
+                positions=layer_size,
+                terminal_positions=sum(e[1] for e in expansions),
+                positions_by_pieces_in_bins=dict(sorted(by_pieces_in_bins.items())),
+                path=layer_path if dump_states else None,
+            )
+            if not expand:
+                break
+
+            run_paths = [run_path for e in expansions for run_path in e[0]]
+            depth += 1
+            layer_path = os.path.join(work_dir, f"depth-{depth}.keys")
+            new_keys = _subtract(
+                _merge_unique([read_keys(p) for p in run_paths]),
+                _merge_unique([read_keys(p) for p in layer_paths]),
+            )
+            layer_size = _write_keys(layer_path, new_keys)
+            for run_path in run_paths:
+                os.remove(run_path)
+        if layer_size == 0:
+            os.remove(layer_path)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if created_work_dir and not dump_states:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        elif not dump_states:
+            for path in layer_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.reachable",
+        description="Count the positions reachable from a new board at each ply.",
+    )
+    parser.add_argument("--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins)
+    parser.add_argument(
+        "--pieces", type=int, default=DEFAULT_GAME_CONFIG.number_of_starting_pieces
+    )
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--memory-limit", type=int, default=1_000_000)
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument("--dump-states", action="store_true")
+    args = parser.parse_args(argv)
+
+    total = 0
+    for count in enumerate_reachable_positions(
+        config=GameConfig(args.bins, args.pieces),
+        max_depth=args.max_depth,
+        processes=args.processes,
+        memory_limit=args.memory_limit,
+        work_dir=args.work_dir,
+        dump_states=args.dump_states,
+    ):
+        total += count.positions
+        print(
+            f"depth {count.depth:>3}: {count.positions:>12} positions, "
+            f"{count.terminal_positions:>12} terminal, total {total:>14}"
+            + (f", states in {count.path}" if count.path else "")
+        )
+        print(f"  by pieces in bins: {count.positions_by_pieces_in_bins}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
@@ -0,0 +1,35 @@
+import random
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, cast
+
+_thread_state = threading.local()
+
+
+def get_rng() -> random.Random:
+    """The random generator of the calling thread.
+
+    Threads without a generator of their own, set with `set_thread_rng`,
+    share the global generator of the `random` module, so seeding it with
+    `random.seed` still decides their games.
+
+    """
+    rng = getattr(_thread_state, "rng", None)
+    # The module's functions are those of its global generator
+    return rng if rng is not None else cast(random.Random, random)
+
+
+def set_thread_rng(rng: Optional[random.Random]) -> None:
+    """Give the calling thread its own generator, or `None` to share the global one."""
+    _thread_state.rng = rng
+
+
+@contextmanager
+def use_thread_rng(rng: random.Random) -> Iterator[random.Random]:
+    """Give the calling thread `rng` for a while, then restore its previous generator."""
+    previous = getattr(_thread_state, "rng", None)
+    set_thread_rng(rng)
+    try:
+        yield rng
+    finally:
+        set_thread_rng(previous)
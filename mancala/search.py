@@ -0,0 +1,418 @@
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple, Union, cast
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player
+from mancala.position import (
+    Position,
+    Successor,
+    apply_move,
+    get_canonical_key,
+    get_final_margin,
+    get_row_offset,
+    get_successors,
+)
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# depth, bound, score and best bin of a searched position
+TableEntry = Tuple[int, int, int, int]
+
+# Each shared slot holds the folded key XOR the packed entry, then the entry
+SHARED_SLOT_FORMAT = "<QQ"
+SHARED_SLOT_SIZE = struct.calcsize(SHARED_SLOT_FORMAT)
+_OCCUPIED = 1 << 63
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK_64 = (1 << 64) - 1
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    best_bin: int
+    score: int
+    depth: int
+    nodes: int
+
+
+class TranspositionTable:
+    """Results of earlier searches by canonical position key.
+
+    Scores are for the player to move, so a position and its mirror image
+    with the other player to move share an entry (see `get_canonical_key`).
+
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[int, TableEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def probe(self, key: int) -> Optional[TableEntry]:
+        return self._entries.get(key)
+
+    def store(
+        self, key: int, depth: int, bound: int, score: int, best_bin: int
+    ) -> None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= depth:
+            self._entries[key] = (depth, bound, score, best_bin)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _fold_key(key: int) -> int:
+    """A 64-bit hash of a position key of any size.
+
+    Keys below 2 ** 64 each hash to a different value, so only keys of
+    boards too large for 64-bit keys can share a hash.
+
+    """
+    folded = 0
+    while True:
+        folded = ((folded ^ (key & _MASK_64)) * _HASH_MULTIPLIER) & _MASK_64
+        key >>= 64
+        if not key:
+            return folded
+
+
+def _pack_entry(depth: int, bound: int, score: int, best_bin: int) -> int:
+    return _OCCUPIED | depth << 32 | bound << 24 | (score & 0xFFFF) << 8 | best_bin
+
+
+def _unpack_entry(data: int) -> TableEntry:
+    score = (data >> 8) & 0xFFFF
+    return (
+        (data >> 32) & 0x7FFFFFFF,
+        (data >> 24) & 0xFF,
+        score - 0x10000 if score & 0x8000 else score,
+        data & 0xFF,
+    )
+
+
+class SharedTranspositionTable:
+    """Fixed-size transposition table in shared memory, without locks.
+
+    Keys are folded to a 64-bit hash, which picks the slot. Every slot
+    stores the hash XOR its packed entry next to the entry, so a probe only
+    accepts an entry whose check word matches the hash of the key it asked
+    for. Slots torn by a concurrent write, or taken by another key hashing
+    to the same slot, are treated as misses. Workers attach by `name`.
+
+    """
+
+    def __init__(self, slots: int = 1 << 20, name: Optional[str] = None):
+        if slots <= 0 or slots & (slots - 1):
+            raise ValueError("slots should be a positive power of two")
+        self._slots = slots
+        self._shift = 64 - (slots.bit_length() - 1)
+        self._owner = name is None
+        if self._owner:
+            self._shared_memory = shared_memory.SharedMemory(
+                create=True, size=slots * SHARED_SLOT_SIZE
+            )
+        else:
+            self._shared_memory = shared_memory.SharedMemory(name=name)
+        self._buffer = cast(memoryview, self._shared_memory.buf)
+        if self._owner:
+            self.clear()
+
+    def __enter__(self) -> "SharedTranspositionTable":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(
+            1
+            for slot in range(self._slots)
+            if struct.unpack_from("<Q", self._buffer, slot * SHARED_SLOT_SIZE + 8)[0]
+        )
+
+    @property
+    def name(self) -> str:
+        return self._shared_memory.name
+
+    @property
+    def slots(self) -> int:
+        return self._slots
+
+    @classmethod
+    def attach(cls, name: str, slots: int) -> "SharedTranspositionTable":
+        return cls(slots, name=name)
+
+    def close(self) -> None:
+        """Detach from the table, releasing it if this process created it."""
+        self._shared_memory.close()
+        if self._owner:
+            self._shared_memory.unlink()
+
+    def _get_offset(self, folded_key: int) -> int:
+        if self._shift == 64:
+            return 0
+        return (folded_key >> self._shift) * SHARED_SLOT_SIZE
+
+    def probe(self, key: int) -> Optional[TableEntry]:
+        folded_key = _fold_key(key)
+        check, data = struct.unpack_from(
+            SHARED_SLOT_FORMAT, self._buffer, self._get_offset(folded_key)
+        )
+        if not data or check ^ data != folded_key:
+            return None
+        return _unpack_entry(data)
+
+    def store(
+        self, key: int, depth: int, bound: int, score: int, best_bin: int
+    ) -> None:
+        folded_key = _fold_key(key)
+        offset = self._get_offset(folded_key)
+        check, data = struct.unpack_from(SHARED_SLOT_FORMAT, self._buffer, offset)
+        # Keep a deeper entry for the same key, replacing anything else
+        if data and check ^ data == folded_key and _unpack_entry(data)[0] > depth:
+            return
+        data = _pack_entry(depth, bound, score, best_bin)
+        struct.pack_into(
+            SHARED_SLOT_FORMAT, self._buffer, offset, folded_key ^ data, data
+        )
+
+    def clear(self) -> None:
+        self._buffer[: self._slots * SHARED_SLOT_SIZE] = bytes(
+            self._slots * SHARED_SLOT_SIZE
+        )
+
+
+Table = Union[TranspositionTable, SharedTranspositionTable]
+
+
+def evaluate(
+    position: Position, player: Player, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> int:
+    """Goal margin of `player`, or the final margin once the game is over."""
+    final_margin = get_final_margin(position, player, config)
+    if final_margin is not None:
+        return final_margin
+    number_of_bins = config.number_of_bins
+    player_offset = get_row_offset(player, config)
+    opponent_offset = number_of_bins + 1 - player_offset
+    return (
+        position[player_offset + number_of_bins]
+        - position[opponent_offset + number_of_bins]
+    )
+
+
+class AlphaBetaSearch:
+    """Depth-limited negamax search with alpha-beta pruning.
+
+    Depths count plies, so a move earning another turn uses up a ply while
+    keeping the same side to move. Scores are goal margins for the player to
+    move and exact final margins once the game is over.
+
+    """
+
+    def __init__(
+        self,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+        table: Optional[Table] = None,
+    ):
+        self._config = config
+        self._table = table if table is not None else TranspositionTable()
+        self.nodes = 0
+
+    @property
+    def table(self) -> Table:
+        return self._table
+
+    def _get_ordered_successors(
+        self, position: Position, player: Player, table_bin: int
+    ) -> List[Successor]:
+        successors = get_successors(position, player, self._config)
+        # The best move found earlier first, then moves ending in the goal
+        successors.sort(key=lambda s: (s[0] != table_bin, s[2] != player))
+        return successors
+
+    def negamax(
+        self, position: Position, player: Player, depth: int, alpha: int, beta: int
+    ) -> int:
+        self.nodes += 1
+        if depth == 0 or get_final_margin(position, player, self._config) is not None:
+            return evaluate(position, player, self._config)
+
+        key = get_canonical_key(position, player, self._config)
+        entry = self._table.probe(key)
+        table_bin = -1
+        if entry is not None:
+            entry_depth, bound, score, table_bin = entry
+            if entry_depth >= depth and (
+                bound == EXACT
+                or (bound == LOWER_BOUND and score >= beta)
+                or (bound == UPPER_BOUND and score <= alpha)
+            ):
+                return score
+
+        original_alpha = alpha
+        best_score = -self._config.total_pieces - 1
+        best_bin = -1
+        for selected_bin, child, next_player, _ in self._get_ordered_successors(
+            position, player, table_bin
+        ):
+            if next_player == player:
+                score = self.negamax(child, player, depth - 1, alpha, beta)
+            else:
+                score = -self.negamax(child, next_player, depth - 1, -beta, -alpha)
+            if score > best_score:
+                best_score, best_bin = score, selected_bin
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self._table.store(key, depth, bound, best_score, best_bin)
+        return best_score
+
+    def search(self, position: Position, player: Player, depth: int) -> SearchResult:
+        """Iteratively deepen up to `depth` plies, returning the best move found."""
+        if depth <= 0:
+            raise ValueError("depth should be positive")
+        if get_final_margin(position, player, self._config) is not None:
+            raise ValueError("the game is over in this position")
+        self.nodes = 0
+        window = self._config.total_pieces + 1
+        for iteration_depth in range(1, depth + 1):
+            score = self.negamax(position, player, iteration_depth, -window, window)
+        entry = self._table.probe(get_canonical_key(position, player, self._config))
+        assert entry is not None
+        return SearchResult(
+            best_bin=entry[3], score=score, depth=depth, nodes=self.nodes
+        )
+
+
+def _search_root_move(
+    table_name: str,
+    table_slots: int,
+    position: Position,
+    player: Player,
+    selected_bin: int,
+    depth: int,
+    alpha: int,
+    config: GameConfig,
+) -> Tuple[int, int]:
+    """Iteratively deepen below one root move, returning its score and nodes.
+
+    Scores at or below `alpha` are only upper bounds, as the move cannot
+    improve on the score already found for another root move.
+
+    """
+    table = SharedTranspositionTable.attach(table_name, table_slots)
+    try:
+        search = AlphaBetaSearch(config, table)
+        child, next_player = apply_move(position, player, selected_bin, config)
+        window = config.total_pieces + 1
+        for iteration_depth in range(depth):
+            if next_player == player:
+                score = search.negamax(child, player, iteration_depth, alpha, window)
+            else:
+                score = -search.negamax(
+                    child, next_player, iteration_depth, -window, -alpha
+                )
+        return score, search.nodes
+    finally:
+        table.close()
+
+
+class ParallelAlphaBetaSearch:
+    """Root-split `AlphaBetaSearch` across worker processes.
+
+    The most promising root move is searched first to give a bound that the
+    workers search the remaining root moves against, one per worker. Every
+    worker shares one `SharedTranspositionTable`, so positions reached
+    through different root moves are only searched once. The workers and
+    the table are kept for the lifetime of the search, to be released with
+    `close`.
+
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+        table_slots: int = 1 << 20,
+    ):
+        if processes <= 0:
+            raise ValueError("processes should be positive")
+        self._config = config
+        self._table = SharedTranspositionTable(table_slots)
+        self._ordering_search = AlphaBetaSearch(config, self._table)
+        self._executor = (
+            ProcessPoolExecutor(max_workers=processes) if processes > 1 else None
+        )
+
+    def __enter__(self) -> "ParallelAlphaBetaSearch":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def table(self) -> SharedTranspositionTable:
+        return self._table
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._table.close()
+
+    def search(self, position: Position, player: Player, depth: int) -> SearchResult:
+        if depth <= 0:
+            raise ValueError("depth should be positive")
+        if get_final_margin(position, player, self._config) is not None:
+            raise ValueError("the game is over in this position")
+        key = get_canonical_key(position, player, self._config)
+        entry = self._table.probe(key)
+        moves = [
+            successor[0]
+            for successor in self._ordering_search._get_ordered_successors(
+                position, player, entry[3] if entry is not None else -1
+            )
+        ]
+        window = self._config.total_pieces + 1
+
+        def _get_arguments(selected_bin: int, alpha: int) -> Tuple:
+            return (
+                self._table.name,
+                self._table.slots,
+                position,
+                player,
+                selected_bin,
+                depth,
+                alpha,
+                self._config,
+            )
+
+        best_score, nodes = _search_root_move(*_get_arguments(moves[0], -window))
+        arguments = [_get_arguments(b, best_score) for b in moves[1:]]
+        if self._executor is None:
+            results = [_search_root_move(*a) for a in arguments]
+        else:
+            results = list(self._executor.map(_search_root_move, *zip(*arguments)))
+
+        best_bin = moves[0]
+        for selected_bin, (score, move_nodes) in zip(moves[1:], results):
+            nodes += move_nodes
+            if score > best_score:
+                best_score, best_bin = score, selected_bin
+        self._table.store(key, depth, EXACT, best_score, best_bin)
+        return SearchResult(
+            best_bin=best_bin, score=best_score, depth=depth, nodes=1 + nodes
+        )
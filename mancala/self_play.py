@@ -0,0 +1,320 @@
+import argparse
+import ast
+import json
+import mmap
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from mancala.batch import play_games
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player
+from mancala.position import Position, board_to_position, get_canonical_position
+from mancala.simulation import SimulationLoop
+from mancala.strategy import PlayerStrategy, get_simple_strategies
+
+# The position from the side of the player to move, the player to move, how
+# the game ended for them, the final goal margin for them and the plies left
+TrainingRecord = Tuple[Position, Player, int, int, int]
+ShardInfo = Tuple[str, int]
+
+MANIFEST_NAME = "manifest.json"
+
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+# Headers are padded to a fixed size, so the shape can be filled in at the end
+_NPY_PREFIX_SIZE = 256
+_WRITE_BUFFER_BYTES = 1 << 20
+
+
+def get_record_descr(config: GameConfig = DEFAULT_GAME_CONFIG) -> List[Tuple]:
+    """The numpy structured dtype of the records, as written in shard headers."""
+    return [
+        ("position", "|u1", (2 * config.number_of_bins + 2,)),
+        ("player", "|u1"),
+        ("outcome", "|i1"),
+        ("margin", "<i2"),
+        ("plies_remaining", "<u2"),
+    ]
+
+
+def _get_record_struct(config: GameConfig) -> struct.Struct:
+    return struct.Struct(f"<{2 * config.number_of_bins + 2}BBbhH")
+
+
+def _get_npy_prefix(config: GameConfig, records: int) -> bytes:
+    header = repr(
+        {
+            "descr": get_record_descr(config),
+            "fortran_order": False,
+            "shape": (records,),
+        }
+    )
+    header_size = _NPY_PREFIX_SIZE - len(_NPY_MAGIC) - 2
+    return (
+        _NPY_MAGIC
+        + struct.pack("<H", header_size)
+        + header.ljust(header_size - 1).encode("latin1")
+        + b"\n"
+    )
+
+
+def label_game(loop: SimulationLoop) -> Iterator[TrainingRecord]:
+    """Every position a move was played in, labelled with how the game ended."""
+    result = loop.get_result()
+    plies = len(loop.turns)
+    for index, turn in enumerate(loop.turns):
+        position, _ = get_canonical_position(
+            board_to_position(loop.boards[index]), turn.player, loop.config
+        )
+        margin = result.player_one_goal - result.player_two_goal
+        if result.winning_player is None:
+            outcome = 0
+        else:
+            outcome = 1 if result.winning_player == turn.player else -1
+        yield (
+            position,
+            turn.player,
+            outcome,
+            margin if turn.player == Player.ONE else -margin,
+            plies - index,
+        )
+
+
+class ShardWriter:
+    """Appends records to `.npy` shards, starting a new one once a shard is full.
+
+    The shards hold one structured array each and can be memory-mapped with
+    `numpy.load(path, mmap_mode="r")` or read back with `read_shard`.
+
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+        max_shard_bytes: int = 1 << 28,
+    ):
+        if config.total_pieces > 255:
+            raise ValueError("positions are stored in bytes, so at most 255 pieces")
+        self._record_struct = _get_record_struct(config)
+        if max_shard_bytes < _NPY_PREFIX_SIZE + self._record_struct.size:
+            raise ValueError("max_shard_bytes is too small to hold a record")
+        self._directory = directory
+        self._prefix = prefix
+        self._config = config
+        self._records_per_shard = (
+            max_shard_bytes - _NPY_PREFIX_SIZE
+        ) // self._record_struct.size
+        self._shards: List[ShardInfo] = []
+        self._file: Optional[Any] = None
+        self._records = 0
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def shards(self) -> List[ShardInfo]:
+        """The name and number of records of each shard written so far."""
+        return self._shards
+
+    def _finish_shard(self) -> None:
+        if self._file is None:
+            return
+        self._file.seek(0)
+        self._file.write(_get_npy_prefix(self._config, self._records))
+        self._file.close()
+        self._file = None
+
+    def write(self, record: TrainingRecord) -> None:
+        if self._file is None or self._records == self._records_per_shard:
+            self._finish_shard()
+            name = f"{self._prefix}-{len(self._shards):04d}.npy"
+            self._file = open(
+                os.path.join(self._directory, name), "wb", buffering=_WRITE_BUFFER_BYTES
+            )
+            self._file.write(_get_npy_prefix(self._config, 0))
+            self._shards.append((name, 0))
+            self._records = 0
+        position, player, outcome, margin, plies_remaining = record
+        self._file.write(
+            self._record_struct.pack(
+                *position, player.value, outcome, margin, plies_remaining
+            )
+        )
+        self._records += 1
+        self._shards[-1] = (self._shards[-1][0], self._records)
+
+    def close(self) -> None:
+        self._finish_shard()
+
+
+def read_shard(
+    path: str, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> Iterator[TrainingRecord]:
+    """Read back the records of a shard through `mmap`."""
+    number_of_values = 2 * config.number_of_bins + 2
+    record_struct = _get_record_struct(config)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if buffer[: len(_NPY_MAGIC)] != _NPY_MAGIC:
+                raise ValueError(f"{path} is not a shard")
+            (header_size,) = struct.unpack_from("<H", buffer, len(_NPY_MAGIC))
+            data_start = len(_NPY_MAGIC) + 2 + header_size
+            header = ast.literal_eval(
+                buffer[len(_NPY_MAGIC) + 2 : data_start].decode("latin1")
+            )
+            if header["descr"] != get_record_descr(config):
+                raise ValueError(f"{path} does not hold records of this config")
+            for values in record_struct.iter_unpack(
+                buffer[
+                    data_start : data_start + header["shape"][0] * record_struct.size
+                ]
+            ):
+                yield (
+                    values[:number_of_values],
+                    Player(values[number_of_values]),
+                    *values[number_of_values + 1 :],
+                )
+
+
+def _write_games(
+    directory: str,
+    prefix: str,
+    player_one: PlayerStrategy,
+    player_two: PlayerStrategy,
+    start: int,
+    stop: int,
+    seed: int,
+    max_shard_bytes: int,
+    config: GameConfig,
+) -> List[ShardInfo]:
+    with ShardWriter(directory, prefix, config, max_shard_bytes) as writer:
+        loops = play_games(
+            player_one,
+            player_two,
+            stop - start,
+            seed=seed,
+            first_game=start,
+            config=config,
+        )
+        for loop in loops:
+            for record in label_game(loop):
+                writer.write(record)
+    return writer.shards
+
+
+def write_self_play_shards(
+    directory: str,
+    player_one: PlayerStrategy,
+    player_two: PlayerStrategy,
+    games: int,
+    seed: int = 0,
+    processes: Optional[int] = None,
+    chunk_size: int = 1000,
+    max_shard_bytes: int = 1 << 28,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> int:
+    """Play `games` games and write every position played to shards in `directory`.
+
+    Games are played in chunks of `chunk_size` across `processes` worker
+    processes, each writing shards of its own. The manifest lists every
+    shard in the order of the games. Returns the number of records.
+
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size should be positive")
+    os.makedirs(directory, exist_ok=True)
+    processes = processes or os.cpu_count() or 1
+    index_ranges = [
+        (start, min(start + chunk_size, games)) for start in range(0, games, chunk_size)
+    ]
+    arguments = [
+        (
+            directory,
+            f"games-{start:010d}",
+            player_one,
+            player_two,
+            start,
+            stop,
+            seed,
+            max_shard_bytes,
+            config,
+        )
+        for start, stop in index_ranges
+    ]
+    if processes == 1:
+        chunks = [_write_games(*a) for a in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            chunks = list(executor.map(_write_games, *zip(*arguments)))
+
+    shards = [shard for chunk in chunks for shard in chunk]
+    records = sum(shard_records for _, shard_records in shards)
+    manifest: Dict[str, Any] = {
+        "number_of_bins": config.number_of_bins,
+        "number_of_starting_pieces": config.number_of_starting_pieces,
+        "descr": get_record_descr(config),
+        "records": records,
+        "shards": [{"path": name, "records": n} for name, n in shards],
+    }
+    with open(os.path.join(directory, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return records
+
+
+def read_records(directory: str) -> Iterator[TrainingRecord]:
+    """Every record of the shards in the manifest of `directory`, in order."""
+    with open(os.path.join(directory, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    config = GameConfig(
+        manifest["number_of_bins"], manifest["number_of_starting_pieces"]
+    )
+    for shard in manifest["shards"]:
+        yield from read_shard(os.path.join(directory, shard["path"]), config)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.self_play",
+        description="Write labelled positions from simulated games to .npy shards.",
+    )
+    parser.add_argument("directory")
+    parser.add_argument("--player-one", default="random-selection")
+    parser.add_argument("--player-two", default="random-selection")
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-shard-mb", type=int, default=256)
+    parser.add_argument("--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins)
+    parser.add_argument(
+        "--pieces", type=int, default=DEFAULT_GAME_CONFIG.number_of_starting_pieces
+    )
+    args = parser.parse_args(argv)
+
+    config = GameConfig(args.bins, args.pieces)
+    strategies = get_simple_strategies(config)
+    for name in (args.player_one, args.player_two):
+        if name not in strategies:
+            parser.error(f"strategies must be one of {', '.join(sorted(strategies))}")
+    records = write_self_play_shards(
+        args.directory,
+        strategies[args.player_one],
+        strategies[args.player_two],
+        args.games,
+        seed=args.seed,
+        processes=args.processes,
+        max_shard_bytes=args.max_shard_mb << 20,
+        config=config,
+    )
+    print(f"Wrote {records} positions from {args.games} games to {args.directory}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
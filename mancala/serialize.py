@@ -1,6 +1,20 @@
+import gzip
+import json
 from functools import singledispatch
-from typing import Any, Dict, List, Union
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Union,
+    cast,
+)
 
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
 from mancala.mancala import Board, Player, PlayerRow, Turn
 
 
@@ -36,3 +50,179 @@ def to_serializable_turn(arg: Turn) -> Dict[str, Union[str, int]]:
 @to_serializable.register
 def to_serializable_board(arg: Board) -> Dict[str, Dict[str, Union[List[int], int]]]:
     return {to_serializable(p): to_serializable(p_row) for p, p_row in arg.items()}
+
+
+def _get_player(value: str) -> Player:
+    serialized_value_to_enum = {
+        "one": Player.ONE,
+        "two": Player.TWO,
+    }
+    if value not in serialized_value_to_enum:
+        raise ValueError(f"{value!r} is not a serialized player")
+    return serialized_value_to_enum[value]
+
+
+def _player_from_serializable(
+    value: Optional[str], config: GameConfig
+) -> Optional[Player]:
+    return None if value is None else _get_player(value)
+
+
+def _player_row_from_serializable(
+    value: Dict[str, Any], config: GameConfig
+) -> PlayerRow:
+    return PlayerRow(list(value["bins"]), value["goal"], config)
+
+
+def _turn_from_serializable(value: Dict[str, Any], config: GameConfig) -> Turn:
+    return Turn(_get_player(value["player"]), value["selected_bin"], config)
+
+
+def _board_from_serializable(
+    value: Dict[str, Dict[str, Any]], config: GameConfig
+) -> Board:
+    return Board(
+        {
+            _get_player(p): _player_row_from_serializable(p_row, config)
+            for p, p_row in value.items()
+        }
+    )
+
+
+_FROM_SERIALIZABLE: Dict[type, Callable[[Any, GameConfig], Any]] = {
+    Player: _player_from_serializable,
+    PlayerRow: _player_row_from_serializable,
+    Turn: _turn_from_serializable,
+    Board: _board_from_serializable,
+}
+
+
+def from_serializable(
+    cls: type, value: Any, config: GameConfig = DEFAULT_GAME_CONFIG
+) -> Any:
+    """The object of type `cls` that `to_serializable` turned into `value`."""
+    if cls not in _FROM_SERIALIZABLE:
+        raise TypeError(f"from_serializable not defined for {cls}")
+    return _FROM_SERIALIZABLE[cls](value, config)
+
+
+# `SimulationLoop.serialize` writes the header fields of a game first, so
+# everything before the turns is a small header of the game
+_HEADER_FIELDS = ("player_strategies", "starting_player", "winning_player")
+_BODY_SEPARATOR = ', "turns": '
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+class GameRecord:
+    """A view of one archived game.
+
+    The header fields are read up front, while the turns and boards are
+    only parsed, and their `Turn` and `Board` objects built, when accessed.
+
+    """
+
+    __slots__ = ("_header", "_body", "_config", "_turns", "_boards")
+
+    def __init__(
+        self,
+        header: Dict[str, Any],
+        body: str,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
+    ):
+        self._header = header
+        self._body = body
+        self._config = config
+        self._turns: Optional[List[Turn]] = None
+        self._boards: Optional[List[Board]] = None
+
+    @classmethod
+    def from_line(
+        cls, line: str, config: GameConfig = DEFAULT_GAME_CONFIG
+    ) -> "GameRecord":
+        """The game of a line of `SimulationLoop.serialize` output."""
+        header_text, separator, body = line.partition(_BODY_SEPARATOR)
+        if separator:
+            header = json.loads(header_text + "}")
+            if all(field in header for field in _HEADER_FIELDS):
+                return cls(header, "{" + separator[2:] + body, config)
+        # Written some other way, so the whole line has to be parsed
+        game = json.loads(line)
+        body_fields = {"turns": game.pop("turns"), "boards": game.pop("boards")}
+        return cls(game, json.dumps(body_fields), config)
+
+    @property
+    def player_strategies(self) -> Dict[Player, str]:
+        return {
+            _get_player(p): strategy_name
+            for p, strategy_name in self._header["player_strategies"].items()
+        }
+
+    @property
+    def starting_player(self) -> Player:
+        return from_serializable(Player, self._header["starting_player"], self._config)
+
+    @property
+    def winning_player(self) -> Optional[Player]:
+        return from_serializable(Player, self._header["winning_player"], self._config)
+
+    @property
+    def adjudicated(self) -> bool:
+        return self._header.get("adjudicated", False)
+
+    def _parse_body(self) -> None:
+        body = json.loads(self._body)
+        self._turns = [from_serializable(Turn, t, self._config) for t in body["turns"]]
+        self._boards = [
+            from_serializable(Board, b, self._config) for b in body["boards"]
+        ]
+
+    @property
+    def turns(self) -> List[Turn]:
+        if self._turns is None:
+            self._parse_body()
+        return cast(List[Turn], self._turns)
+
+    @property
+    def boards(self) -> List[Board]:
+        if self._boards is None:
+            self._parse_body()
+        return cast(List[Board], self._boards)
+
+
+def _open_archive(path: str) -> IO[str]:
+    with open(path, "rb") as f:
+        compressed = f.read(len(_GZIP_MAGIC)) == _GZIP_MAGIC
+    return gzip.open(path, "rt") if compressed else open(path)
+
+
+def read_game_records(
+    path: str,
+    strategy: Optional[str] = None,
+    starting_player: Optional[Player] = None,
+    winners: Optional[Collection[Optional[Player]]] = None,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Iterator[GameRecord]:
+    """Lazily read an archive of `SimulationLoop.serialize` output, a game a line.
+
+    Archives are plain or gzip-compressed JSONL. Only games where either
+    player used `strategy`, started by `starting_player` and won by one of
+    `winners`, with `None` for ties, are kept. Games are filtered on their
+    headers, without parsing their turns and boards.
+
+    """
+    with _open_archive(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = GameRecord.from_line(line, config)
+            if strategy is not None and (
+                strategy not in record.player_strategies.values()
+            ):
+                continue
+            if starting_player is not None and (
+                record.starting_player != starting_player
+            ):
+                continue
+            if winners is not None and record.winning_player not in winners:
+                continue
+            yield record
@@ -0,0 +1,153 @@
+import struct
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, cast
+
+from mancala.mancala import Player
+from mancala.simulation import GameResult
+
+# winner, starting player, adjudicated, padding, plies, goals for each player
+RESULT_ROW_FORMAT = "<bbbxHHH"
+RESULT_ROW_SIZE = struct.calcsize(RESULT_ROW_FORMAT)
+
+_NOT_WRITTEN = -2
+_TIE = -1
+
+
+def _player_to_code(player: Optional[Player]) -> int:
+    return _TIE if player is None else player.value
+
+
+def _code_to_player(code: int) -> Optional[Player]:
+    return None if code == _TIE else Player(code)
+
+
+def _get_row_values(result: GameResult) -> Tuple[int, ...]:
+    return (
+        _player_to_code(result.winning_player),
+        result.starting_player.value,
+        result.adjudicated,
+        result.plies,
+        result.player_one_goal,
+        result.player_two_goal,
+    )
+
+
+def _get_result(row_values: Tuple[int, ...]) -> GameResult:
+    (
+        winner,
+        starting_player,
+        adjudicated,
+        plies,
+        player_one_goal,
+        player_two_goal,
+    ) = row_values
+    return GameResult(
+        winning_player=_code_to_player(winner),
+        starting_player=Player(starting_player),
+        plies=plies,
+        player_one_goal=player_one_goal,
+        player_two_goal=player_two_goal,
+        adjudicated=bool(adjudicated),
+    )
+
+
+def pack_results(results: Iterable[GameResult]) -> bytes:
+    """Results as consecutive table rows, to be sent to another process or host."""
+    return b"".join(
+        struct.pack(RESULT_ROW_FORMAT, *_get_row_values(result)) for result in results
+    )
+
+
+def unpack_results(block: bytes) -> List[GameResult]:
+    if len(block) % RESULT_ROW_SIZE != 0:
+        raise ValueError(f"blocks are made of rows of {RESULT_ROW_SIZE} bytes")
+    return [_get_result(row) for row in struct.iter_unpack(RESULT_ROW_FORMAT, block)]
+
+
+class SharedResultTable:
+    """Fixed-width per-game result rows kept in shared memory.
+
+    The parent process pre-allocates the table for every game of a run and
+    workers attach to it by `name`, writing rows for the index ranges they
+    were handed. Nothing but the index ranges travels between processes.
+
+    """
+
+    def __init__(self, games: int, name: Optional[str] = None):
+        if games <= 0:
+            raise ValueError("games should be positive")
+        self._games = games
+        self._owner = name is None
+        if self._owner:
+            self._shared_memory = shared_memory.SharedMemory(
+                create=True, size=games * RESULT_ROW_SIZE
+            )
+        else:
+            self._shared_memory = shared_memory.SharedMemory(name=name)
+        self._buffer = cast(memoryview, self._shared_memory.buf)
+        if self._owner:
+            empty_row = struct.pack(RESULT_ROW_FORMAT, _NOT_WRITTEN, 0, 0, 0, 0, 0)
+            self._buffer[: games * RESULT_ROW_SIZE] = empty_row * games
+
+    def __enter__(self) -> "SharedResultTable":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._games
+
+    @property
+    def name(self) -> str:
+        return self._shared_memory.name
+
+    @classmethod
+    def attach(cls, name: str, games: int) -> "SharedResultTable":
+        return cls(games, name=name)
+
+    def close(self) -> None:
+        """Detach from the table, releasing it if this process created it."""
+        self._shared_memory.close()
+        if self._owner:
+            self._shared_memory.unlink()
+
+    def _ensure_index_is_correct(self, index: int) -> None:
+        if index < 0 or index >= self._games:
+            raise IndexError(f"index must be between 0 and {self._games - 1}")
+
+    def write(self, index: int, result: GameResult) -> None:
+        self._ensure_index_is_correct(index)
+        struct.pack_into(
+            RESULT_ROW_FORMAT,
+            self._buffer,
+            index * RESULT_ROW_SIZE,
+            *_get_row_values(result),
+        )
+
+    def _read_winner_code(self, index: int) -> int:
+        self._ensure_index_is_correct(index)
+        return struct.unpack_from("<b", self._buffer, index * RESULT_ROW_SIZE)[0]
+
+    def is_written(self, index: int) -> bool:
+        return self._read_winner_code(index) != _NOT_WRITTEN
+
+    def read(self, index: int) -> GameResult:
+        if not self.is_written(index):
+            raise ValueError(f"no result has been written for game {index}")
+        return _get_result(
+            struct.unpack_from(RESULT_ROW_FORMAT, self._buffer, index * RESULT_ROW_SIZE)
+        )
+
+    def __iter__(self) -> Iterator[GameResult]:
+        return (self.read(index) for index in range(self._games))
+
+    def count_winners(self) -> Dict[Optional[Player], int]:
+        """Count the winning players straight from the winner column."""
+        counts: Dict[Optional[Player], int] = {Player.ONE: 0, Player.TWO: 0, None: 0}
+        for index in range(self._games):
+            code = self._read_winner_code(index)
+            if code == _NOT_WRITTEN:
+                raise ValueError(f"no result has been written for game {index}")
+            counts[_code_to_player(code)] += 1
+        return counts
@@ -1,18 +1,31 @@
 import json
-import random
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+from mancala.adjudicate import DECIDED_SEARCH_PIECE_LIMIT, get_decided_outcome
+from mancala.analysis import MoveAnalysis
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
 from mancala.mancala import (
     Board,
     Player,
     PlayerRow,
     Turn,
     get_new_board,
-    take_turn,
-    who_gets_next_turn,
 )
+from mancala.rng import get_rng
 from mancala.serialize import to_serializable
 from mancala.strategy import PlayerStrategy
+from mancala.tables import get_game_tables
+
+
+@dataclass(frozen=True)
+class GameResult:
+    winning_player: Optional[Player]
+    starting_player: Player
+    plies: int
+    player_one_goal: int
+    player_two_goal: int
+    adjudicated: bool = False
 
 
 class SimulationLoop:
@@ -21,22 +34,30 @@ class SimulationLoop:
         player_one: PlayerStrategy,
         player_two: PlayerStrategy,
         starting_player: Optional[Player] = None,
+        adjudicate_when_decided: bool = False,
+        config: GameConfig = DEFAULT_GAME_CONFIG,
     ):
+        if player_one.config != config or player_two.config != config:
+            raise ValueError("player strategies must use the same config as the loop")
         self._strategies = {
             Player.ONE: player_one,
             Player.TWO: player_two,
         }
+        self._config = config
+        self._winning_threshold = get_game_tables(config).winning_threshold
         if starting_player:
             self._starting_player = starting_player
         else:
-            self._starting_player = random.choice([Player.ONE, Player.TWO])
+            self._starting_player = get_rng().choice([Player.ONE, Player.TWO])
+        self._adjudicate_when_decided = adjudicate_when_decided
         self._reset_simulation()
 
     def _reset_simulation(self) -> None:
         self._has_run = False
         self._winning_player: Optional[Player] = None
+        self._adjudicated = False
         self._turns: List[Turn] = []
-        self._boards: List[Board] = [get_new_board()]
+        self._boards: List[Board] = [get_new_board(self._config)]
 
     @property
     def player_one_strategy(self) -> PlayerStrategy:
@@ -50,6 +71,10 @@ class SimulationLoop:
     def player_strategies(self) -> Dict[Player, PlayerStrategy]:
         return self._strategies
 
+    @property
+    def config(self) -> GameConfig:
+        return self._config
+
     @property
     def starting_player(self) -> Player:
         return self._starting_player
@@ -62,6 +87,15 @@ class SimulationLoop:
     def boards(self) -> List[Board]:
         return self._boards
 
+    @property
+    def adjudicate_when_decided(self) -> bool:
+        return self._adjudicate_when_decided
+
+    @property
+    def adjudicated(self) -> bool:
+        """Whether the game was stopped early because its outcome was decided."""
+        return self._adjudicated
+
     @property
     def has_run(self) -> bool:
         return self._has_run
@@ -70,16 +104,32 @@ class SimulationLoop:
     def winning_player(self) -> Optional[Player]:
         return self._winning_player
 
+    def get_result(self) -> GameResult:
+        if not self.has_run:
+            raise ValueError("the simulation needs to be run to get its result")
+        latest_board = self.boards[-1]
+        return GameResult(
+            winning_player=self._winning_player,
+            starting_player=self._starting_player,
+            plies=len(self.turns),
+            player_one_goal=latest_board[Player.ONE].goal,
+            player_two_goal=latest_board[Player.TWO].goal,
+            adjudicated=self._adjudicated,
+        )
+
     def _is_end_of_game(self) -> bool:
-        """In reality, the first player to get >24 pieces is the winner."""
+        """In reality, the first player to get over half of the pieces is the winner."""
         latest_board = self.boards[-1]
-        return latest_board[Player.ONE].goal > 24 or latest_board[Player.TWO].goal > 24
+        return (
+            latest_board[Player.ONE].goal > self._winning_threshold
+            or latest_board[Player.TWO].goal > self._winning_threshold
+        )
 
     def _set_winner(self) -> None:
         latest_board = self.boards[-1]
-        if latest_board[Player.ONE].goal > 24:
+        if latest_board[Player.ONE].goal > self._winning_threshold:
             self._winning_player = Player.ONE
-        elif latest_board[Player.TWO].goal > 24:
+        elif latest_board[Player.TWO].goal > self._winning_threshold:
             self._winning_player = Player.TWO
 
     def run(self, reset_simulation=False) -> None:  # pragma: nocover
@@ -90,19 +140,28 @@ class SimulationLoop:
 
         current_player = self._starting_player
         current_turn = 0
+        # Decided outcomes are only searched for once the goals hold all but a
+        # few of the pieces, which games that are not adjudicated never reach
+        adjudication_goal_pieces = self._config.total_pieces + 1
+        if self._adjudicate_when_decided:
+            adjudication_goal_pieces -= DECIDED_SEARCH_PIECE_LIMIT + 1
         while True:
             # Set up objects for current player on this turn
             current_board = self._boards[current_turn]
             current_player_row = current_board[current_player]
             current_player_strategy = self._strategies[current_player]
-            current_opponent_row = current_board[
+            current_opponent = (
                 Player.ONE if current_player == Player.TWO else Player.TWO
-            ]
+            )
+            current_opponent_row = current_board[current_opponent]
+            analysis = MoveAnalysis(
+                current_player_row, current_opponent_row, self._config
+            )
 
             # Allow current player to select a bin from their row, and ensure it is valid
             try:
-                selected_bin = current_player_strategy.choose_bin(
-                    current_player_row, current_opponent_row
+                selected_bin = current_player_strategy.choose_bin_from_analysis(
+                    analysis
                 )
             except ValueError:
                 # Assuming ValueError is thrown if player can't move, i.e. all bins are empty
@@ -116,13 +175,18 @@ class SimulationLoop:
                     resulting_player_two_goal = (
                         sum(player_two_row.bins) + player_two_row.goal
                     )
+                    empty_bins = [0 for _ in range(self._config.number_of_bins)]
                     new_board = Board(
                         {
                             Player.ONE: PlayerRow(
-                                bins=[0, 0, 0, 0, 0, 0], goal=resulting_player_one_goal
+                                bins=list(empty_bins),
+                                goal=resulting_player_one_goal,
+                                config=self._config,
                             ),
                             Player.TWO: PlayerRow(
-                                bins=[0, 0, 0, 0, 0, 0], goal=resulting_player_two_goal
+                                bins=list(empty_bins),
+                                goal=resulting_player_two_goal,
+                                config=self._config,
                             ),
                         }
                     )
@@ -142,9 +206,15 @@ class SimulationLoop:
                     "Player strategies need to ensure they pick non-empty bins in 'choose_bin'"
                 )
 
-            # Perform turn with selected bin and save simulation data
-            turn = Turn(current_player, selected_bin)
-            new_board = take_turn(current_board, turn)
+            # Perform turn with selected bin, reusing the strategy's analysis of
+            # the move, and save simulation data
+            turn = Turn(current_player, selected_bin, self._config)
+            new_player_row, new_opponent_row = analysis.resulting_rows(selected_bin)
+            new_rows = {
+                current_player: new_player_row,
+                current_opponent: new_opponent_row,
+            }
+            new_board = Board({player: new_rows[player] for player in current_board})
             self._turns.append(turn)
             self._boards.append(new_board)
 
@@ -153,9 +223,21 @@ class SimulationLoop:
                 self._set_winner()
                 self._has_run = True
                 break
-            current_player = who_gets_next_turn(current_board, turn, new_board)
+            if not analysis.extra_turn(selected_bin):
+                current_player = current_opponent
             current_turn += 1
 
+            # Optionally stop as soon as no continuation can change the winner
+            if new_player_row.goal + new_opponent_row.goal >= adjudication_goal_pieces:
+                is_decided, winning_player = get_decided_outcome(
+                    new_board, current_player, config=self._config
+                )
+                if is_decided:
+                    self._winning_player = winning_player
+                    self._adjudicated = True
+                    self._has_run = True
+                    break
+
     def serialize(self) -> str:
         p1 = Player.ONE
         p2 = Player.TWO
@@ -167,6 +249,7 @@ class SimulationLoop:
                 },
                 "starting_player": to_serializable(self._starting_player),
                 "winning_player": to_serializable(self._winning_player),
+                "adjudicated": self._adjudicated,
                 "turns": [to_serializable(turn) for turn in self.turns],
                 "boards": [to_serializable(board) for board in self.boards],
             }
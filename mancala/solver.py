@@ -0,0 +1,369 @@
+import argparse
+import json
+import mmap
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Board, Player, play_move
+from mancala.position import (
+    count_compositions,
+    rank_composition,
+    unrank_composition,
+)
+
+PROGRESS_FILE_NAME = "progress.json"
+
+# Values are stored as signed bytes, which fits any margin of the default game
+_UNSOLVED = -128
+_MAXIMUM_TOTAL_PIECES = 127
+_RANK_TYPECODE = "Q"
+_WRITE_CHUNK_SIZE = 1 << 20
+
+LayerValues = Dict[int, memoryview]
+
+
+def _get_layer_path(directory: str, pieces_in_bins: int) -> str:
+    return os.path.join(directory, f"layer-{pieces_in_bins:03d}.values")
+
+
+def _get_opponent(player: Player) -> Player:
+    return Player.ONE if player == Player.TWO else Player.TWO
+
+
+def _open_layer(path: str, writable: bool) -> Tuple[mmap.mmap, memoryview]:
+    with open(path, "r+b" if writable else "rb") as f:
+        layer_map = mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        )
+    return layer_map, memoryview(layer_map).cast("b")
+
+
+def _get_compositions(total: int, parts: int) -> Iterator[Tuple[int, ...]]:
+    """Every way to spread `total` pieces over `parts` slots, in rank order."""
+    if parts == 1:
+        yield (total,)
+        return
+    for pieces in range(total + 1):
+        for rest in _get_compositions(total - pieces, parts - 1):
+            yield (pieces, *rest)
+
+
+def _get_potential(bins: Sequence[int], number_of_bins: int) -> int:
+    """Weighted distance of the pieces from the goals.
+
+    Every move that keeps its pieces out of the goals only moves them closer
+    to the mover's goal, so it strictly lowers the potential of the bins.
+
+    """
+    return sum(
+        (index % number_of_bins + 1) * pieces for index, pieces in enumerate(bins)
+    )
+
+
+def _solve_position(
+    bins: Sequence[int], layers: LayerValues, config: GameConfig
+) -> int:
+    """Best margin the mover can still gain over the opponent, playing it out."""
+    number_of_bins = config.number_of_bins
+    pieces_in_bins = sum(bins)
+    if not any(bins[:number_of_bins]):
+        # The game ends and the opponent keeps the pieces left on their side
+        return -pieces_in_bins
+
+    best = None
+    for selected_bin in range(number_of_bins):
+        if bins[selected_bin] == 0:
+            continue
+        player_bins = list(bins[:number_of_bins])
+        opponent_bins = list(bins[number_of_bins:])
+        goal_pieces, extra_turn, _ = play_move(
+            player_bins, opponent_bins, selected_bin, config
+        )
+        child_pieces = pieces_in_bins - goal_pieces
+        if extra_turn:
+            child_bins = player_bins + opponent_bins
+            sign = 1
+        else:
+            child_bins = opponent_bins + player_bins
+            sign = -1
+        child_value = layers[child_pieces][
+            rank_composition(child_bins, child_pieces, config)
+        ]
+        margin = goal_pieces + sign * child_value
+        if best is None or margin > best:
+            best = margin
+    assert best is not None
+    return best
+
+
+def _solve_ranks(
+    directory: str, pieces_in_bins: int, ranks: array, config: GameConfig
+) -> int:
+    """Solve the positions of one layer with the given ranks, in place."""
+    parts = 2 * config.number_of_bins
+    maps: List[mmap.mmap] = []
+    layers: LayerValues = {}
+    try:
+        for pieces in range(pieces_in_bins + 1):
+            layer_map, layers[pieces] = _open_layer(
+                _get_layer_path(directory, pieces), writable=pieces == pieces_in_bins
+            )
+            maps.append(layer_map)
+        layer = layers[pieces_in_bins]
+        for rank in ranks:
+            bins = unrank_composition(rank, pieces_in_bins, parts, config)
+            layer[rank] = _solve_position(bins, layers, config)
+        maps[-1].flush()
+    finally:
+        for values in layers.values():
+            values.release()
+        for layer_map in maps:
+            layer_map.close()
+    return len(ranks)
+
+
+def _read_progress(directory: str, config: GameConfig) -> Dict[str, int]:
+    path = os.path.join(directory, PROGRESS_FILE_NAME)
+    if not os.path.exists(path):
+        return {
+            "number_of_bins": config.number_of_bins,
+            "number_of_starting_pieces": config.number_of_starting_pieces,
+            "solved_pieces": -1,
+            "solved_potential": -1,
+        }
+    with open(path) as f:
+        progress = json.load(f)
+    if (
+        progress["number_of_bins"] != config.number_of_bins
+        or progress["number_of_starting_pieces"] != config.number_of_starting_pieces
+    ):
+        raise ValueError(f"{directory} holds values for a different config")
+    return progress
+
+
+def _write_progress(directory: str, progress: Dict[str, int]) -> None:
+    path = os.path.join(directory, PROGRESS_FILE_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(progress, f)
+    os.replace(path + ".tmp", path)
+
+
+def _get_ranks_by_potential(pieces_in_bins: int, config: GameConfig) -> List[array]:
+    number_of_bins = config.number_of_bins
+    ranks_by_potential = [
+        array(_RANK_TYPECODE) for _ in range(number_of_bins * pieces_in_bins + 1)
+    ]
+    compositions = _get_compositions(pieces_in_bins, 2 * number_of_bins)
+    for rank, bins in enumerate(compositions):
+        ranks_by_potential[_get_potential(bins, number_of_bins)].append(rank)
+    return ranks_by_potential
+
+
+def solve(
+    directory: str,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+    max_pieces_in_bins: Optional[int] = None,
+    processes: int = 1,
+) -> Iterator[int]:
+    """Retrograde solve of every arrangement of pieces in the bins.
+
+    Positions are solved in layers by the pieces left in the bins, since no
+    move ever returns pieces from a goal, and within a layer in increasing
+    potential (see `_get_potential`), so every position only depends on
+    solved ones. Positions of equal potential are independent and are split
+    across `processes` worker processes, which write their values straight
+    into the layer's memory-mapped file. Progress is recorded after each
+    potential, so an interrupted solve picks up where it stopped. Yields each
+    layer as it is completed.
+
+    The default game has 2.2e12 arrangements of up to 48 pieces, a byte each,
+    so a full solve needs that much disk; `max_pieces_in_bins` bounds it to
+    the endgames with that few pieces left in the bins.
+
+    """
+    if config.total_pieces > _MAXIMUM_TOTAL_PIECES:
+        raise ValueError(
+            f"values are stored in a byte, so at most {_MAXIMUM_TOTAL_PIECES} pieces"
+        )
+    if max_pieces_in_bins is None:
+        max_pieces_in_bins = config.total_pieces
+    if max_pieces_in_bins < 0 or max_pieces_in_bins > config.total_pieces:
+        raise ValueError(
+            f"max_pieces_in_bins must be between 0 and {config.total_pieces}"
+        )
+    os.makedirs(directory, exist_ok=True)
+    progress = _read_progress(directory, config)
+    parts = 2 * config.number_of_bins
+    executor = ProcessPoolExecutor(max_workers=processes) if processes > 1 else None
+    try:
+        for pieces_in_bins in range(
+            progress["solved_pieces"] + 1, max_pieces_in_bins + 1
+        ):
+            layer_path = _get_layer_path(directory, pieces_in_bins)
+            if progress["solved_potential"] < 0:
+                layer_size = count_compositions(pieces_in_bins, parts, config)
+                with open(layer_path, "wb") as f:
+                    for start in range(0, layer_size, _WRITE_CHUNK_SIZE):
+                        chunk_size = min(_WRITE_CHUNK_SIZE, layer_size - start)
+                        f.write(bytes([_UNSOLVED & 0xFF]) * chunk_size)
+
+            ranks_by_potential = _get_ranks_by_potential(pieces_in_bins, config)
+            for potential in range(
+                progress["solved_potential"] + 1, len(ranks_by_potential)
+            ):
+                ranks = ranks_by_potential[potential]
+                slice_size = max(-(-len(ranks) // processes), 1)
+                slices = [
+                    ranks[start : start + slice_size]
+                    for start in range(0, len(ranks), slice_size)
+                ]
+                if executor is None:
+                    for ranks_slice in slices:
+                        _solve_ranks(directory, pieces_in_bins, ranks_slice, config)
+                else:
+                    list(
+                        executor.map(
+                            _solve_ranks,
+                            [directory] * len(slices),
+                            [pieces_in_bins] * len(slices),
+                            slices,
+                            [config] * len(slices),
+                        )
+                    )
+                progress["solved_potential"] = potential
+                _write_progress(directory, progress)
+
+            progress["solved_pieces"] = pieces_in_bins
+            progress["solved_potential"] = -1
+            _write_progress(directory, progress)
+            yield pieces_in_bins
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+class ValueTable:
+    """Read-only lookups into the values written by `solve`.
+
+    Values are the margin a player finishes ahead of the opponent by, with
+    both playing perfectly until a player to move has no pieces left. Ending
+    the game early once a goal holds over half of the pieces never changes
+    who wins, so the sign of a value is the game-theoretic result under the
+    simulation's rules as well.
+
+    """
+
+    def __init__(self, directory: str, config: GameConfig = DEFAULT_GAME_CONFIG):
+        progress = _read_progress(directory, config)
+        self._config = config
+        self._solved_pieces = progress["solved_pieces"]
+        self._maps: List[mmap.mmap] = []
+        self._layers: LayerValues = {}
+        for pieces in range(self._solved_pieces + 1):
+            layer_map, self._layers[pieces] = _open_layer(
+                _get_layer_path(directory, pieces), writable=False
+            )
+            self._maps.append(layer_map)
+
+    def __enter__(self) -> "ValueTable":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for values in self._layers.values():
+            values.release()
+        for layer_map in self._maps:
+            layer_map.close()
+        self._layers = {}
+        self._maps = []
+
+    @property
+    def solved_pieces(self) -> int:
+        """Positions with up to this many pieces left in the bins have values."""
+        return self._solved_pieces
+
+    def remaining_margin(
+        self, player_bins: Sequence[int], opponent_bins: Sequence[int]
+    ) -> int:
+        """Margin the player to move still gains over the opponent."""
+        bins = [*player_bins, *opponent_bins]
+        pieces_in_bins = sum(bins)
+        if pieces_in_bins > self._solved_pieces:
+            raise ValueError(
+                f"only positions with up to {self._solved_pieces} pieces "
+                "in the bins are solved"
+            )
+        return self._layers[pieces_in_bins][
+            rank_composition(bins, pieces_in_bins, self._config)
+        ]
+
+    def value(self, board: Board, player: Player) -> int:
+        """Final margin of `player` over the opponent, with `player` to move."""
+        opponent = _get_opponent(player)
+        return (
+            board[player].goal
+            - board[opponent].goal
+            + self.remaining_margin(board[player].bins, board[opponent].bins)
+        )
+
+    def get_move_values(self, board: Board, player: Player) -> Dict[int, int]:
+        """Final margin of `player` after each of their moves, played perfectly on."""
+        opponent = _get_opponent(player)
+        move_values = {}
+        for selected_bin, pieces in enumerate(board[player].bins):
+            if pieces == 0:
+                continue
+            player_bins = list(board[player].bins)
+            opponent_bins = list(board[opponent].bins)
+            goal_pieces, extra_turn, _ = play_move(
+                player_bins, opponent_bins, selected_bin, self._config
+            )
+            if extra_turn:
+                remaining = self.remaining_margin(player_bins, opponent_bins)
+            else:
+                remaining = -self.remaining_margin(opponent_bins, player_bins)
+            move_values[selected_bin] = (
+                board[player].goal + goal_pieces - board[opponent].goal + remaining
+            )
+        return move_values
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.solver",
+        description="Solve every position by the pieces left in the bins.",
+    )
+    parser.add_argument("directory")
+    parser.add_argument("--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins)
+    parser.add_argument(
+        "--pieces", type=int, default=DEFAULT_GAME_CONFIG.number_of_starting_pieces
+    )
+    parser.add_argument("--max-pieces-in-bins", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    config = GameConfig(args.bins, args.pieces)
+    for pieces_in_bins in solve(
+        args.directory, config, args.max_pieces_in_bins, args.processes
+    ):
+        positions = count_compositions(
+            pieces_in_bins, 2 * config.number_of_bins, config
+        )
+        print(f"solved {positions:>14} positions with {pieces_in_bins} pieces in bins")
+
+    with ValueTable(args.directory, config) as values:
+        if values.solved_pieces == config.total_pieces:
+            starting_bins = [config.number_of_starting_pieces] * config.number_of_bins
+            margin = values.remaining_margin(starting_bins, starting_bins)
+            print(f"the player to move first finishes {margin:+d} with perfect play")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
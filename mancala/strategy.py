@@ -1,28 +1,95 @@
-import random
+import json
 from abc import ABCMeta, abstractmethod
-from typing import Optional
+from operator import mul
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from mancala.mancala import PlayerRow
+from mancala.analysis import MoveAnalysis
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Board, Player, PlayerRow
+from mancala.position import (
+    Position,
+    get_canonical_position,
+    get_final_margin,
+    get_row_offset,
+    get_successors_batch,
+)
+from mancala.rng import get_rng
+from mancala.search import AlphaBetaSearch
+from mancala.solver import ValueTable
 
 
 class PlayerStrategy(metaclass=ABCMeta):
+    def __init__(self, config: GameConfig = DEFAULT_GAME_CONFIG):
+        self._config = config
+
+    @property
+    def config(self) -> GameConfig:
+        """The game the strategy plays, which must match its SimulationLoop."""
+        return self._config
+
     @property
     @abstractmethod
     def strategy_name(self) -> str:
         """Provide a unique name for the strategy."""
 
+    @property
+    def thread_safe(self) -> bool:
+        """Whether several threads may play games with the strategy at once.
+
+        Strategies keeping anything between moves, such as search tables or
+        counters, are not unless they say otherwise.
+
+        """
+        return False
+
     @abstractmethod
     def choose_bin(
         self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
     ) -> int:
         """Provides the player's bin selection for the Turn."""
 
+    def choose_bin_from_analysis(self, analysis: MoveAnalysis) -> int:
+        """Provides the bin selection given the engine's analysis of the position.
+
+        Strategies looking at what the moves do override this to reuse the
+        analysis the engine applies the chosen move from.
+
+        """
+        return self.choose_bin(analysis.player_row, analysis.opponent_row)
+
+    def choose_bins(self, parents: Sequence[Tuple[Position, Player]]) -> List[int]:
+        """The bin chosen by each player to move in `parents`.
+
+        Batch runners playing many games in step ask for all their moves at
+        once. Strategies able to value many positions together override this
+        rather than choosing for one game at a time.
+
+        """
+        number_of_bins = self._config.number_of_bins
+        chosen_bins = []
+        for position, player in parents:
+            canonical, _ = get_canonical_position(position, player, self._config)
+            player_row = PlayerRow.trusted(
+                list(canonical[:number_of_bins]),
+                canonical[number_of_bins],
+                self._config,
+            )
+            opponent_row = PlayerRow.trusted(
+                list(canonical[number_of_bins + 1 : -1]), canonical[-1], self._config
+            )
+            chosen_bins.append(self.choose_bin(player_row, opponent_row))
+        return chosen_bins
+
 
 class ExampleRandomPlayerStrategy(PlayerStrategy):
     @property
     def strategy_name(self) -> str:
         return "random-selection"
 
+    @property
+    def thread_safe(self) -> bool:
+        return True
+
     def choose_bin(
         self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
     ) -> int:
@@ -30,7 +97,7 @@ class ExampleRandomPlayerStrategy(PlayerStrategy):
             (i, b_i) for i, b_i in enumerate(player_row.bins) if b_i > 0
         ]
         if len(nonempty_bins_with_index) > 0:
-            return random.choice(nonempty_bins_with_index)[0]
+            return get_rng().choice(nonempty_bins_with_index)[0]
         else:
             raise ValueError("player_row does not contain any non-empty bins")
 
@@ -40,6 +107,10 @@ class AlwaysMinimumPlayerStrategy(PlayerStrategy):
     def strategy_name(self) -> str:
         return "always-minimum"
 
+    @property
+    def thread_safe(self) -> bool:
+        return True
+
     def choose_bin(
         self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
     ) -> int:
@@ -58,6 +129,10 @@ class AlwaysMaximumPlayerStrategy(PlayerStrategy):
     def strategy_name(self) -> str:
         return "always-maximum"
 
+    @property
+    def thread_safe(self) -> bool:
+        return True
+
     def choose_bin(
         self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
     ) -> int:
@@ -93,22 +168,40 @@ class EvenGoalOrPiecesOnOtherSideStrategy(PlayerStrategy):
     def strategy_name(self) -> str:
         return "even-goal-or-more-pieces-to-opponent"
 
+    @property
+    def thread_safe(self) -> bool:
+        return True
+
     def choose_bin(
         self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
     ) -> int:
-        if all(b_i == 0 for b_i in player_row.bins):
+        return self.choose_bin_from_analysis(
+            MoveAnalysis(player_row, opponent_row, self.config)
+        )
+
+    def choose_bin_from_analysis(self, analysis: MoveAnalysis) -> int:
+        if len(analysis.legal_bins) == 0:
             raise ValueError("player_row does not contain any non-empty-bins")
 
-        goal_making_bins = [
-            i for i, b_i in enumerate(player_row.bins) if b_i > 0 and b_i == i + 1
-        ]
+        goal_making_bins = [i for i in analysis.legal_bins if analysis.extra_turn(i)]
         if len(goal_making_bins) > 0:
             return goal_making_bins[0]
 
-        number_of_pieces_in_opponents_row = [
-            (i, b_i - i - 1) for i, b_i in enumerate(player_row.bins) if b_i > 0
-        ]
-        return max(number_of_pieces_in_opponents_row, key=lambda item: item[1])[0]
+        return _get_shedding_bin(analysis)
+
+
+def _get_shedding_bin(analysis: MoveAnalysis) -> int:
+    """First bin sowing the most pieces into the opponent's row.
+
+    Where no bin reaches the opponent's row, the bin that gets closest to
+    it is chosen instead.
+
+    """
+    pieces = analysis.player_row.bins
+    return max(
+        analysis.legal_bins,
+        key=lambda i: (analysis.seeds_to_opponent(i), pieces[i] - i - 1),
+    )
 
 
 class EvenGoalStealAndPiecesOnOtherSideStrategy(PlayerStrategy):
@@ -119,7 +212,8 @@ class EvenGoalStealAndPiecesOnOtherSideStrategy(PlayerStrategy):
     the opponent's row, this strategy will check if there are any moves that
     would result in steal pieces from the opponent. Additionally, if there
     are several such moves, then the move that maximizes the pieces stolen
-    will be selected. Finally, if neither of the previous move types are an
+    will be selected, counting only moves whose last piece lands in the
+    player's row without going around the board. Finally, if neither of the previous move types are an
     option, then a bin will be selected which maximizes the number of pieces
     moved toward/to the opponent's row.
 
@@ -129,42 +223,347 @@ class EvenGoalStealAndPiecesOnOtherSideStrategy(PlayerStrategy):
     def strategy_name(self) -> str:
         return "even-goal-then-stealing-finally-shedding"
 
+    @property
+    def thread_safe(self) -> bool:
+        return True
+
     def choose_bin(
         self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
     ) -> int:
-        if all(b_i == 0 for b_i in player_row.bins):
+        return self.choose_bin_from_analysis(
+            MoveAnalysis(player_row, opponent_row, self.config)
+        )
+
+    def choose_bin_from_analysis(self, analysis: MoveAnalysis) -> int:
+        if len(analysis.legal_bins) == 0:
             raise ValueError("player_row does not contain any non-empty-bins")
-        elif not isinstance(opponent_row, PlayerRow):
+        elif not isinstance(analysis.opponent_row, PlayerRow):
             raise ValueError("strategy requires opponent_row be provided")
 
         # goal making
-        goal_making_bins = [
-            i for i, b_i in enumerate(player_row.bins) if b_i > 0 and b_i == i + 1
-        ]
+        goal_making_bins = [i for i in analysis.legal_bins if analysis.extra_turn(i)]
         if len(goal_making_bins) > 0:
             return goal_making_bins[0]
 
-        # stealing
-        potential_stealing_bins = [
-            i
-            for i, (p_b_i, o_b_i) in enumerate(zip(player_row.bins, opponent_row.bins))
-            if p_b_i == 0 and o_b_i > 0
-        ]
-        move_result_bins = [
-            (i, i - b_i)  # if > 0, then this gives resulting bin within player's row
-            for i, b_i in enumerate(player_row.bins)
-            if b_i > 0
-        ]
+        # stealing, only counting moves landing within the player's own row
+        pieces = analysis.player_row.bins
         stealing_bin_moves = [
-            (i, opponent_row.bins[ending_i])
-            for i, ending_i in move_result_bins
-            if ending_i in potential_stealing_bins
+            (i, analysis.captured_pieces(i))
+            for i in analysis.legal_bins
+            if pieces[i] <= i and analysis.captured_pieces(i) > 0
         ]
         if len(stealing_bin_moves) > 0:
             return max(stealing_bin_moves, key=lambda item: item[1])[0]
 
         # shedding
-        number_of_pieces_in_opponents_row = [
-            (i, b_i - i - 1) for i, b_i in enumerate(player_row.bins) if b_i > 0
+        return _get_shedding_bin(analysis)
+
+
+# What each weight of a `WeightedFeatureStrategy` multiplies, for every move
+MOVE_FEATURES = (
+    "extra-turn",
+    "captured-pieces",
+    "goal-pieces",
+    "seeds-to-opponent",
+    "pieces-moved",
+    "distance-to-goal",
+)
+
+
+def get_move_features(analysis: MoveAnalysis, selected_bin: int) -> Tuple[int, ...]:
+    """The values of `MOVE_FEATURES` for playing `selected_bin`."""
+    player_row, _ = analysis.resulting_rows(selected_bin)
+    return (
+        int(analysis.extra_turn(selected_bin)),
+        analysis.captured_pieces(selected_bin),
+        player_row.goal - analysis.player_row.goal,
+        analysis.seeds_to_opponent(selected_bin),
+        analysis.player_row.bins[selected_bin],
+        selected_bin + 1,
+    )
+
+
+class WeightedFeatureStrategy(PlayerStrategy):
+    """Strategy scoring every move by a weighted sum of its features.
+
+    The heuristics above rank goal making, stealing and shedding in a fixed
+    order; here the weights of `MOVE_FEATURES` set the priorities instead,
+    so they can be tuned with `mancala.tuning`. The first bin with the
+    highest score is chosen.
+
+    """
+
+    def __init__(
+        self, weights: Sequence[float], config: GameConfig = DEFAULT_GAME_CONFIG
+    ):
+        if len(weights) != len(MOVE_FEATURES):
+            raise ValueError(f"weights must be of length {len(MOVE_FEATURES)}")
+        super().__init__(config)
+        self._weights = tuple(weights)
+
+    @property
+    def weights(self) -> Tuple[float, ...]:
+        return self._weights
+
+    @property
+    def strategy_name(self) -> str:
+        return "weighted-features-" + ",".join(f"{w:.3g}" for w in self._weights)
+
+    @property
+    def thread_safe(self) -> bool:
+        return True
+
+    def choose_bin(
+        self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
+    ) -> int:
+        return self.choose_bin_from_analysis(
+            MoveAnalysis(player_row, opponent_row, self.config)
+        )
+
+    def choose_bin_from_analysis(self, analysis: MoveAnalysis) -> int:
+        if len(analysis.legal_bins) == 0:
+            raise ValueError("player_row does not contain any non-empty-bins")
+        elif not isinstance(analysis.opponent_row, PlayerRow):
+            raise ValueError("strategy requires opponent_row be provided")
+
+        return max(
+            analysis.legal_bins,
+            key=lambda i: sum(
+                w * f for w, f in zip(self._weights, get_move_features(analysis, i))
+            ),
+        )
+
+
+# What each weight of a `LinearValueStrategy` multiplies, for every position
+VALUE_FEATURES = (
+    "goal-difference",
+    "player-pieces",
+    "opponent-pieces",
+    "player-to-move",
+    "player-extra-turns",
+    "opponent-extra-turns",
+    "player-captures",
+    "opponent-captures",
+)
+
+# Moves finishing the game are ranked by their final margin above all others
+_DECIDED_SCORE = 1e9
+
+
+def _get_row_features(bins: Position, opponent_bins: Position) -> Tuple[int, int]:
+    """The moves of a row landing in its goal and the most one move captures."""
+    extra_turns = 0
+    captures = 0
+    for selected_bin, pieces in enumerate(bins):
+        if pieces == selected_bin + 1:
+            extra_turns += 1
+        # Only moves landing in their own row without a lap are looked at
+        elif 0 < pieces <= selected_bin and bins[selected_bin - pieces] == 0:
+            captures = max(captures, opponent_bins[selected_bin - pieces])
+    return extra_turns, captures
+
+
+def get_value_features(
+    position: Position,
+    player: Player,
+    next_player: Player,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Tuple[int, ...]:
+    """The values of `VALUE_FEATURES` for `player` once `next_player` is to move."""
+    number_of_bins = config.number_of_bins
+    player_offset = get_row_offset(player, config)
+    opponent_offset = number_of_bins + 1 - player_offset
+    player_bins = position[player_offset : player_offset + number_of_bins]
+    opponent_bins = position[opponent_offset : opponent_offset + number_of_bins]
+    player_extra_turns, player_captures = _get_row_features(player_bins, opponent_bins)
+    opponent_extra_turns, opponent_captures = _get_row_features(
+        opponent_bins, player_bins
+    )
+    return (
+        position[player_offset + number_of_bins]
+        - position[opponent_offset + number_of_bins],
+        sum(player_bins),
+        sum(opponent_bins),
+        int(next_player == player),
+        player_extra_turns,
+        opponent_extra_turns,
+        player_captures,
+        opponent_captures,
+    )
+
+
+class LinearValueStrategy(PlayerStrategy):
+    """Strategy playing into the position with the highest linear value.
+
+    Every position a move leads to is valued by the weighted sum of its
+    `VALUE_FEATURES`, from the mover's side, while moves finishing the game
+    are valued by their final margin. `choose_bins` chooses for many games
+    at once, valuing the children of all of them in a single pass over one
+    feature matrix. The first bin with the highest value is chosen.
+
+    """
+
+    def __init__(
+        self, weights: Sequence[float], config: GameConfig = DEFAULT_GAME_CONFIG
+    ):
+        if len(weights) != len(VALUE_FEATURES):
+            raise ValueError(f"weights must be of length {len(VALUE_FEATURES)}")
+        super().__init__(config)
+        self._weights = tuple(weights)
+
+    @classmethod
+    def from_file(
+        cls, path: str, config: GameConfig = DEFAULT_GAME_CONFIG
+    ) -> "LinearValueStrategy":
+        """Load the weights from a JSON object of `VALUE_FEATURES` to weights."""
+        with open(path) as f:
+            weights = json.load(f)
+        if not isinstance(weights, dict) or sorted(weights) != sorted(VALUE_FEATURES):
+            raise ValueError(f"{path} should give a weight to each of VALUE_FEATURES")
+        return cls([weights[feature] for feature in VALUE_FEATURES], config)
+
+    @property
+    def weights(self) -> Tuple[float, ...]:
+        return self._weights
+
+    @property
+    def strategy_name(self) -> str:
+        return "linear-value-" + ",".join(f"{w:.3g}" for w in self._weights)
+
+    @property
+    def thread_safe(self) -> bool:
+        return True
+
+    def choose_bin(
+        self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
+    ) -> int:
+        if not isinstance(opponent_row, PlayerRow):
+            raise ValueError("strategy requires opponent_row be provided")
+
+        position = (
+            *player_row.bins,
+            player_row.goal,
+            *opponent_row.bins,
+            opponent_row.goal,
+        )
+        return self.choose_bins([(position, Player.ONE)])[0]
+
+    def choose_bins(self, parents: Sequence[Tuple[Position, Player]]) -> List[int]:
+        """The bin chosen by each player to move in `parents`."""
+        batch = get_successors_batch(parents, self.config)
+        features: List[int] = []
+        decided: Dict[int, float] = {}
+        for (_, player), successors in zip(parents, batch):
+            if len(successors) == 0:
+                raise ValueError("player_row does not contain any non-empty-bins")
+            for _, child, next_player, _ in successors:
+                margin = get_final_margin(child, next_player, self.config)
+                if margin is not None:
+                    margin = margin if next_player == player else -margin
+                    decided[len(features)] = (
+                        (margin > 0) - (margin < 0)
+                    ) * _DECIDED_SCORE + margin
+                features.extend(
+                    get_value_features(child, player, next_player, self.config)
+                )
+
+        number_of_features = len(VALUE_FEATURES)
+        values = [
+            decided[row]
+            if row in decided
+            else sum(map(mul, self._weights, features[row : row + number_of_features]))
+            for row in range(0, len(features), number_of_features)
         ]
-        return max(number_of_pieces_in_opponents_row, key=lambda item: item[1])[0]
+        chosen_bins = []
+        child_index = 0
+        for successors in batch:
+            best = max(range(len(successors)), key=lambda i: values[child_index + i])
+            chosen_bins.append(successors[best][0])
+            child_index += len(successors)
+        return chosen_bins
+
+
+class PerfectPlayStrategy(PlayerStrategy):
+    """Strategy playing the move with the best solved value.
+
+    Looks every move up in a `ValueTable` written by `mancala.solver.solve`,
+    choosing the first bin that finishes the game furthest ahead of the
+    opponent with perfect play from both sides.
+
+    """
+
+    def __init__(
+        self, value_table: ValueTable, config: GameConfig = DEFAULT_GAME_CONFIG
+    ):
+        super().__init__(config)
+        self._value_table = value_table
+
+    @property
+    def strategy_name(self) -> str:
+        return "perfect-play"
+
+    def choose_bin(
+        self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
+    ) -> int:
+        if all(b_i == 0 for b_i in player_row.bins):
+            raise ValueError("player_row does not contain any non-empty-bins")
+        elif not isinstance(opponent_row, PlayerRow):
+            raise ValueError("strategy requires opponent_row be provided")
+
+        board = Board({Player.ONE: player_row, Player.TWO: opponent_row})
+        move_values = self._value_table.get_move_values(board, Player.ONE)
+        return max(move_values, key=lambda selected_bin: move_values[selected_bin])
+
+
+class AlphaBetaPlayerStrategy(PlayerStrategy):
+    """Strategy searching a fixed number of plies ahead with `AlphaBetaSearch`.
+
+    The transposition table is kept between moves, so later searches reuse
+    the positions found by earlier ones.
+
+    """
+
+    def __init__(self, depth: int, config: GameConfig = DEFAULT_GAME_CONFIG):
+        if depth <= 0:
+            raise ValueError("depth should be positive")
+        super().__init__(config)
+        self._depth = depth
+        self._search = AlphaBetaSearch(config)
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @property
+    def strategy_name(self) -> str:
+        return f"alpha-beta-depth-{self._depth}"
+
+    def choose_bin(
+        self, player_row: PlayerRow, opponent_row: Optional[PlayerRow] = None
+    ) -> int:
+        if all(b_i == 0 for b_i in player_row.bins):
+            raise ValueError("player_row does not contain any non-empty-bins")
+        elif not isinstance(opponent_row, PlayerRow):
+            raise ValueError("strategy requires opponent_row be provided")
+
+        position = (
+            *player_row.bins,
+            player_row.goal,
+            *opponent_row.bins,
+            opponent_row.goal,
+        )
+        return self._search.search(position, Player.ONE, self._depth).best_bin
+
+
+def get_simple_strategies(
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Dict[str, PlayerStrategy]:
+    """The strategies needing no set up, by name."""
+    strategies: List[PlayerStrategy] = [
+        ExampleRandomPlayerStrategy(config),
+        AlwaysMinimumPlayerStrategy(config),
+        AlwaysMaximumPlayerStrategy(config),
+        EvenGoalOrPiecesOnOtherSideStrategy(config),
+        EvenGoalStealAndPiecesOnOtherSideStrategy(config),
+    ]
+    return {strategy.strategy_name: strategy for strategy in strategies}
@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import sys
+import time
+from typing import Optional, Sequence, TextIO
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import PlayerRow
+from mancala.strategy import (
+    AlwaysMinimumPlayerStrategy,
+    PlayerStrategy,
+    get_simple_strategies,
+)
+
+
+def answer(line: str, strategy: PlayerStrategy) -> str:
+    """Reply to one request of the match server's line protocol."""
+    request_id, *values = line.split()
+    number_of_bins = strategy.config.number_of_bins
+    player_row = PlayerRow(
+        [int(v) for v in values[:number_of_bins]],
+        int(values[number_of_bins]),
+        strategy.config,
+    )
+    opponent_row = PlayerRow(
+        [int(v) for v in values[number_of_bins + 1 : -1]],
+        int(values[-1]),
+        strategy.config,
+    )
+    return f"{request_id} {strategy.choose_bin(player_row, opponent_row)}"
+
+
+def serve(
+    strategy: PlayerStrategy, stdin: TextIO, stdout: TextIO, delay: float = 0.0
+) -> None:
+    """Answer requests from `stdin` in order until it is closed."""
+    for line in stdin:
+        if delay > 0:
+            time.sleep(delay)
+        stdout.write(answer(line, strategy) + "\n")
+        stdout.flush()
+
+
+async def serve_connection(
+    strategy: PlayerStrategy,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Answer requests from a socket in order until it is closed."""
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        writer.write((answer(line.decode(), strategy) + "\n").encode())
+        await writer.drain()
+    writer.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.stub_bot",
+        description="Play a built-in strategy over the match server's line protocol.",
+    )
+    parser.add_argument(
+        "--strategy", default=AlwaysMinimumPlayerStrategy().strategy_name
+    )
+    parser.add_argument(
+        "--delay", type=float, default=0.0, help="seconds to wait before each answer"
+    )
+    parser.add_argument("--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins)
+    parser.add_argument(
+        "--pieces", type=int, default=DEFAULT_GAME_CONFIG.number_of_starting_pieces
+    )
+    args = parser.parse_args(argv)
+
+    strategies = get_simple_strategies(GameConfig(args.bins, args.pieces))
+    if args.strategy not in strategies:
+        parser.error(f"strategy must be one of {', '.join(sorted(strategies))}")
+    serve(strategies[args.strategy], sys.stdin, sys.stdout, args.delay)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+
+# Landing locations other than one of the player's own bins
+LANDS_IN_GOAL = -1
+LANDS_IN_OPPONENTS_ROW = -2
+
+
+@dataclass(frozen=True)
+class GameTables:
+    """Values precomputed once per GameConfig for the engine and the loop.
+
+    `landing[selected_bin][last_position]` gives where the last piece sown
+    from `selected_bin` lands, where `last_position` is the number of pieces
+    minus one modulo `lap_length`. It is either one of the player's bins or
+    one of the `LANDS_IN_*` values. `capture_bins[i]` is the opponent's bin
+    emptied by a capture in the player's bin `i`.
+
+    """
+
+    config: GameConfig
+    lap_length: int
+    winning_threshold: int
+    starting_bins: Tuple[int, ...]
+    landing: Tuple[Tuple[int, ...], ...]
+    capture_bins: Tuple[int, ...]
+
+
+def _get_landing(selected_bin: int, number_of_bins: int) -> Tuple[int, ...]:
+    lap_length = 2 * number_of_bins + 1
+    landing = []
+    for last_position in range(lap_length):
+        if last_position < selected_bin:
+            landing.append(selected_bin - 1 - last_position)
+        elif last_position == selected_bin:
+            landing.append(LANDS_IN_GOAL)
+        elif last_position <= selected_bin + number_of_bins:
+            landing.append(LANDS_IN_OPPONENTS_ROW)
+        else:
+            landing.append(lap_length - 1 - last_position + selected_bin)
+    return tuple(landing)
+
+
+@lru_cache(maxsize=None)
+def get_game_tables(config: GameConfig = DEFAULT_GAME_CONFIG) -> GameTables:
+    number_of_bins = config.number_of_bins
+    return GameTables(
+        config=config,
+        lap_length=2 * number_of_bins + 1,
+        winning_threshold=config.winning_threshold,
+        starting_bins=tuple(
+            config.number_of_starting_pieces for _ in range(number_of_bins)
+        ),
+        landing=tuple(
+            _get_landing(selected_bin, number_of_bins)
+            for selected_bin in range(number_of_bins)
+        ),
+        # Captures take from the opponent's bin with the same index
+        capture_bins=tuple(range(number_of_bins)),
+    )
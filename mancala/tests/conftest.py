@@ -0,0 +1,15 @@
+import os
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = str(Path(__file__).parents[2])
+
+
+@pytest.fixture
+def importable_package(monkeypatch):
+    """Let child processes import `mancala` whatever directory pytest runs from."""
+    monkeypatch.setenv(
+        "PYTHONPATH",
+        os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])),
+    )
@@ -0,0 +1,106 @@
+import pytest
+
+from mancala import adjudicate
+from mancala.adjudicate import DECIDED_SEARCH_PIECE_LIMIT, get_decided_outcome
+from mancala.config import DEFAULT_GAME_CONFIG
+from mancala.mancala import Board, Player, PlayerRow, get_new_board
+
+
+def _get_board(player_one_row: PlayerRow, player_two_row: PlayerRow) -> Board:
+    return Board({Player.ONE: player_one_row, Player.TWO: player_two_row})
+
+
+@pytest.mark.parametrize("player", Player)
+def test_get_decided_outcome_is_undecided_for_a_new_board(player):
+    assert get_decided_outcome(get_new_board(), player) == (False, None)
+
+
+@pytest.mark.parametrize("player", Player)
+def test_get_decided_outcome_is_decided_once_a_goal_is_over_half(player):
+    board = _get_board(
+        PlayerRow(bins=[4, 0, 3, 0, 2, 1], goal=25),
+        PlayerRow(bins=[1, 6, 2, 0, 3, 1], goal=0),
+    )
+    assert get_decided_outcome(board, player) == (True, Player.ONE)
+
+
+def test_get_decided_outcome_does_not_search_positions_with_many_pieces():
+    board = _get_board(
+        PlayerRow(bins=[0, 0, 0, 0, 0, DECIDED_SEARCH_PIECE_LIMIT], goal=20),
+        PlayerRow(bins=[0, 0, 0, 0, 0, 1], goal=19),
+    )
+    memo = {}
+    assert get_decided_outcome(board, Player.ONE, memo) == (False, None)
+    assert memo == {}
+
+
+@pytest.mark.parametrize("player", Player)
+def test_get_decided_outcome_ends_game_when_player_cannot_move(player):
+    board = _get_board(
+        PlayerRow(bins=[0, 0, 0, 0, 0, 0], goal=10),
+        PlayerRow(bins=[1, 0, 0, 0, 0, 0], goal=5),
+    )
+    assert get_decided_outcome(board, player) == (True, Player.ONE)
+
+
+def test_get_decided_outcome_can_decide_a_tie():
+    board = _get_board(
+        PlayerRow(bins=[0, 0, 0, 0, 0, 0], goal=24),
+        PlayerRow(bins=[0, 0, 0, 0, 0, 0], goal=24),
+    )
+    assert get_decided_outcome(board, Player.TWO) == (True, None)
+
+
+def test_get_decided_outcome_searches_every_continuation():
+    # Whatever either player does, Player.TWO captures the last of the pieces
+    board = _get_board(
+        PlayerRow(bins=[0, 1, 0, 0, 0, 0], goal=20),
+        PlayerRow(bins=[0, 1, 0, 0, 0, 0], goal=20),
+    )
+    memo = {}
+    assert get_decided_outcome(board, Player.ONE, memo) == (True, Player.TWO)
+    assert len(memo) > 0
+
+
+def test_get_decided_outcome_is_undecided_while_the_winner_can_change():
+    board = _get_board(
+        PlayerRow(bins=[0, 0, 0, 0, 1, 0], goal=22),
+        PlayerRow(bins=[0, 0, 0, 0, 2, 2], goal=21),
+    )
+    assert get_decided_outcome(board, Player.ONE) == (False, None)
+
+
+def test_get_decided_outcome_shares_memo_entries_with_the_mirror_image():
+    player_one_row = PlayerRow(bins=[0, 1, 0, 0, 0, 0], goal=20)
+    player_two_row = PlayerRow(bins=[0, 0, 2, 0, 0, 0], goal=21)
+    memo = {}
+    outcome = get_decided_outcome(
+        _get_board(player_one_row, player_two_row), Player.ONE, memo
+    )
+    entries = len(memo)
+    mirror_outcome = get_decided_outcome(
+        _get_board(player_two_row, player_one_row), Player.TWO, memo
+    )
+    assert len(memo) == entries
+    assert mirror_outcome[0] == outcome[0]
+    assert mirror_outcome[1] == (
+        None
+        if outcome[1] is None
+        else (Player.ONE if outcome[1] == Player.TWO else Player.TWO)
+    )
+
+
+def test_get_decided_outcome_shares_a_memo_between_games():
+    board = _get_board(
+        PlayerRow(bins=[0, 1, 0, 0, 0, 0], goal=20),
+        PlayerRow(bins=[0, 1, 0, 0, 0, 0], goal=20),
+    )
+    memo = adjudicate._outcome_memos.setdefault(DEFAULT_GAME_CONFIG, {})
+    memo.clear()
+    assert get_decided_outcome(board, Player.ONE) == (True, Player.TWO)
+    entries = len(memo)
+    assert entries > 0
+    # Only the bins are searched, so other goals reuse the same entries
+    board[Player.ONE] = PlayerRow(bins=[0, 1, 0, 0, 0, 0], goal=23)
+    assert get_decided_outcome(board, Player.ONE) == (True, Player.ONE)
+    assert len(memo) == entries
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from mancala.analysis import MoveAnalysis
+from mancala.config import GameConfig
+from mancala.mancala import (
+    Player,
+    PlayerRow,
+    Turn,
+    get_new_board,
+    take_turn,
+    who_gets_next_turn,
+)
+from mancala.tables import LANDS_IN_GOAL, LANDS_IN_OPPONENTS_ROW
+
+
+def test_move_analysis_matches_take_turn():
+    rng = random.Random(0)
+    config = GameConfig(6, 4)
+    for _ in range(200):
+        player_one_bins = [rng.randint(0, 15) for _ in range(6)]
+        player_one_bins[rng.randrange(6)] += 1
+        player_one_row = PlayerRow(player_one_bins, rng.randint(0, 20), config)
+        player_two_row = PlayerRow(
+            [rng.randint(0, 15) for _ in range(6)], rng.randint(0, 20), config
+        )
+        board = get_new_board(config)
+        board[Player.ONE] = player_one_row
+        board[Player.TWO] = player_two_row
+        analysis = MoveAnalysis(player_one_row, player_two_row, config)
+        assert analysis.legal_bins == [i for i, b in enumerate(player_one_bins) if b]
+
+        for selected_bin in analysis.legal_bins:
+            turn = Turn(Player.ONE, selected_bin, config)
+            new_board = take_turn(board, turn, config)
+            assert analysis.resulting_rows(selected_bin) == (
+                new_board[Player.ONE],
+                new_board[Player.TWO],
+            )
+            assert analysis.resulting_position(selected_bin) == (
+                *new_board[Player.ONE].bins,
+                new_board[Player.ONE].goal,
+                *new_board[Player.TWO].bins,
+                new_board[Player.TWO].goal,
+            )
+            assert analysis.extra_turn(selected_bin) == (
+                who_gets_next_turn(board, turn, new_board, config) == Player.ONE
+            )
+            pieces_sown_opposite = sum(new_board[Player.TWO].bins) - sum(
+                player_two_row.bins
+            )
+            assert analysis.seeds_to_opponent(
+                selected_bin
+            ) == pieces_sown_opposite + analysis.captured_pieces(selected_bin)
+
+
+def test_move_analysis_fields():
+    config = GameConfig(6, 4)
+    analysis = MoveAnalysis(
+        PlayerRow([0, 1, 3, 0, 9, 0], 0, config),
+        PlayerRow([5, 0, 0, 0, 0, 0], 0, config),
+        config,
+    )
+    assert analysis.landing(1) == 0
+    assert analysis.captured_pieces(1) == 5
+    assert analysis.landing(2) == LANDS_IN_GOAL
+    assert analysis.extra_turn(2)
+    assert analysis.landing(4) == LANDS_IN_OPPONENTS_ROW
+    assert analysis.seeds_to_opponent(4) == 4
+    assert analysis.captured_pieces(4) == 0
+
+
+def test_move_analysis_keeps_computed_moves():
+    config = GameConfig(6, 4)
+    analysis = MoveAnalysis(
+        PlayerRow.get_new_player_row(config), PlayerRow.get_new_player_row(config)
+    )
+    assert analysis.config == config
+    assert analysis.resulting_rows(3)[0] is analysis.resulting_rows(3)[0]
+
+
+def test_move_analysis_rejects_incorrect_bins():
+    analysis = MoveAnalysis(PlayerRow([0, 1, 0, 0, 0, 0], 0))
+    with pytest.raises(ValueError):
+        analysis.landing(6)
+    with pytest.raises(ValueError):
+        analysis.seeds_to_opponent(0)
+    assert analysis.seeds_to_opponent(1) == 0
+    with pytest.raises(ValueError):
+        analysis.captured_pieces(1)
@@ -0,0 +1,205 @@
+import random
+
+import pytest
+
+from mancala.batch import (
+    main,
+    simulate_games,
+    simulate_games_in_processes,
+    simulate_games_in_step,
+    simulate_games_in_threads,
+)
+from mancala.config import GameConfig
+from mancala.mancala import Player
+from mancala.strategy import (
+    AlphaBetaPlayerStrategy,
+    AlwaysMaximumPlayerStrategy,
+    AlwaysMinimumPlayerStrategy,
+    ExampleRandomPlayerStrategy,
+    LinearValueStrategy,
+)
+
+
+def test_simulate_games_plays_requested_number_of_games():
+    results = list(
+        simulate_games(
+            AlwaysMinimumPlayerStrategy(),
+            ExampleRandomPlayerStrategy(),
+            5,
+            starting_player=Player.TWO,
+        )
+    )
+    assert len(results) == 5
+    assert all(result.starting_player == Player.TWO for result in results)
+    assert all(result.plies > 0 for result in results)
+
+
+def test_simulate_games_is_reproducible_per_game_index():
+    def _simulate(games, first_game=0):
+        return list(
+            simulate_games(
+                ExampleRandomPlayerStrategy(),
+                ExampleRandomPlayerStrategy(),
+                games,
+                seed=7,
+                first_game=first_game,
+            )
+        )
+
+    results = _simulate(6)
+    assert results == _simulate(6)
+    assert results[4:] == _simulate(2, first_game=4)
+
+
+def test_seeded_games_leave_the_global_generator_alone():
+    random.seed(5)
+    expected = [random.random() for _ in range(3)]
+    random.seed(5)
+    strategy = ExampleRandomPlayerStrategy()
+    list(simulate_games(strategy, strategy, 2, seed=1))
+    simulate_games_in_step(strategy, strategy, 2, seed=1)
+    with simulate_games_in_processes(strategy, strategy, 2, seed=1, processes=1):
+        pass
+    assert [random.random() for _ in range(3)] == expected
+
+
+def test_simulate_games_can_adjudicate():
+    results = simulate_games(
+        AlwaysMinimumPlayerStrategy(),
+        AlwaysMinimumPlayerStrategy(),
+        1,
+        adjudicate_when_decided=True,
+    )
+    assert next(results).adjudicated is True
+
+
+class _BatchCountingStrategy(LinearValueStrategy):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_sizes = []
+
+    def choose_bins(self, parents):
+        self.batch_sizes.append(len(parents))
+        return super().choose_bins(parents)
+
+
+@pytest.mark.parametrize("config", [GameConfig(), GameConfig(4, 3)])
+def test_simulate_games_in_step_matches_serial_games(config):
+    player_one = _BatchCountingStrategy(
+        (1.0, 0.0, 0.0, 1.0, 0.0, 0.0, 1.0, -1.0), config
+    )
+    for player_two in (
+        AlwaysMinimumPlayerStrategy(config),
+        AlwaysMaximumPlayerStrategy(config),
+    ):
+        results = simulate_games_in_step(
+            player_one, player_two, 20, seed=3, first_game=5, config=config
+        )
+        assert results == list(
+            simulate_games(
+                player_one, player_two, 20, seed=3, first_game=5, config=config
+            )
+        )
+    # Each ply, the linear strategy chose for all the games it was to move in
+    assert max(player_one.batch_sizes) > 1
+
+
+def test_simulate_games_in_step_plays_random_games():
+    results = simulate_games_in_step(
+        ExampleRandomPlayerStrategy(),
+        ExampleRandomPlayerStrategy(),
+        200,
+        starting_player=Player.TWO,
+    )
+    assert len(results) == 200
+    assert all(result.starting_player == Player.TWO for result in results)
+    assert {result.winning_player for result in results} == {
+        Player.ONE,
+        Player.TWO,
+        None,
+    }
+
+
+def test_simulate_games_in_step_rejects_incorrect_strategies():
+    with pytest.raises(ValueError):
+        simulate_games_in_step(
+            AlwaysMinimumPlayerStrategy(GameConfig(4, 3)),
+            AlwaysMinimumPlayerStrategy(),
+            1,
+        )
+
+    class _EmptyBinStrategy(AlwaysMinimumPlayerStrategy):
+        def choose_bins(self, parents):
+            return [0] * len(parents)
+
+    with pytest.raises(ValueError):
+        simulate_games_in_step(_EmptyBinStrategy(), _EmptyBinStrategy(), 1)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_simulate_games_in_processes_matches_serial_games(processes):
+    player_one = ExampleRandomPlayerStrategy()
+    player_two = AlwaysMinimumPlayerStrategy()
+    expected_results = list(simulate_games(player_one, player_two, 7, seed=3))
+    with simulate_games_in_processes(
+        player_one, player_two, 7, seed=3, processes=processes, chunk_size=3
+    ) as table:
+        assert list(table) == expected_results
+
+
+def test_simulate_games_in_processes_requires_positive_chunk_size():
+    with pytest.raises(ValueError):
+        simulate_games_in_processes(
+            AlwaysMinimumPlayerStrategy(),
+            AlwaysMinimumPlayerStrategy(),
+            2,
+            chunk_size=0,
+        )
+
+
+class _BrokenStrategy(AlwaysMinimumPlayerStrategy):
+    def choose_bin(self, player_row, opponent_row=None):
+        raise RuntimeError("broken")
+
+
+def test_simulate_games_in_processes_releases_table_on_failure():
+    with pytest.raises(RuntimeError):
+        simulate_games_in_processes(
+            _BrokenStrategy(), _BrokenStrategy(), 2, processes=1
+        )
+
+
+@pytest.mark.parametrize("free_threaded", [False, True])
+def test_simulate_games_in_threads_matches_serial_games(monkeypatch, free_threaded):
+    monkeypatch.setattr("mancala.batch.is_free_threaded", lambda: free_threaded)
+    player_one = ExampleRandomPlayerStrategy()
+    player_two = ExampleRandomPlayerStrategy()
+    expected_results = list(simulate_games(player_one, player_two, 7, seed=3))
+    with simulate_games_in_threads(
+        player_one, player_two, 7, seed=3, threads=3, chunk_size=2
+    ) as table:
+        assert list(table) == expected_results
+
+
+def test_simulate_games_in_threads_rejects_incorrect_arguments():
+    strategy = AlwaysMinimumPlayerStrategy()
+    with pytest.raises(ValueError):
+        simulate_games_in_threads(strategy, AlphaBetaPlayerStrategy(2), 2)
+    with pytest.raises(ValueError):
+        simulate_games_in_threads(strategy, strategy, 2, chunk_size=0)
+    with pytest.raises(RuntimeError):
+        simulate_games_in_threads(
+            _BrokenStrategy(), _BrokenStrategy(), 2, fall_back_to_processes=False
+        )
+
+
+def test_main(capsys):
+    assert main(["--games", "20", "--workers", "2", "--chunk-size", "5"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("Free-threaded: ")
+    assert lines[1].startswith("processes ")
+    assert lines[2].startswith("threads ")
+    # Both backends play the same games
+    assert lines[1].split("(")[1] == lines[2].split("(")[1]
+    with pytest.raises(SystemExit):
+        main(["--player-one", "no-such-strategy"])
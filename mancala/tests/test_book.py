@@ -0,0 +1,120 @@
+import filecmp
+import struct
+
+import pytest
+
+from mancala.batch import simulate_games
+from mancala.book import (
+    BOOK_ENTRY_SIZE,
+    BOOK_HEADER_FORMAT,
+    BOOK_HEADER_SIZE,
+    BookPlayerStrategy,
+    OpeningBook,
+    build_book,
+    main,
+)
+from mancala.config import GameConfig
+from mancala.mancala import Player, PlayerRow
+from mancala.position import board_to_position
+from mancala.reachable import enumerate_reachable_positions
+from mancala.search import AlphaBetaSearch
+from mancala.strategy import AlwaysMinimumPlayerStrategy, ExampleRandomPlayerStrategy
+
+SMALL_CONFIG = GameConfig(4, 2)
+
+
+@pytest.fixture(scope="module")
+def book_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("book") / "opening.book")
+    build_book(path, plies=3, depth=4, config=SMALL_CONFIG, chunk_size=5)
+    return path
+
+
+def test_build_book_searches_every_position(book_path):
+    positions = sum(c.positions for c in enumerate_reachable_positions(SMALL_CONFIG, 3))
+    with OpeningBook(book_path) as book:
+        assert book.config == SMALL_CONFIG
+        assert book.depth == 4
+        # Mirrored positions share an entry
+        assert 0 < len(book) <= positions
+
+        new_row = PlayerRow.get_new_player_row(SMALL_CONFIG)
+        entry = book.lookup(new_row, new_row)
+        result = AlphaBetaSearch(SMALL_CONFIG).search(
+            board_to_position({Player.ONE: new_row, Player.TWO: new_row}),
+            Player.ONE,
+            4,
+        )
+        assert (entry.best_bin, entry.score) == (result.best_bin, result.score)
+        assert book.lookup(PlayerRow([0, 0, 0, 8], 0, SMALL_CONFIG), new_row) is None
+
+
+def test_build_book_file_layout(book_path, tmp_path):
+    with OpeningBook(book_path) as book:
+        entries = len(book)
+    with open(book_path, "rb") as f:
+        assert len(f.read()) == BOOK_HEADER_SIZE + entries * BOOK_ENTRY_SIZE
+
+    other_path = str(tmp_path / "other.book")
+    assert build_book(other_path, 3, 4, processes=2, config=SMALL_CONFIG) == entries
+    assert filecmp.cmp(book_path, other_path, shallow=False)
+
+
+def test_build_book_rejects_incorrect_arguments(tmp_path):
+    path = str(tmp_path / "opening.book")
+    with pytest.raises(ValueError):
+        build_book(path, 2, 2, config=SMALL_CONFIG, chunk_size=0)
+    with pytest.raises(ValueError):
+        build_book(path, 2, 2, config=GameConfig(11, 6))
+    with pytest.raises(ValueError):
+        build_book(path, 2, 2, config=GameConfig(8, 6))
+
+
+def test_opening_book_rejects_other_files(tmp_path):
+    path = tmp_path / "not.book"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        OpeningBook(str(path))
+
+
+def test_opening_book_rejects_keys_over_64_bits(tmp_path):
+    path = tmp_path / "large.book"
+    path.write_bytes(struct.pack(BOOK_HEADER_FORMAT, b"MCOB", 1, 8, 6, 2, 0))
+    with pytest.raises(ValueError):
+        OpeningBook(str(path))
+
+
+def test_book_player_strategy(book_path):
+    with OpeningBook(book_path) as book:
+        fallback = AlwaysMinimumPlayerStrategy(SMALL_CONFIG)
+        strategy = BookPlayerStrategy(book, fallback)
+        assert strategy.strategy_name == "always-minimum-with-book"
+        assert strategy.config == SMALL_CONFIG
+
+        list(
+            simulate_games(
+                strategy,
+                ExampleRandomPlayerStrategy(SMALL_CONFIG),
+                10,
+                seed=0,
+                config=SMALL_CONFIG,
+            )
+        )
+        assert strategy.hits > 0
+        assert strategy.misses > 0
+
+        new_row = PlayerRow.get_new_player_row(SMALL_CONFIG)
+        assert strategy.choose_bin(new_row) == fallback.choose_bin(new_row)
+        with pytest.raises(ValueError):
+            strategy.choose_bin(PlayerRow([0, 0, 0, 0], 8, SMALL_CONFIG))
+        with pytest.raises(ValueError):
+            BookPlayerStrategy(book, AlwaysMinimumPlayerStrategy())
+
+
+def test_main(capsys, tmp_path):
+    path = str(tmp_path / "opening.book")
+    argv = [path, "--plies", "1", "--depth", "2", "--bins", "4", "--pieces", "2"]
+    assert main(argv + ["--processes", "1"]) == 0
+    assert capsys.readouterr().out.startswith("Wrote ")
+    with OpeningBook(path) as book:
+        assert len(book) > 0
@@ -0,0 +1,131 @@
+import random
+from array import array
+
+import pytest
+
+from mancala.batch import simulate_games
+from mancala.compiled import (
+    CompiledPlayerStrategy,
+    CompiledPolicy,
+    compile_strategy,
+)
+from mancala.config import GameConfig
+from mancala.mancala import Player, PlayerRow
+from mancala.strategy import (
+    AlwaysMaximumPlayerStrategy,
+    EvenGoalOrPiecesOnOtherSideStrategy,
+    EvenGoalStealAndPiecesOnOtherSideStrategy,
+    ExampleRandomPlayerStrategy,
+)
+
+SMALL_CONFIG = GameConfig(4, 2)
+
+
+@pytest.mark.parametrize("starting_player", [Player.ONE, Player.TWO])
+def test_compiled_strategy_plays_like_original(starting_player):
+    strategy = EvenGoalStealAndPiecesOnOtherSideStrategy(SMALL_CONFIG)
+    compiled = CompiledPlayerStrategy(compile_strategy(strategy), strategy)
+    assert compiled.strategy_name == strategy.strategy_name
+    assert compiled.config == SMALL_CONFIG
+
+    random_strategy = ExampleRandomPlayerStrategy(SMALL_CONFIG)
+    kwargs = dict(
+        games=50, starting_player=starting_player, seed=3, config=SMALL_CONFIG
+    )
+    # Seat the compiled strategy as Player.TWO, where it sees the board mirrored
+    expected = list(simulate_games(random_strategy, strategy, **kwargs))
+    assert list(simulate_games(random_strategy, compiled, **kwargs)) == expected
+    assert compiled.hits > 0
+    assert compiled.misses == 0
+
+
+def test_compile_strategy_for_matchup():
+    strategy = AlwaysMaximumPlayerStrategy()
+    opponent = EvenGoalOrPiecesOnOtherSideStrategy()
+    policy = compile_strategy(strategy, opponent)
+    # Both games of a deterministic matchup are a single line each
+    assert 0 < len(policy) < 50
+
+    compiled = CompiledPlayerStrategy(policy, strategy)
+    for starting_player in Player:
+        list(simulate_games(compiled, opponent, 1, starting_player))
+    assert compiled.misses == 0
+
+
+def test_compile_strategy_max_depth_falls_back_to_strategy():
+    strategy = AlwaysMaximumPlayerStrategy(SMALL_CONFIG)
+    policy = compile_strategy(strategy, max_depth=2, starting_players=[Player.ONE])
+    # The opening, then the replies that do not earn the opponent another turn
+    assert len(policy) == 1 + 3
+
+    compiled = CompiledPlayerStrategy(policy, strategy)
+    random.seed(0)
+    list(
+        simulate_games(
+            compiled,
+            ExampleRandomPlayerStrategy(SMALL_CONFIG),
+            5,
+            Player.ONE,
+            config=SMALL_CONFIG,
+        )
+    )
+    assert compiled.hits >= 5
+    assert compiled.misses > 0
+
+    new_row = PlayerRow.get_new_player_row(SMALL_CONFIG)
+    assert compiled.choose_bin(new_row) == strategy.choose_bin(new_row)
+
+
+def test_compiled_policy_lookup():
+    strategy = AlwaysMaximumPlayerStrategy(SMALL_CONFIG)
+    policy = compile_strategy(strategy, max_depth=0, starting_players=[Player.ONE])
+    new_row = PlayerRow.get_new_player_row(SMALL_CONFIG)
+    assert len(policy) == 1
+    assert policy.get(new_row, new_row) == 0
+    assert policy.get(PlayerRow([3, 2, 2, 1], 0, SMALL_CONFIG), new_row) is None
+
+
+def test_compiled_policy_save_and_load(tmp_path):
+    strategy = EvenGoalOrPiecesOnOtherSideStrategy(SMALL_CONFIG)
+    policy = compile_strategy(strategy, max_depth=6)
+    path = str(tmp_path / "policy.bin")
+    policy.save(path)
+
+    loaded = CompiledPolicy.load(path)
+    assert loaded.config == SMALL_CONFIG
+    assert len(loaded) == len(policy)
+    new_row = PlayerRow.get_new_player_row(SMALL_CONFIG)
+    assert loaded.get(new_row, new_row) == policy.get(new_row, new_row)
+
+    with open(path, "r+b") as f:
+        f.write(b"XXXX")
+    with pytest.raises(ValueError):
+        CompiledPolicy.load(path)
+
+
+def test_compiled_policy_requires_sorted_keys_and_matching_config():
+    with pytest.raises(ValueError):
+        CompiledPolicy(array("Q", [1, 2]), array("B", [0]))
+    with pytest.raises(ValueError):
+        CompiledPolicy(array("Q", [2, 2]), array("B", [0, 1]))
+    with pytest.raises(ValueError):
+        CompiledPlayerStrategy(
+            CompiledPolicy(array("Q"), array("B")),
+            AlwaysMaximumPlayerStrategy(SMALL_CONFIG),
+        )
+
+
+def test_compiled_policy_rejects_keys_over_64_bits():
+    config = GameConfig(8, 6)
+    with pytest.raises(ValueError):
+        CompiledPolicy(array("Q"), array("B"), config)
+    with pytest.raises(ValueError):
+        compile_strategy(AlwaysMaximumPlayerStrategy(config), max_depth=1)
+
+
+def test_compiled_strategy_raises_error_for_no_choices():
+    strategy = AlwaysMaximumPlayerStrategy(SMALL_CONFIG)
+    compiled = CompiledPlayerStrategy(compile_strategy(strategy, max_depth=0), strategy)
+    with pytest.raises(ValueError):
+        compiled.choose_bin(PlayerRow([0, 0, 0, 0], 8, SMALL_CONFIG))
+    assert compiled.misses == 0
@@ -0,0 +1,26 @@
+import pytest
+
+from mancala.config import (
+    DEFAULT_GAME_CONFIG,
+    NUMBER_OF_BINS,
+    NUMBER_OF_STARTING_PIECES,
+    GameConfig,
+)
+
+
+def test_default_game_config_matches_module_constants():
+    assert DEFAULT_GAME_CONFIG == GameConfig(NUMBER_OF_BINS, NUMBER_OF_STARTING_PIECES)
+    assert DEFAULT_GAME_CONFIG.total_pieces == 48
+    assert DEFAULT_GAME_CONFIG.winning_threshold == 24
+
+
+@pytest.mark.parametrize("number_of_bins,number_of_starting_pieces", [(0, 4), (6, 0)])
+def test_game_config_requires_positive_values(
+    number_of_bins, number_of_starting_pieces
+):
+    with pytest.raises(ValueError):
+        GameConfig(number_of_bins, number_of_starting_pieces)
+
+
+def test_game_config_is_hashable():
+    assert len({GameConfig(4, 3), GameConfig(4, 3), GameConfig(8, 6)}) == 2
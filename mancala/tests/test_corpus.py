@@ -0,0 +1,174 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from mancala.config import NUMBER_OF_BINS, GameConfig
+from mancala.corpus import (
+    CorpusCase,
+    find_first_divergence,
+    generate_corpus,
+    get_maximum_generated_pieces,
+    load_engine,
+    main,
+    read_corpus,
+    reference_engine,
+    trusted_engine,
+    write_corpus,
+)
+from mancala.mancala import Player
+
+# Generated with `take_turn`/`who_gets_next_turn` as they were before the
+# engine was rewritten, from `generate_corpus(seed=11)` keeping the cases
+# where those sowed every piece, at most up to the opponent's row past a lap
+GOLDEN_CORPUS = os.path.join(
+    os.path.dirname(__file__), "data", "golden_corpus.jsonl.gz"
+)
+
+
+def never_steals_engine(board, turn):
+    """An engine that forgets captures, used to check divergence reports."""
+    new_board, next_player = reference_engine(board, turn)
+    goal_increase = new_board[turn.player].goal - board[turn.player].goal
+    return (board if goal_increase > 2 else new_board), next_player
+
+
+def test_generate_corpus_is_reproducible():
+    assert [case.to_row() for case in generate_corpus(20, seed=3)] == [
+        case.to_row() for case in generate_corpus(20, seed=3)
+    ]
+
+
+def test_generate_corpus_covers_every_sowing_branch():
+    selected_pieces = set()
+    captures = 0
+    for case in generate_corpus(2000, seed=0):
+        selected_bin = case.turn.selected_bin
+        pieces = case.board[case.turn.player].bins[selected_bin]
+        assert pieces <= get_maximum_generated_pieces(selected_bin)
+        selected_pieces.add(pieces - selected_bin)
+        goal_increase = (
+            case.result[case.turn.player].goal - case.board[case.turn.player].goal
+        )
+        captures += goal_increase > 2
+    # In-row, into the goal, the opponent's row, the second and third laps
+    lap_length = 2 * NUMBER_OF_BINS + 1
+    assert {0, 1, 2, NUMBER_OF_BINS + 2, lap_length + 1, 2 * lap_length + 1} <= (
+        selected_pieces
+    )
+    assert captures > 0
+
+
+def _with_original_double_lap_turns(engine):
+    # The original engine kept the turn after a double lap ending on the
+    # opponent's row, which was fixed when the engine was rewritten
+    def _engine(board, turn):
+        result, next_player = engine(board, turn)
+        pieces = board[turn.player].bins[turn.selected_bin] - turn.selected_bin
+        if pieces > 2 * NUMBER_OF_BINS + 2:
+            return result, turn.player
+        return result, next_player
+
+    return _engine
+
+
+@pytest.mark.parametrize("engine", [reference_engine, trusted_engine])
+def test_engines_match_golden_corpus(engine):
+    corpus_cases = list(read_corpus(GOLDEN_CORPUS))
+    assert len(corpus_cases) == 5000
+    for case in corpus_cases:
+        pieces = case.board[case.turn.player].bins[case.turn.selected_bin]
+        assert pieces - case.turn.selected_bin <= 3 * NUMBER_OF_BINS + 2
+    assert (
+        find_first_divergence(corpus_cases, _with_original_double_lap_turns(engine))
+        is None
+    )
+    # Only the next player of those double laps changed
+    divergence = find_first_divergence(corpus_cases, engine)
+    assert divergence is not None
+    assert divergence.actual_result == divergence.case.result
+    assert divergence.actual_next_player != divergence.case.turn.player
+
+
+def test_corpora_can_be_generated_for_other_board_sizes(tmp_path):
+    config = GameConfig(number_of_bins=4)
+    path = str(tmp_path / "corpus.jsonl.gz")
+    corpus_cases = list(generate_corpus(300, seed=6, config=config))
+    assert write_corpus(path, corpus_cases, seed=6, config=config) == 300
+    assert list(read_corpus(path, config)) == corpus_cases
+    for case in corpus_cases:
+        assert len(case.board[Player.ONE].bins) == 4
+        assert case.board[case.turn.player].bins[
+            case.turn.selected_bin
+        ] <= get_maximum_generated_pieces(case.turn.selected_bin, config)
+    with pytest.raises(ValueError):
+        list(read_corpus(path))
+    assert find_first_divergence(corpus_cases, trusted_engine) is None
+    divergence = find_first_divergence(corpus_cases, never_steals_engine)
+    assert divergence is not None
+    assert len(divergence.reproducer.board[Player.ONE].bins) == 4
+
+
+def test_corpus_cases_round_trip_through_rows():
+    for case in generate_corpus(10, seed=5):
+        assert CorpusCase.from_row(case.to_row()) == case
+
+
+def test_find_first_divergence_reports_minimal_reproducer():
+    corpus_cases = list(generate_corpus(500, seed=2))
+    divergence = find_first_divergence(corpus_cases, never_steals_engine)
+    assert divergence is not None
+    assert corpus_cases[divergence.case_index] == divergence.case
+    assert all(
+        never_steals_engine(case.board, case.turn) == (case.result, case.next_player)
+        for case in corpus_cases[: divergence.case_index]
+    )
+
+    reproducer = divergence.reproducer
+    assert reproducer.turn == divergence.case.turn
+    assert never_steals_engine(reproducer.board, reproducer.turn) != (
+        reproducer.result,
+        reproducer.next_player,
+    )
+    assert sum(reproducer.board[Player.ONE].bins) + sum(
+        reproducer.board[Player.TWO].bins
+    ) < sum(divergence.case.board[Player.ONE].bins) + sum(
+        divergence.case.board[Player.TWO].bins
+    )
+    assert "Minimal reproducer" in str(divergence)
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        {"version": 0, "number_of_bins": NUMBER_OF_BINS, "seed": 0},
+        {"version": 1, "number_of_bins": NUMBER_OF_BINS + 1, "seed": 0},
+    ],
+)
+def test_read_corpus_rejects_incompatible_corpora(tmp_path, header):
+    path = str(tmp_path / "corpus.jsonl.gz")
+    with gzip.open(path, "wt") as f:
+        f.write(json.dumps(header) + "\n")
+    with pytest.raises(ValueError):
+        list(read_corpus(path))
+
+
+def test_load_engine_imports_engine_by_path():
+    assert load_engine("mancala.corpus:reference_engine") is reference_engine
+    with pytest.raises(ValueError):
+        load_engine("mancala.corpus")
+
+
+def test_corpus_command_generates_and_checks(tmp_path, capsys):
+    path = str(tmp_path / "corpus.jsonl.gz")
+    assert main(["generate", path, "--cases", "300", "--seed", "4"]) == 0
+    assert main(["check", path]) == 0
+    assert "matches every case" in capsys.readouterr().out
+
+    engine = "mancala.tests.test_corpus:never_steals_engine"
+    assert main(["check", path, "--engine", engine]) == 1
+    assert "Minimal reproducer" in capsys.readouterr().out
+
+    assert main(["generate", path, "--cases", "50", "--bins", "3"]) == 0
+    assert main(["check", path, "--bins", "3"]) == 0
@@ -0,0 +1,141 @@
+from functools import lru_cache
+
+import pytest
+
+from mancala.config import GameConfig
+from mancala.exploit import (
+    BestResponseStrategy,
+    compute_best_response,
+    get_exploitability,
+    main,
+)
+from mancala.mancala import Player, PlayerRow
+from mancala.position import apply_move, get_new_position, get_row_offset
+from mancala.simulation import SimulationLoop
+from mancala.strategy import (
+    AlwaysMaximumPlayerStrategy,
+    AlwaysMinimumPlayerStrategy,
+    EvenGoalOrPiecesOnOtherSideStrategy,
+    EvenGoalStealAndPiecesOnOtherSideStrategy,
+)
+
+SMALL_CONFIG = GameConfig(4, 2)
+
+
+def _get_deterministic_strategies(config):
+    return [
+        AlwaysMinimumPlayerStrategy(config),
+        AlwaysMaximumPlayerStrategy(config),
+        EvenGoalOrPiecesOnOtherSideStrategy(config),
+        EvenGoalStealAndPiecesOnOtherSideStrategy(config),
+    ]
+
+
+def _get_best_margin(strategy, responder_moves_first):
+    """Plain search over every line of the responder's moves."""
+    config = strategy.config
+    number_of_bins = config.number_of_bins
+
+    @lru_cache(maxsize=None)
+    def _search(position, player):
+        one_goal, two_goal = position[number_of_bins], position[-1]
+        if max(one_goal, two_goal) > config.winning_threshold:
+            return one_goal - two_goal
+        offset = get_row_offset(player, config)
+        if not any(position[offset : offset + number_of_bins]):
+            return (
+                one_goal
+                + sum(position[:number_of_bins])
+                - two_goal
+                - sum(position[number_of_bins + 1 : -1])
+            )
+        if player == Player.ONE:
+            return max(
+                _search(*apply_move(position, player, b, config))
+                for b in range(number_of_bins)
+                if position[b]
+            )
+        selected_bin = strategy.choose_bin(
+            PlayerRow(list(position[number_of_bins + 1 : -1]), two_goal, config),
+            PlayerRow(list(position[:number_of_bins]), one_goal, config),
+        )
+        return _search(*apply_move(position, player, selected_bin, config))
+
+    return _search(
+        get_new_position(config), Player.ONE if responder_moves_first else Player.TWO
+    )
+
+
+@pytest.mark.parametrize("strategy", _get_deterministic_strategies(SMALL_CONFIG))
+@pytest.mark.parametrize("responder_moves_first", [True, False])
+def test_compute_best_response_matches_exhaustive_search(
+    strategy, responder_moves_first
+):
+    best_response = compute_best_response(strategy, responder_moves_first)
+    assert best_response.strategy_name == strategy.strategy_name
+    assert best_response.responder_moves_first == responder_moves_first
+    assert best_response.margin == _get_best_margin(strategy, responder_moves_first)
+    assert best_response.positions_searched > 0
+    assert best_response.turns[0].player == (
+        Player.ONE if responder_moves_first else Player.TWO
+    )
+
+
+@pytest.mark.parametrize("strategy", _get_deterministic_strategies(SMALL_CONFIG))
+@pytest.mark.parametrize("starting_player", [Player.ONE, Player.TWO])
+def test_best_response_strategy_reaches_margin(strategy, starting_player):
+    best_response = compute_best_response(strategy, starting_player == Player.ONE)
+    loop = SimulationLoop(
+        player_one=BestResponseStrategy(best_response, SMALL_CONFIG),
+        player_two=strategy,
+        starting_player=starting_player,
+        config=SMALL_CONFIG,
+    )
+    loop.run()
+    result = loop.get_result()
+    assert result.player_one_goal - result.player_two_goal == best_response.margin
+    assert loop.turns == list(best_response.turns)
+    if best_response.margin > 0:
+        assert loop.winning_player == Player.ONE
+
+
+def test_compute_best_response_on_default_game():
+    best_response = compute_best_response(
+        EvenGoalOrPiecesOnOtherSideStrategy(), responder_moves_first=False
+    )
+    assert best_response.margin == 26
+
+
+def test_get_exploitability():
+    strategy = AlwaysMinimumPlayerStrategy(SMALL_CONFIG)
+    assert (
+        get_exploitability(strategy)
+        == (_get_best_margin(strategy, True) + _get_best_margin(strategy, False)) / 2
+    )
+
+
+def test_best_response_strategy_choose_bin():
+    strategy = AlwaysMaximumPlayerStrategy(SMALL_CONFIG)
+    best_response_strategy = BestResponseStrategy(
+        compute_best_response(strategy), SMALL_CONFIG
+    )
+    assert best_response_strategy.strategy_name == ("best-response-to-always-maximum")
+    new_row = PlayerRow.get_new_player_row(SMALL_CONFIG)
+    assert best_response_strategy.choose_bin(new_row, new_row) in range(4)
+
+    with pytest.raises(ValueError):
+        best_response_strategy.choose_bin(PlayerRow([0, 0, 0, 0], 8, SMALL_CONFIG))
+    with pytest.raises(ValueError):
+        best_response_strategy.choose_bin(new_row)
+    with pytest.raises(ValueError):
+        best_response_strategy.choose_bin(
+            PlayerRow([1, 1, 1, 1], 4, SMALL_CONFIG),
+            PlayerRow([1, 1, 1, 1], 4, SMALL_CONFIG),
+        )
+
+
+def test_main(capsys):
+    assert main(["--bins", "4", "--pieces", "2"]) == 0
+    output = capsys.readouterr().out.splitlines()
+    assert len(output) == 4
+    assert output[0].startswith("always-minimum")
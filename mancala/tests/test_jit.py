@@ -0,0 +1,99 @@
+import pytest
+
+from mancala.batch import simulate_games
+from mancala.config import GameConfig
+from mancala.jit import BACKEND, STRATEGY_CODES, main, simulate_games_compiled
+from mancala.mancala import Player
+from mancala.strategy import get_simple_strategies
+
+SMALL_CONFIG = GameConfig(4, 3)
+DETERMINISTIC_STRATEGIES = [
+    name for name in STRATEGY_CODES if name != "random-selection"
+]
+
+
+@pytest.mark.parametrize("config", [SMALL_CONFIG, GameConfig(6, 4), GameConfig(3, 9)])
+def test_compiled_games_match_simulation_loop(config):
+    strategies = get_simple_strategies(config)
+    for player_one in DETERMINISTIC_STRATEGIES:
+        for player_two in DETERMINISTIC_STRATEGIES:
+            for starting_player in Player:
+                expected = list(
+                    simulate_games(
+                        strategies[player_one],
+                        strategies[player_two],
+                        1,
+                        starting_player=starting_player,
+                        config=config,
+                    )
+                )
+                assert expected == simulate_games_compiled(
+                    strategies[player_one],
+                    strategies[player_two],
+                    1,
+                    starting_player=starting_player,
+                    config=config,
+                )
+
+
+def test_compiled_random_games_are_reproducible():
+    strategies = get_simple_strategies(SMALL_CONFIG)
+    random_selection = strategies["random-selection"]
+
+    def _play(games, first_game=0, seed=3):
+        return simulate_games_compiled(
+            random_selection,
+            random_selection,
+            games,
+            seed=seed,
+            first_game=first_game,
+            config=SMALL_CONFIG,
+        )
+
+    results = _play(40)
+    assert results == _play(40)
+    assert results[10:] == _play(30, first_game=10)
+    assert results != _play(40, seed=4)
+    assert {result.starting_player for result in results} == set(Player)
+    assert {result.winning_player for result in results} >= {Player.ONE, Player.TWO}
+    for result in results:
+        assert result.player_one_goal + result.player_two_goal <= 24
+
+
+def test_compiled_games_reject_incorrect_arguments():
+    strategies = get_simple_strategies()
+    with pytest.raises(ValueError):
+        simulate_games_compiled(
+            strategies["always-minimum"],
+            strategies["always-maximum"],
+            1,
+            config=SMALL_CONFIG,
+        )
+    with pytest.raises(ValueError):
+        simulate_games_compiled(
+            strategies["always-minimum"], strategies["always-maximum"], 1, seed=-1
+        )
+    with pytest.raises(ValueError):
+        simulate_games_compiled(
+            strategies["always-minimum"], strategies["always-maximum"], 1, seed=2 ** 31
+        )
+
+
+def test_compiled_games_reject_other_strategies():
+    class _OtherStrategy(type(get_simple_strategies()["always-minimum"])):
+        @property
+        def strategy_name(self):
+            return "other"
+
+    other = _OtherStrategy()
+    with pytest.raises(ValueError):
+        simulate_games_compiled(other, other, 1)
+
+
+def test_main(capsys):
+    assert main(["--games", "20"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("simulation-loop ")
+    assert lines[1].startswith(f"compiled-{BACKEND} ")
+    with pytest.raises(SystemExit):
+        main(["--player-one", "no-such-strategy"])
@@ -0,0 +1,129 @@
+import pytest
+
+from mancala.config import GameConfig
+from mancala.ladder import (
+    INITIAL_DEVIATION,
+    INITIAL_RATING,
+    Rating,
+    RatingLadder,
+    main,
+    schedule_matchups,
+)
+from mancala.mancala import Player
+from mancala.simulation import GameResult
+from mancala.strategy import get_simple_strategies
+
+
+def _get_result(winning_player):
+    return GameResult(
+        winning_player=winning_player,
+        starting_player=Player.ONE,
+        plies=20,
+        player_one_goal=25,
+        player_two_goal=23,
+    )
+
+
+def test_rating_interval():
+    rating = Rating(rating=1600, deviation=100)
+    low, high = rating.interval
+    assert low == pytest.approx(1404)
+    assert high == pytest.approx(1796)
+
+
+def test_rating_ladder_requires_unique_names():
+    with pytest.raises(ValueError):
+        RatingLadder(["a", "a"])
+
+
+def test_rating_ladder_records_wins():
+    ladder = RatingLadder(["a", "b"])
+    assert len(ladder) == 2
+    assert ladder.expected_score("a", "b") == pytest.approx(0.5)
+    ladder.record("a", "b", _get_result(Player.ONE))
+
+    assert ladder["a"].rating > INITIAL_RATING > ladder["b"].rating
+    assert ladder["a"].rating - INITIAL_RATING == pytest.approx(
+        INITIAL_RATING - ladder["b"].rating
+    )
+    assert ladder["a"].deviation < INITIAL_DEVIATION
+    assert ladder["a"].games == ladder["b"].games == 1
+    assert ladder.expected_score("a", "b") > 0.5
+    assert ladder.expected_score("a", "b") + ladder.expected_score(
+        "b", "a"
+    ) == pytest.approx(1)
+    assert [name for name, _ in ladder.get_ranked()] == ["a", "b"]
+
+    ladder.record("a", "b", _get_result(Player.TWO))
+    ladder.record("b", "a", _get_result(Player.ONE))
+    assert [name for name, _ in ladder.get_ranked()] == ["b", "a"]
+
+
+def test_rating_ladder_records_ties():
+    ladder = RatingLadder(["a", "b"])
+    ladder.record("a", "b", _get_result(None))
+    assert ladder["a"].rating == ladder["b"].rating == INITIAL_RATING
+    assert ladder["a"].deviation < INITIAL_DEVIATION
+
+
+def test_expected_information_favours_uncertain_ratings():
+    ladder = RatingLadder(["a", "b", "c"])
+    for _ in range(10):
+        ladder.record("a", "b", _get_result(None))
+    assert ladder.expected_information("a", "c") > ladder.expected_information("a", "b")
+
+
+def test_schedule_matchups_plays_until_ratings_converge():
+    config = GameConfig(4, 3)
+    strategies = list(get_simple_strategies(config).values())[:3]
+    ladder = RatingLadder([s.strategy_name for s in strategies])
+    rounds = list(
+        schedule_matchups(
+            strategies, ladder, target_deviation=80, games_per_round=50, config=config
+        )
+    )
+    assert all(ladder[name].deviation <= 80 for name in ladder.names)
+    assert sum(ladder[name].games for name in ladder.names) == 2 * 50 * len(rounds)
+
+
+def test_schedule_matchups_stops_after_max_games():
+    config = GameConfig(4, 3)
+    strategies = list(get_simple_strategies(config).values())[:2]
+    ladder = RatingLadder([s.strategy_name for s in strategies])
+    rounds = list(
+        schedule_matchups(
+            strategies,
+            ladder,
+            target_deviation=0,
+            games_per_round=40,
+            max_games=100,
+            config=config,
+        )
+    )
+    assert len(rounds) == 3
+    assert ladder[rounds[0][0]].games == 100
+    # Seats alternate between rounds
+    assert rounds[1] == rounds[0][::-1]
+
+
+def test_schedule_matchups_rejects_incorrect_arguments():
+    strategies = list(get_simple_strategies().values())
+    ladder = RatingLadder([s.strategy_name for s in strategies])
+    with pytest.raises(ValueError):
+        next(schedule_matchups(strategies, ladder, games_per_round=0))
+    with pytest.raises(ValueError):
+        next(schedule_matchups(strategies[:2], ladder))
+    with pytest.raises(ValueError):
+        next(
+            schedule_matchups(
+                strategies[:1], RatingLadder([strategies[0].strategy_name])
+            )
+        )
+
+
+def test_main(capsys):
+    assert main(["--processes", "1", "--max-games", "200"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "Played 2 rounds"
+    assert len(lines) == 6
+    assert lines[1].startswith(" 1. ")
@@ -1,17 +1,29 @@
 import pytest
 
-from mancala.config import NUMBER_OF_BINS, NUMBER_OF_STARTING_PIECES
+from mancala.config import NUMBER_OF_BINS, NUMBER_OF_STARTING_PIECES, GameConfig
 from mancala.mancala import (
     Board,
     Player,
     PlayerRow,
     Turn,
+    debug_checks_enabled,
     get_new_board,
+    set_debug_checks,
+    sow,
     take_turn,
+    take_turn_trusted,
     who_gets_next_turn,
 )
 
 
+@pytest.fixture
+def debug_checks():
+    previously_enabled = debug_checks_enabled()
+    set_debug_checks(True)
+    yield
+    set_debug_checks(previously_enabled)
+
+
 @pytest.mark.parametrize("player", Player)
 def test_turn_selected_bin_must_exist_on_board(player):
     with pytest.raises(ValueError):
@@ -353,3 +365,204 @@ def test_who_gets_next_turn_returns_correct_player(player, opponent):
         }
     )
     assert who_gets_next_turn(prior_board, turn, new_board) == player
+
+
+@pytest.mark.parametrize("player", Player)
+def test_trusted_turn_skips_validation(player):
+    assert Turn.trusted(player, 3) == Turn(player, 3)
+    assert Turn.trusted(player, NUMBER_OF_BINS).selected_bin == NUMBER_OF_BINS
+
+
+def test_trusted_player_row_skips_validation():
+    assert PlayerRow.trusted([4, 4, 4, 4, 4, 4], 0) == PlayerRow.get_new_player_row()
+    assert PlayerRow.trusted([-1], -1).bins == [-1]
+
+
+@pytest.mark.parametrize("player", Player)
+def test_debug_checks_validate_trusted_construction(player, debug_checks):
+    assert debug_checks_enabled() is True
+    with pytest.raises(ValueError):
+        Turn.trusted(player, NUMBER_OF_BINS)
+    with pytest.raises(ValueError):
+        PlayerRow.trusted([-1 for _ in range(NUMBER_OF_BINS)], 0)
+
+
+@pytest.mark.parametrize("player", Player)
+def test_take_turn_validates_the_selected_bin(player, debug_checks):
+    turn = Turn.trusted(player, 0)
+    turn.selected_bin = NUMBER_OF_BINS
+    with pytest.raises(ValueError):
+        take_turn(get_new_board(), turn)
+    with pytest.raises(ValueError):
+        take_turn_trusted(get_new_board(), turn)
+
+
+@pytest.mark.parametrize("player", Player)
+@pytest.mark.parametrize("selected_bin", range(NUMBER_OF_BINS))
+def test_trusted_turn_matches_take_turn(player, selected_bin):
+    board = Board(
+        {
+            Player.ONE: PlayerRow(bins=[1, 10, 3, 1, 2, 14], goal=5),
+            Player.TWO: PlayerRow(bins=[1, 6, 1, 4, 2, 1], goal=0),
+        }
+    )
+    turn = Turn(player, selected_bin)
+    new_board = take_turn_trusted(board, Turn.trusted(player, selected_bin))
+    assert new_board == take_turn(board, turn)
+    assert list(new_board.keys()) == list(board.keys())
+
+
+def _sow_one_piece_at_a_time(player_bins, opponent_bins, selected_bin):
+    """Straightforward sowing used to check the closed-form `sow`."""
+    ring = (
+        [("player", i) for i in reversed(range(len(player_bins)))]
+        + [("goal", None)]
+        + [("opponent", i) for i in reversed(range(len(opponent_bins)))]
+    )
+    rows = {"player": player_bins, "opponent": opponent_bins}
+    position = ring.index(("player", selected_bin))
+    pieces = player_bins[selected_bin]
+    player_bins[selected_bin] = 0
+    goal_pieces = 0
+    for _ in range(pieces):
+        position = (position + 1) % len(ring)
+        row, bin_index = ring[position]
+        if row == "goal":
+            goal_pieces += 1
+        else:
+            rows[row][bin_index] += 1
+    row, bin_index = ring[position]
+    return goal_pieces, (bin_index if row == "player" else None)
+
+
+@pytest.mark.parametrize("selected_bin", range(NUMBER_OF_BINS))
+@pytest.mark.parametrize("pieces", [1, 5, 13, 14, 20, 26, 27, 40, 53, 97, 300])
+def test_sow_matches_sowing_one_piece_at_a_time(selected_bin, pieces):
+    player_bins = [3, 0, 1, 0, 2, 7]
+    player_bins[selected_bin] = pieces
+    opponent_bins = [0, 4, 1, 0, 9, 2]
+
+    expected_player_bins = list(player_bins)
+    expected_opponent_bins = list(opponent_bins)
+    expected = _sow_one_piece_at_a_time(
+        expected_player_bins, expected_opponent_bins, selected_bin
+    )
+
+    assert sow(player_bins, opponent_bins, selected_bin) == expected
+    assert player_bins == expected_player_bins
+    assert opponent_bins == expected_opponent_bins
+
+
+def test_sow_supports_other_row_lengths():
+    player_bins = [1, 0, 30, 2]
+    opponent_bins = [0, 0, 0, 0]
+    assert sow(player_bins, opponent_bins, 2, GameConfig(number_of_bins=4)) == (
+        4,
+        None,
+    )
+    assert player_bins == [5, 4, 3, 5]
+    assert opponent_bins == [3, 3, 3, 3]
+
+
+@pytest.mark.parametrize(
+    "player,opponent", [(Player.ONE, Player.TWO), (Player.TWO, Player.ONE)]
+)
+def test_many_lap_turn_keeps_every_piece(player, opponent):
+    # Three full laps and then three more pieces, the last ending in the goal
+    turn = Turn(player, 2)
+    board = Board(
+        {
+            player: PlayerRow(bins=[0, 0, 42, 0, 0, 0], goal=1),
+            opponent: PlayerRow(bins=[0, 0, 1, 0, 0, 0], goal=5),
+        }
+    )
+
+    new_board = take_turn(board, turn)
+
+    assert new_board[player] == PlayerRow(bins=[4, 4, 3, 3, 3, 3], goal=5)
+    assert new_board[opponent] == PlayerRow(bins=[3, 3, 4, 3, 3, 3], goal=5)
+    assert who_gets_next_turn(board, turn, new_board) == player
+
+
+@pytest.mark.parametrize(
+    "player,opponent", [(Player.ONE, Player.TWO), (Player.TWO, Player.ONE)]
+)
+def test_full_lap_turn_steals_with_last_piece_in_emptied_bin(player, opponent):
+    turn = Turn(player, 2)
+    board = Board(
+        {
+            player: PlayerRow(bins=[0, 0, 13, 0, 0, 0], goal=1),
+            opponent: PlayerRow(bins=[0, 0, 1, 0, 0, 0], goal=5),
+        }
+    )
+
+    new_board = take_turn(board, turn)
+
+    assert new_board[player] == PlayerRow(bins=[1, 1, 0, 1, 1, 1], goal=5)
+    assert new_board[opponent] == PlayerRow(bins=[1, 1, 0, 1, 1, 1], goal=5)
+    assert who_gets_next_turn(board, turn, new_board) == opponent
+
+
+@pytest.mark.parametrize(
+    "player,opponent", [(Player.ONE, Player.TWO), (Player.TWO, Player.ONE)]
+)
+@pytest.mark.parametrize("laps", [0, 1, 2, 5])
+def test_who_gets_next_turn_after_any_number_of_laps(player, opponent, laps):
+    for selected_bin in range(NUMBER_OF_BINS):
+        lap_pieces = laps * (2 * NUMBER_OF_BINS + 1)
+        board = Board(
+            {
+                player: PlayerRow(bins=[1, 1, 1, 1, 1, 1], goal=0),
+                opponent: PlayerRow.get_new_player_row(),
+            }
+        )
+        board[player].bins[selected_bin] = lap_pieces + selected_bin + 1
+        turn = Turn(player, selected_bin)
+        assert who_gets_next_turn(board, turn, take_turn(board, turn)) == player
+
+        # One more piece ends in the opponent's row instead of the goal
+        board[player].bins[selected_bin] += 1
+        assert who_gets_next_turn(board, turn, take_turn(board, turn)) == opponent
+
+
+@pytest.mark.parametrize("player", Player)
+def test_take_turn_requires_pieces_in_selected_bin(player, debug_checks):
+    board = Board(
+        {
+            Player.ONE: PlayerRow(bins=[0, 1, 1, 1, 1, 1], goal=0),
+            Player.TWO: PlayerRow(bins=[0, 1, 1, 1, 1, 1], goal=0),
+        }
+    )
+    with pytest.raises(ValueError):
+        take_turn(board, Turn(player, 0))
+    with pytest.raises(ValueError):
+        take_turn_trusted(board, Turn(player, 0))
+
+
+@pytest.mark.parametrize("number_of_bins", range(4, 9))
+def test_game_config_sets_board_geometry(number_of_bins):
+    config = GameConfig(number_of_bins, 3)
+    new_board = get_new_board(config)
+    assert new_board[Player.ONE] == PlayerRow.get_new_player_row(config)
+    assert new_board[Player.ONE].bins == [3 for _ in range(number_of_bins)]
+
+    with pytest.raises(ValueError):
+        PlayerRow(bins=[3 for _ in range(number_of_bins + 1)], goal=0, config=config)
+    with pytest.raises(ValueError):
+        Turn(Player.ONE, number_of_bins, config)
+
+    # Three pieces from bin two end in the goal for every row length
+    turn = Turn(Player.ONE, 2, config)
+    prior_board = new_board
+    new_board = take_turn(prior_board, turn, config)
+    assert new_board[Player.ONE].bins[2] == 0
+    assert new_board[Player.ONE].goal == 1
+    assert who_gets_next_turn(prior_board, turn, new_board, config) == Player.ONE
+    assert sum(new_board[Player.ONE].bins) + sum(new_board[Player.TWO].bins) == (
+        config.total_pieces - 1
+    )
+
+
+def test_player_rows_of_different_lengths_are_not_equal():
+    config = GameConfig(number_of_bins=4)
+    assert PlayerRow([1, 1, 1, 1], 0, config) != PlayerRow([1, 1, 1, 1, 1, 1], 0)
@@ -0,0 +1,204 @@
+import asyncio
+import sys
+from functools import partial
+
+import pytest
+
+from mancala.config import GameConfig
+from mancala.match_server import (
+    BotConnection,
+    BotPool,
+    main,
+    play_match,
+    run_matches,
+)
+from mancala.mancala import Player
+from mancala.simulation import SimulationLoop
+from mancala.strategy import (
+    AlwaysMaximumPlayerStrategy,
+    AlwaysMinimumPlayerStrategy,
+    EvenGoalStealAndPiecesOnOtherSideStrategy,
+    get_simple_strategies,
+)
+from mancala.stub_bot import serve_connection
+
+STUB_BOT = [sys.executable, "-m", "mancala.stub_bot"]
+
+
+def _simulate(player_one, player_two, starting_player):
+    loop = SimulationLoop(
+        player_one,
+        player_two,
+        starting_player=starting_player,
+        config=player_one.config,
+    )
+    loop.run()
+    return loop.get_result()
+
+
+def test_run_matches_plays_like_the_simulation_loop():
+    player_one = AlwaysMinimumPlayerStrategy()
+    player_two = EvenGoalStealAndPiecesOnOtherSideStrategy()
+    results = asyncio.run(run_matches(player_one, player_two, 10, seed=1))
+    assert {r.game.starting_player for r in results} == set(Player)
+    for result in results:
+        assert result.forfeited_by is None
+        assert result.game == _simulate(
+            player_one, player_two, result.game.starting_player
+        )
+
+
+def test_run_matches_ends_games_when_the_player_cannot_move():
+    # Player.ONE scores their only piece and is left without a move
+    config = GameConfig(1, 1)
+    strategy = AlwaysMinimumPlayerStrategy(config)
+    [result] = asyncio.run(
+        run_matches(strategy, strategy, 1, starting_player=Player.ONE, config=config)
+    )
+    assert result.game.winning_player is None
+    assert (result.game.player_one_goal, result.game.player_two_goal) == (1, 1)
+    assert result.game == _simulate(strategy, strategy, Player.ONE)
+
+
+def test_run_matches_against_bot_processes(importable_package):
+    async def _run():
+        pool = await BotPool.spawn(STUB_BOT + ["--strategy", "always-minimum"], bots=2)
+        try:
+            assert (
+                pool.strategy_name == " ".join(STUB_BOT) + " --strategy always-minimum"
+            )
+            results = await run_matches(
+                pool, AlwaysMaximumPlayerStrategy(), 20, move_timeout=10, seed=0
+            )
+            # Decisions from every game were spread over both bots
+            assert all(c._next_request_id > 0 for c in pool.connections)
+            return results
+        finally:
+            await pool.close()
+
+    for result in asyncio.run(_run()):
+        assert result.forfeited_by is None
+        assert result.game == _simulate(
+            AlwaysMinimumPlayerStrategy(),
+            AlwaysMaximumPlayerStrategy(),
+            result.game.starting_player,
+        )
+
+
+def test_bots_forfeit_when_they_time_out(importable_package):
+    async def _run():
+        pool = await BotPool.spawn(STUB_BOT + ["--delay", "5"])
+        try:
+            return await run_matches(
+                AlwaysMinimumPlayerStrategy(),
+                pool,
+                3,
+                starting_player=Player.TWO,
+                move_timeout=0.05,
+            )
+        finally:
+            pool.connections[0]._process.kill()
+            await pool.close()
+
+    for result in asyncio.run(_run()):
+        assert result.forfeited_by == Player.TWO
+        assert result.game.winning_player == Player.ONE
+        assert result.game.plies == 0
+
+
+async def _serve(handler):
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_run_matches_against_a_bot_over_a_socket():
+    strategy = get_simple_strategies()["even-goal-or-more-pieces-to-opponent"]
+
+    async def _run():
+        server, port = await _serve(partial(serve_connection, strategy))
+        pool = BotPool([await BotConnection.connect("127.0.0.1", port)], "socket")
+        try:
+            return await run_matches(
+                AlwaysMinimumPlayerStrategy(), pool, 5, concurrency=2, seed=3
+            )
+        finally:
+            await pool.close()
+            server.close()
+            await server.wait_closed()
+
+    for result in asyncio.run(_run()):
+        assert result.game == _simulate(
+            AlwaysMinimumPlayerStrategy(), strategy, result.game.starting_player
+        )
+
+
+@pytest.mark.parametrize(
+    "answers",
+    [
+        # An unknown request and a line without an id are ignored
+        [b"99 1\n", b"hello\n", b"0 x\n"],
+        # Bin 6 does not exist
+        [b"0 6\n"],
+        # The bot leaves mid-game
+        [],
+    ],
+)
+def test_bots_forfeit_on_incorrect_answers(answers):
+    async def _handle(reader, writer):
+        await reader.readline()
+        for line in answers:
+            writer.write(line)
+        await writer.drain()
+        writer.close()
+
+    async def _run():
+        server, port = await _serve(_handle)
+        connection = await BotConnection.connect("127.0.0.1", port)
+        pool = BotPool([connection], "bad-bot")
+        try:
+            first = await play_match(
+                {Player.ONE: pool, Player.TWO: AlwaysMinimumPlayerStrategy()},
+                Player.ONE,
+            )
+            # The connection is gone by now
+            await asyncio.sleep(0.01)
+            second = await play_match(
+                {Player.ONE: pool, Player.TWO: AlwaysMinimumPlayerStrategy()},
+                Player.ONE,
+            )
+            assert connection.outstanding == 0
+            return first, second
+        finally:
+            await pool.close()
+            server.close()
+            await server.wait_closed()
+
+    for result in asyncio.run(_run()):
+        assert result.forfeited_by == Player.ONE
+        assert result.game.winning_player == Player.TWO
+
+
+def test_run_matches_rejects_incorrect_arguments():
+    strategy = AlwaysMinimumPlayerStrategy()
+    with pytest.raises(ValueError):
+        asyncio.run(run_matches(strategy, strategy, 1, concurrency=0))
+    with pytest.raises(ValueError):
+        asyncio.run(
+            run_matches(strategy, AlwaysMinimumPlayerStrategy(GameConfig(4, 3)), 1)
+        )
+    with pytest.raises(ValueError):
+        BotPool([], "nobody")
+
+
+def test_main(capsys, importable_package):
+    argv = [
+        " ".join(STUB_BOT + ["--strategy", "always-maximum"]),
+        "always-minimum",
+        "--games",
+        "6",
+    ]
+    assert main(argv) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].endswith("0 forfeits")
+    assert lines[1].startswith("always-minimum: ")
+    assert lines[2].startswith("ties: ")
@@ -0,0 +1,185 @@
+import random
+from itertools import product
+
+import pytest
+
+from mancala.config import GameConfig
+from mancala.mancala import (
+    Player,
+    Turn,
+    get_new_board,
+    take_turn,
+    who_gets_next_turn,
+)
+from mancala.position import (
+    apply_move,
+    board_to_position,
+    count_positions,
+    decode_position,
+    encode_position,
+    ensure_keys_fit_in_64_bits,
+    get_canonical_key,
+    get_canonical_position,
+    get_new_position,
+    get_row_offset,
+    get_successors,
+    get_successors_batch,
+    is_game_over,
+    position_to_board,
+    rank_position,
+    restore_position,
+    unrank_position,
+)
+
+
+def test_board_to_position_round_trip():
+    board = get_new_board()
+    position = board_to_position(board)
+    assert position == get_new_position()
+    assert position == (4, 4, 4, 4, 4, 4, 0, 4, 4, 4, 4, 4, 4, 0)
+    assert position_to_board(position) == board
+
+    config = GameConfig(4, 3)
+    board = get_new_board(config)
+    assert board_to_position(board) == get_new_position(config)
+    assert position_to_board(get_new_position(config), config) == board
+
+
+def test_get_row_offset():
+    assert get_row_offset(Player.ONE) == 0
+    assert get_row_offset(Player.TWO) == 7
+    assert get_row_offset(Player.TWO, GameConfig(4, 3)) == 5
+
+
+def test_count_positions():
+    assert count_positions() == 6_566_222_272_575
+    assert count_positions().bit_length() == 43
+    # One piece per player spread over six slots
+    assert count_positions(GameConfig(2, 1)) == 6 * 7 * 8 * 9 // 24
+
+
+def test_ensure_keys_fit_in_64_bits():
+    ensure_keys_fit_in_64_bits()
+    ensure_keys_fit_in_64_bits(GameConfig(8, 5))
+    with pytest.raises(ValueError):
+        ensure_keys_fit_in_64_bits(GameConfig(8, 6))
+
+
+def test_rank_position_is_a_bijection_on_small_config():
+    config = GameConfig(2, 1)
+    slots = 2 * (config.number_of_bins + 1)
+    positions = [
+        p for p in product(range(5), repeat=slots) if sum(p) == config.total_pieces
+    ]
+    assert len(positions) == count_positions(config)
+    # Ranks follow the lexicographic order of positions
+    assert [rank_position(p, config) for p in positions] == list(range(len(positions)))
+    assert [unrank_position(r, config) for r in range(len(positions))] == positions
+
+
+def test_rank_position_round_trip_on_default_config():
+    rng = random.Random(0)
+    assert rank_position((0,) * 13 + (48,)) == 0
+    assert rank_position((48,) + (0,) * 13) == count_positions() - 1
+    for _ in range(200):
+        cuts = sorted(rng.randint(0, 48) for _ in range(13))
+        position = tuple(b - a for a, b in zip([0] + cuts, cuts + [48]))
+        assert unrank_position(rank_position(position)) == position
+
+
+def test_encode_position_round_trip():
+    position = get_new_position()
+    for player in Player:
+        key = encode_position(position, player)
+        assert key % 2 == player.value
+        assert decode_position(key) == (position, player)
+
+
+def test_canonical_position_puts_the_player_to_move_first():
+    config = GameConfig(3, 2)
+    position = (1, 0, 2, 3, 0, 4, 1, 1)
+    assert get_canonical_position(position, Player.ONE, config) == (position, False)
+    mirror = (0, 4, 1, 1, 1, 0, 2, 3)
+    assert get_canonical_position(position, Player.TWO, config) == (mirror, True)
+    for player in Player:
+        canonical, swapped = get_canonical_position(position, player, config)
+        assert restore_position(canonical, swapped, config) == (position, player)
+    assert get_canonical_key(position, Player.TWO, config) == get_canonical_key(
+        mirror, Player.ONE, config
+    )
+
+
+def test_apply_move_matches_take_turn():
+    rng = random.Random(0)
+    for _ in range(500):
+        position = get_new_position()
+        player = rng.choice(list(Player))
+        while not is_game_over(position, player):
+            offset = get_row_offset(player)
+            selected_bin = rng.choice([b for b in range(6) if position[offset + b]])
+            board = position_to_board(position)
+            turn = Turn(player, selected_bin)
+            new_board = take_turn(board, turn)
+            expected = (
+                board_to_position(new_board),
+                who_gets_next_turn(board, turn, new_board),
+            )
+            position, player = apply_move(position, player, selected_bin)
+            assert (position, player) == expected
+
+
+def test_get_successors_matches_apply_move():
+    rng = random.Random(1)
+    parents = []
+    for _ in range(200):
+        position = get_new_position()
+        player = rng.choice(list(Player))
+        while not is_game_over(position, player):
+            parents.append((position, player))
+            offset = get_row_offset(player)
+            successors = get_successors(position, player)
+            legal_bins = [b for b in range(6) if position[offset + b]]
+            assert [s[0] for s in successors] == legal_bins
+            for selected_bin, child, next_player, _ in successors:
+                assert (child, next_player) == apply_move(
+                    position, player, selected_bin
+                )
+            position, player = successors[rng.randrange(len(successors))][1:3]
+
+    assert get_successors_batch(parents[:50]) == [
+        get_successors(position, player) for position, player in parents[:50]
+    ]
+
+
+def test_get_successors_reports_captures():
+    config = GameConfig(3, 2)
+    position = (0, 1, 2, 1, 3, 0, 0, 0)
+    assert get_successors(position, Player.ONE, config) == [
+        (1, (0, 0, 2, 5, 0, 0, 0, 0), Player.TWO, 3),
+        (2, (0, 2, 0, 5, 0, 0, 0, 0), Player.TWO, 3),
+    ]
+    assert get_successors(position, Player.TWO, config) == [
+        (0, (0, 2, 3, 1, 0, 0, 0, 1), Player.ONE, 0)
+    ]
+
+
+def test_apply_move_does_not_change_position():
+    position = get_new_position()
+    child, next_player = apply_move(position, Player.ONE, 3)
+    assert position == get_new_position()
+    assert child == (5, 5, 5, 0, 4, 4, 1, 4, 4, 4, 4, 4, 4, 0)
+    assert next_player == Player.ONE
+
+
+@pytest.mark.parametrize(
+    "position,player,expected",
+    [
+        ((4, 4, 4, 4, 4, 4, 0, 4, 4, 4, 4, 4, 4, 0), Player.ONE, False),
+        ((0, 0, 0, 0, 0, 0, 20, 4, 4, 4, 4, 4, 4, 4), Player.ONE, True),
+        ((0, 0, 0, 0, 0, 0, 20, 4, 4, 4, 4, 4, 4, 4), Player.TWO, False),
+        ((1, 0, 0, 0, 0, 0, 25, 0, 0, 0, 0, 0, 1, 21), Player.ONE, True),
+        ((1, 0, 0, 0, 0, 0, 21, 0, 0, 0, 0, 0, 1, 25), Player.TWO, True),
+    ],
+)
+def test_is_game_over(position, player, expected):
+    assert is_game_over(position, player) == expected
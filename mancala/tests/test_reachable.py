@@ -0,0 +1,164 @@
+import os
+
+import pytest
+
+from mancala.config import GameConfig
+from mancala.mancala import Player
+from mancala.position import (
+    apply_move,
+    decode_position,
+    get_new_position,
+    get_row_offset,
+    is_game_over,
+)
+from mancala.reachable import (
+    CompactKeySet,
+    enumerate_reachable_positions,
+    main,
+    read_keys,
+)
+
+SMALL_CONFIG = GameConfig(3, 2)
+
+
+def _get_reachable_layers(config, max_depth=None):
+    """Plain breadth-first search keeping every position in a set."""
+    layer = {(get_new_position(config), p) for p in Player}
+    seen = set(layer)
+    layers = []
+    while layer:
+        layers.append(layer)
+        if max_depth is not None and len(layers) > max_depth:
+            break
+        next_layer = set()
+        for position, player in layer:
+            if is_game_over(position, player, config):
+                continue
+            offset = get_row_offset(player, config)
+            for selected_bin in range(config.number_of_bins):
+                if position[offset + selected_bin]:
+                    next_layer.add(apply_move(position, player, selected_bin, config))
+        layer = next_layer - seen
+        seen |= layer
+    return layers
+
+
+def test_compact_key_set():
+    keys = CompactKeySet(capacity=4)
+    assert len(keys) == 0
+    assert keys.add(0)
+    assert keys.add(2 ** 44)
+    assert not keys.add(0)
+    for key in range(100, 1100, 7):
+        keys.add(key)
+    assert len(keys) == 2 + len(range(100, 1100, 7))
+    assert 0 in keys
+    assert 2 ** 44 in keys
+    assert 107 in keys
+    assert 108 not in keys
+    assert "0" not in keys
+    assert list(keys.sorted_keys()) == [0, *range(100, 1100, 7), 2 ** 44]
+    assert sorted(keys) == list(keys.sorted_keys())
+
+    keys.clear()
+    assert len(keys) == 0
+    assert 0 not in keys
+    assert list(keys) == []
+
+
+@pytest.mark.parametrize("memory_limit", [1_000_000, 50])
+@pytest.mark.parametrize("processes", [1, 2])
+def test_enumerate_reachable_positions_matches_set_search(memory_limit, processes):
+    layers = _get_reachable_layers(SMALL_CONFIG)
+    counts = list(
+        enumerate_reachable_positions(
+            SMALL_CONFIG, processes=processes, memory_limit=memory_limit
+        )
+    )
+    assert [c.depth for c in counts] == list(range(len(layers)))
+    assert [c.positions for c in counts] == [len(layer) for layer in layers]
+    assert [c.terminal_positions for c in counts] == [
+        sum(is_game_over(pos, p, SMALL_CONFIG) for pos, p in layer) for layer in layers
+    ]
+    for count in counts:
+        assert sum(count.positions_by_pieces_in_bins.values()) == count.positions
+        assert count.path is None
+
+
+def test_enumerate_reachable_positions_by_pieces_in_bins():
+    first, second = enumerate_reachable_positions(max_depth=1)
+    assert first.positions == 2
+    assert first.terminal_positions == 0
+    assert first.positions_by_pieces_in_bins == {48: 2}
+    # Six moves for each player, of which bins 0 to 3 sow into the goal
+    assert second.positions == 12
+    assert second.positions_by_pieces_in_bins == {47: 8, 48: 4}
+
+
+def test_enumerate_reachable_positions_max_depth():
+    layers = _get_reachable_layers(SMALL_CONFIG, max_depth=3)
+    counts = list(enumerate_reachable_positions(SMALL_CONFIG, max_depth=3))
+    assert [c.positions for c in counts] == [len(layer) for layer in layers]
+    assert len(counts) == 4
+
+
+def test_enumerate_reachable_positions_dump_states(tmp_path, monkeypatch):
+    # Write and read the layer files a few keys at a time
+    monkeypatch.setattr("mancala.reachable._READ_CHUNK_KEYS", 16)
+    layers = _get_reachable_layers(SMALL_CONFIG, max_depth=4)
+    counts = list(
+        enumerate_reachable_positions(
+            SMALL_CONFIG, max_depth=4, work_dir=str(tmp_path), dump_states=True
+        )
+    )
+    for count, layer in zip(counts, layers):
+        keys = list(read_keys(count.path))
+        assert keys == sorted(keys)
+        assert {decode_position(k, SMALL_CONFIG) for k in keys} == layer
+    assert sorted(os.listdir(tmp_path)) == [f"depth-{d}.keys" for d in range(5)]
+
+    middle = list(read_keys(counts[3].path, 1, 3))
+    assert middle == list(read_keys(counts[3].path))[1:3]
+
+
+def test_enumerate_reachable_positions_cleans_up_work_dir(tmp_path):
+    list(enumerate_reachable_positions(SMALL_CONFIG, work_dir=str(tmp_path)))
+    assert os.listdir(tmp_path) == []
+
+
+def test_enumerate_reachable_positions_starting_player():
+    counts = list(
+        enumerate_reachable_positions(
+            SMALL_CONFIG, max_depth=0, starting_players=[Player.TWO]
+        )
+    )
+    assert [c.positions for c in counts] == [1]
+
+
+def test_enumerate_reachable_positions_requires_positive_memory_limit():
+    with pytest.raises(ValueError):
+        next(enumerate_reachable_positions(memory_limit=0))
+
+
+def test_enumerate_reachable_positions_rejects_keys_over_64_bits():
+    with pytest.raises(ValueError):
+        next(enumerate_reachable_positions(GameConfig(8, 6), max_depth=2))
+    assert (
+        next(enumerate_reachable_positions(GameConfig(8, 5), max_depth=0)).positions
+        == 2
+    )
+
+
+def test_main(capsys, tmp_path):
+    argv = ["--bins", "3", "--pieces", "2", "--processes", "1"]
+    assert main(argv + ["--max-depth", "2"]) == 0
+    output = capsys.readouterr().out.splitlines()
+    assert len(output) == 6
+    assert output[0].startswith("depth   0:            2 positions")
+    assert "by pieces in bins: {12: 2}" in output[1]
+
+    assert (
+        main(argv + ["--max-depth", "0", "--work-dir", str(tmp_path), "--dump-states"])
+        == 0
+    )
+    assert f"states in {tmp_path}" in capsys.readouterr().out
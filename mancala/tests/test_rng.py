@@ -0,0 +1,44 @@
+import random
+import threading
+
+from mancala.rng import get_rng, set_thread_rng, use_thread_rng
+
+
+def test_threads_share_the_global_generator_by_default():
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+    assert get_rng().random() == expected
+
+
+def test_threads_can_have_generators_of_their_own():
+    draws = {}
+
+    def _draw(name):
+        set_thread_rng(random.Random(1))
+        try:
+            draws[name] = [get_rng().random() for _ in range(3)]
+        finally:
+            set_thread_rng(None)
+
+    threads = [threading.Thread(target=_draw, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    rng = random.Random(1)
+    assert draws[0] == draws[1] == [rng.random() for _ in range(3)]
+    # The calling thread still shares the global generator
+    assert get_rng() is random
+
+
+def test_use_thread_rng_restores_the_previous_generator():
+    rng = random.Random(1)
+    with use_thread_rng(rng) as used:
+        assert used is rng
+        assert get_rng() is rng
+        other = random.Random(2)
+        with use_thread_rng(other):
+            assert get_rng() is other
+        assert get_rng() is rng
+    assert get_rng() is random
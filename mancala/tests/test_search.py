@@ -0,0 +1,274 @@
+import random
+import struct
+
+import pytest
+
+from mancala.config import GameConfig
+from mancala.mancala import Player
+from mancala.position import (
+    apply_move,
+    get_final_margin,
+    get_new_position,
+    get_row_offset,
+)
+from mancala.search import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    AlphaBetaSearch,
+    ParallelAlphaBetaSearch,
+    SharedTranspositionTable,
+    TranspositionTable,
+    evaluate,
+)
+
+SMALL_CONFIG = GameConfig(4, 3)
+
+
+def _minimax(position, player, depth, config):
+    """Plain negamax without pruning or a table."""
+    if depth == 0 or get_final_margin(position, player, config) is not None:
+        return evaluate(position, player, config)
+    offset = get_row_offset(player, config)
+    scores = []
+    for selected_bin in range(config.number_of_bins):
+        if position[offset + selected_bin] == 0:
+            continue
+        child, next_player = apply_move(position, player, selected_bin, config)
+        score = _minimax(child, next_player, depth - 1, config)
+        scores.append(score if next_player == player else -score)
+    return max(scores)
+
+
+def _get_random_positions(config, count, seed=0):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        position = get_new_position(config)
+        player = rng.choice(list(Player))
+        moves = rng.randint(0, 20)
+        while moves > 0 and get_final_margin(position, player, config) is None:
+            moves -= 1
+            offset = get_row_offset(player, config)
+            selected_bin = rng.choice(
+                [b for b in range(config.number_of_bins) if position[offset + b]]
+            )
+            position, player = apply_move(position, player, selected_bin, config)
+        if get_final_margin(position, player, config) is None:
+            positions.append((position, player))
+    return positions
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3, 5])
+def test_search_matches_minimax(depth):
+    search = AlphaBetaSearch(SMALL_CONFIG)
+    for position, player in _get_random_positions(SMALL_CONFIG, 30):
+        result = search.search(position, player, depth)
+        assert result.score == _minimax(position, player, depth, SMALL_CONFIG)
+        assert result.depth == depth
+        assert result.nodes > 0
+
+        # The best move scores the same as the position
+        child, next_player = apply_move(position, player, result.best_bin, SMALL_CONFIG)
+        child_score = _minimax(child, next_player, depth - 1, SMALL_CONFIG)
+        if next_player != player:
+            child_score = -child_score
+        assert child_score == result.score
+
+
+def test_search_from_opening():
+    search = AlphaBetaSearch()
+    result = search.search(get_new_position(), Player.ONE, 8)
+    # Bin 3 ends in the goal, earning another turn
+    assert result.best_bin == 3
+    assert result.score == 2
+    assert len(search.table) > 0
+
+
+def test_search_rejects_incorrect_arguments():
+    search = AlphaBetaSearch()
+    with pytest.raises(ValueError):
+        search.search(get_new_position(), Player.ONE, 0)
+    over = (0, 0, 0, 0, 0, 0, 25, 4, 4, 4, 4, 4, 3, 0)
+    with pytest.raises(ValueError):
+        search.search(over, Player.TWO, 4)
+
+
+def test_evaluate():
+    position = (0, 1, 0, 0, 0, 0, 10, 2, 0, 0, 0, 0, 0, 35)
+    assert evaluate(position, Player.ONE) == -25
+    assert evaluate(position, Player.TWO) == 25
+    position = (0, 1, 0, 0, 0, 0, 20, 2, 0, 0, 0, 0, 0, 25)
+    assert evaluate(position, Player.ONE) == -5
+    position = (0, 0, 0, 0, 0, 0, 20, 2, 0, 1, 0, 0, 0, 25)
+    assert evaluate(position, Player.ONE) == -5
+    position = (0, 0, 0, 0, 0, 0, 22, 2, 0, 1, 0, 0, 0, 23)
+    # Player.TWO keeps the pieces on their side
+    assert evaluate(position, Player.ONE) == -4
+    assert evaluate(position, Player.TWO) == 1
+
+
+def test_transposition_table_keeps_deeper_entries():
+    table = TranspositionTable()
+    assert table.probe(1) is None
+    table.store(1, 4, EXACT, 3, 2)
+    table.store(1, 2, EXACT, 5, 0)
+    assert table.probe(1) == (4, EXACT, 3, 2)
+    table.store(1, 6, EXACT, 1, 1)
+    assert table.probe(1) == (6, EXACT, 1, 1)
+    assert len(table) == 1
+    table.clear()
+    assert len(table) == 0
+
+
+def test_search_shares_a_table():
+    table = TranspositionTable()
+    first = AlphaBetaSearch(SMALL_CONFIG, table)
+    position = get_new_position(SMALL_CONFIG)
+    result = first.search(position, Player.ONE, 6)
+    assert first.table is table
+
+    second = AlphaBetaSearch(SMALL_CONFIG, table)
+    assert second.search(position, Player.ONE, 6) == (
+        type(result)(result.best_bin, result.score, 6, second.nodes)
+    )
+    assert second.nodes < result.nodes
+
+
+def test_search_cuts_off_on_deeper_table_entries():
+    search = AlphaBetaSearch(SMALL_CONFIG)
+    position = get_new_position(SMALL_CONFIG)
+    result = search.search(position, Player.ONE, 6)
+    search.nodes = 0
+    window = SMALL_CONFIG.total_pieces + 1
+    assert search.negamax(position, Player.ONE, 4, -window, window) == result.score
+    assert search.nodes == 1
+
+
+def test_search_shares_table_entries_with_the_mirror_image():
+    search = AlphaBetaSearch(SMALL_CONFIG)
+    position, player = _get_random_positions(SMALL_CONFIG, 1, seed=3)[0]
+    result = search.search(position, player, 5)
+
+    offset = get_row_offset(Player.TWO, SMALL_CONFIG)
+    mirror = (*position[offset:], *position[:offset])
+    other_player = Player.ONE if player == Player.TWO else Player.TWO
+    mirror_result = search.search(mirror, other_player, 5)
+    assert (mirror_result.best_bin, mirror_result.score) == (
+        result.best_bin,
+        result.score,
+    )
+    assert mirror_result.nodes < result.nodes
+
+
+def test_shared_transposition_table_round_trips_entries():
+    with SharedTranspositionTable(16) as table:
+        assert table.slots == 16
+        assert len(table) == 0
+        assert table.probe(0) is None
+        table.store(0, 3, LOWER_BOUND, -7, 2)
+        table.store(2 ** 44, 12, UPPER_BOUND, 49, 5)
+        assert table.probe(0) == (3, LOWER_BOUND, -7, 2)
+        assert table.probe(2 ** 44) == (12, UPPER_BOUND, 49, 5)
+        assert len(table) == 2
+
+        # Shallower results for the same position do not replace deeper ones
+        table.store(0, 2, EXACT, 1, 0)
+        assert table.probe(0) == (3, LOWER_BOUND, -7, 2)
+        table.store(0, 3, EXACT, 1, 0)
+        assert table.probe(0) == (3, EXACT, 1, 0)
+
+        table.clear()
+        assert len(table) == 0
+        assert table.probe(0) is None
+
+
+def test_shared_transposition_table_verifies_keys():
+    with SharedTranspositionTable(1) as table:
+        table.store(5, 4, EXACT, 1, 1)
+        assert table.probe(6) is None
+        table.store(6, 1, EXACT, 2, 2)
+        assert table.probe(5) is None
+        assert table.probe(6) == (1, EXACT, 2, 2)
+
+        # A slot torn by a concurrent write no longer matches its key
+        struct.pack_into("<Q", table._buffer, 8, 12345 | (1 << 63))
+        assert table.probe(6) is None
+
+
+def test_shared_transposition_table_is_shared_by_name():
+    with SharedTranspositionTable(64) as table:
+        attached = SharedTranspositionTable.attach(table.name, 64)
+        attached.store(42, 6, EXACT, -3, 1)
+        attached.close()
+        assert table.probe(42) == (6, EXACT, -3, 1)
+
+
+def test_shared_transposition_table_takes_keys_over_64_bits():
+    with SharedTranspositionTable(64) as table:
+        table.store(2 ** 70 + 3, 5, EXACT, 4, 1)
+        table.store(3, 2, EXACT, -1, 0)
+        assert table.probe(2 ** 70 + 3) == (5, EXACT, 4, 1)
+        assert table.probe(3) == (2, EXACT, -1, 0)
+        assert table.probe(2 ** 70) is None
+
+
+def test_parallel_search_on_boards_with_keys_over_64_bits():
+    config = GameConfig(8, 6)
+    position = get_new_position(config)
+    with ParallelAlphaBetaSearch(1, config, table_slots=1024) as search:
+        result = search.search(position, Player.ONE, 3)
+        assert len(search.table) > 0
+    assert result.score == _minimax(position, Player.ONE, 3, config)
+
+
+@pytest.mark.parametrize("slots", [0, 3])
+def test_shared_transposition_table_requires_power_of_two_slots(slots):
+    with pytest.raises(ValueError):
+        SharedTranspositionTable(slots)
+
+
+def test_search_with_shared_table_matches_minimax():
+    with SharedTranspositionTable(256) as table:
+        search = AlphaBetaSearch(SMALL_CONFIG, table)
+        for position, player in _get_random_positions(SMALL_CONFIG, 20, seed=1):
+            result = search.search(position, player, 4)
+            assert result.score == _minimax(position, player, 4, SMALL_CONFIG)
+        assert len(table) > 0
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_parallel_search_matches_search(processes):
+    with ParallelAlphaBetaSearch(processes, SMALL_CONFIG, table_slots=1024) as search:
+        for position, player in _get_random_positions(SMALL_CONFIG, 5, seed=2):
+            for depth in [1, 4]:
+                result = search.search(position, player, depth)
+                assert result.score == _minimax(position, player, depth, SMALL_CONFIG)
+                child, next_player = apply_move(
+                    position, player, result.best_bin, SMALL_CONFIG
+                )
+                child_score = _minimax(child, next_player, depth - 1, SMALL_CONFIG)
+                if next_player != player:
+                    child_score = -child_score
+                assert child_score == result.score
+                assert result.nodes > 1
+        assert len(search.table) > 0
+
+
+def test_parallel_search_rejects_incorrect_arguments():
+    with pytest.raises(ValueError):
+        ParallelAlphaBetaSearch(0)
+    with ParallelAlphaBetaSearch(1, table_slots=16) as search:
+        with pytest.raises(ValueError):
+            search.search(get_new_position(), Player.ONE, 0)
+        over = (0, 0, 0, 0, 0, 0, 25, 4, 4, 4, 4, 4, 3, 0)
+        with pytest.raises(ValueError):
+            search.search(over, Player.TWO, 4)
+
+
+def test_parallel_search_prefers_later_root_move_when_better():
+    # Scoring from bin 0 is tried first, but capturing from bin 2 wins 8 pieces
+    position = (1, 0, 1, 0, 0, 2, 8, 2, 2, 8)
+    with ParallelAlphaBetaSearch(1, SMALL_CONFIG, table_slots=16) as search:
+        result = search.search(position, Player.ONE, 1)
+    assert (result.best_bin, result.score) == (2, 1)
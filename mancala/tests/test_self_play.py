@@ -0,0 +1,152 @@
+import json
+
+import pytest
+
+from mancala.batch import play_games
+from mancala.config import GameConfig
+from mancala.mancala import Player
+from mancala.position import board_to_position, get_canonical_position
+from mancala.self_play import (
+    MANIFEST_NAME,
+    ShardWriter,
+    get_record_descr,
+    label_game,
+    main,
+    read_records,
+    read_shard,
+    write_self_play_shards,
+)
+from mancala.strategy import (
+    AlwaysMinimumPlayerStrategy,
+    EvenGoalStealAndPiecesOnOtherSideStrategy,
+)
+
+SMALL_CONFIG = GameConfig(4, 3)
+
+
+def _play(games, seed=0):
+    return list(
+        play_games(
+            AlwaysMinimumPlayerStrategy(SMALL_CONFIG),
+            EvenGoalStealAndPiecesOnOtherSideStrategy(SMALL_CONFIG),
+            games,
+            seed=seed,
+            config=SMALL_CONFIG,
+        )
+    )
+
+
+def test_label_game():
+    [loop] = _play(1)
+    result = loop.get_result()
+    records = list(label_game(loop))
+    assert len(records) == result.plies
+    assert [r[4] for r in records] == list(range(result.plies, 0, -1))
+    for (position, player, outcome, margin, _), turn, board in zip(
+        records, loop.turns, loop.boards
+    ):
+        assert player == turn.player
+        assert (position, player == Player.TWO) == get_canonical_position(
+            board_to_position(board), player, SMALL_CONFIG
+        )
+        player_goal = result.player_one_goal
+        opponent_goal = result.player_two_goal
+        if player == Player.TWO:
+            player_goal, opponent_goal = opponent_goal, player_goal
+        assert margin == player_goal - opponent_goal
+        assert outcome == (
+            0
+            if result.winning_player is None
+            else 1 - 2 * (result.winning_player != player)
+        )
+
+
+def test_shard_writer_rotates_shards(tmp_path):
+    records = [r for loop in _play(3) for r in label_game(loop)]
+    record_bytes = 2 * SMALL_CONFIG.number_of_bins + 2 + 6
+    with ShardWriter(
+        str(tmp_path), "test", SMALL_CONFIG, max_shard_bytes=256 + 10 * record_bytes
+    ) as writer:
+        for record in records:
+            writer.write(record)
+    assert [n for _, n in writer.shards[:-1]] == [10] * (len(writer.shards) - 1)
+    assert sum(n for _, n in writer.shards) == len(records)
+    read = []
+    for name, n in writer.shards:
+        path = tmp_path / name
+        assert path.stat().st_size == 256 + n * record_bytes
+        read.extend(read_shard(str(path), SMALL_CONFIG))
+    assert read == records
+
+
+def test_shards_are_npy_files(tmp_path):
+    with ShardWriter(str(tmp_path), "test", SMALL_CONFIG) as writer:
+        for loop in _play(1):
+            for record in label_game(loop):
+                writer.write(record)
+    [(name, records)] = writer.shards
+    data = (tmp_path / name).read_bytes()
+    assert data[:8] == b"\x93NUMPY\x01\x00"
+    header = data[10:256].decode("latin1")
+    assert header.endswith("\n")
+    assert f"'shape': ({records},)" in header
+    assert repr(get_record_descr(SMALL_CONFIG)) in header
+
+
+def test_read_shard_rejects_other_files(tmp_path):
+    path = tmp_path / "other.npy"
+    path.write_bytes(b"not a shard at all")
+    with pytest.raises(ValueError):
+        list(read_shard(str(path), SMALL_CONFIG))
+    with ShardWriter(str(tmp_path), "test", SMALL_CONFIG) as writer:
+        for record in label_game(_play(1)[0]):
+            writer.write(record)
+    with pytest.raises(ValueError):
+        list(read_shard(str(tmp_path / writer.shards[0][0])))
+
+
+def test_shard_writer_rejects_incorrect_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        ShardWriter(str(tmp_path), "test", GameConfig(6, 22))
+    with pytest.raises(ValueError):
+        ShardWriter(str(tmp_path), "test", SMALL_CONFIG, max_shard_bytes=256)
+
+
+def _write(directory, processes, chunk_size=3):
+    return write_self_play_shards(
+        str(directory),
+        AlwaysMinimumPlayerStrategy(SMALL_CONFIG),
+        EvenGoalStealAndPiecesOnOtherSideStrategy(SMALL_CONFIG),
+        7,
+        seed=2,
+        processes=processes,
+        chunk_size=chunk_size,
+        config=SMALL_CONFIG,
+    )
+
+
+def test_write_self_play_shards(tmp_path):
+    records = _write(tmp_path / "serial", processes=1)
+    manifest = json.loads((tmp_path / "serial" / MANIFEST_NAME).read_text())
+    assert manifest["records"] == records
+    assert [s["path"] for s in manifest["shards"]] == [
+        "games-0000000000-0000.npy",
+        "games-0000000003-0000.npy",
+        "games-0000000006-0000.npy",
+    ]
+    expected = [r for loop in _play(7, seed=2) for r in label_game(loop)]
+    assert list(read_records(str(tmp_path / "serial"))) == expected
+    # Workers write the same shards as a single process
+    assert _write(tmp_path / "parallel", processes=2) == records
+    assert list(read_records(str(tmp_path / "parallel"))) == expected
+    with pytest.raises(ValueError):
+        _write(tmp_path / "none", processes=1, chunk_size=0)
+
+
+def test_main(tmp_path, capsys):
+    argv = [str(tmp_path), "--games", "4", "--processes", "1", "--bins", "4"]
+    assert main(argv + ["--player-one", "always-minimum"]) == 0
+    assert capsys.readouterr().out.startswith("Wrote ")
+    assert (tmp_path / MANIFEST_NAME).exists()
+    with pytest.raises(SystemExit):
+        main(argv + ["--player-two", "no-such-strategy"])
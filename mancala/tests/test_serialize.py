@@ -1,7 +1,15 @@
+import gzip
+import json
+
 import pytest
 
-from mancala.mancala import Board, Player, PlayerRow, Turn
-from mancala.serialize import to_serializable
+from mancala.batch import play_games
+from mancala.config import GameConfig
+from mancala.mancala import Board, Player, PlayerRow, Turn, get_new_board
+from mancala.serialize import from_serializable, read_game_records, to_serializable
+from mancala.strategy import get_simple_strategies
+
+SMALL_CONFIG = GameConfig(3, 3)
 
 
 def test_serialize_returns_type_error_for_unregistered_type():
@@ -43,3 +51,97 @@ def test_serialization_returns_correct_serialization_for_boards():
         to_serializable(p1): to_serializable(p1_row),
         to_serializable(p2): to_serializable(p2_row),
     }
+
+
+@pytest.mark.parametrize(
+    "cls,serializable",
+    [
+        (Player, None),
+        (Player, Player.ONE),
+        (Player, Player.TWO),
+        (PlayerRow, PlayerRow([0, 1, 2], 3, SMALL_CONFIG)),
+        (Turn, Turn(Player.TWO, 2, SMALL_CONFIG)),
+        (Board, get_new_board(SMALL_CONFIG)),
+    ],
+)
+def test_from_serializable_inverts_to_serializable(cls, serializable):
+    serialized = json.loads(json.dumps(to_serializable(serializable)))
+    assert from_serializable(cls, serialized, SMALL_CONFIG) == serializable
+
+
+def test_from_serializable_rejects_incorrect_values():
+    with pytest.raises(TypeError):
+        from_serializable(int, 1)
+    with pytest.raises(ValueError):
+        from_serializable(Player, "three")
+    with pytest.raises(ValueError):
+        from_serializable(Turn, {"player": "one", "selected_bin": 3}, SMALL_CONFIG)
+
+
+def _write_archive(path, lines, compressed=False):
+    with (gzip.open(path, "wt") if compressed else open(path, "w")) as f:
+        f.write("\n".join(lines) + "\n\n")
+
+
+def _play(games=12):
+    strategies = get_simple_strategies(SMALL_CONFIG)
+    return list(
+        play_games(
+            strategies["random-selection"],
+            strategies["always-minimum"],
+            games,
+            seed=0,
+            config=SMALL_CONFIG,
+        )
+    )
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_read_game_records_reads_serialized_games(tmp_path, compressed):
+    loops = _play()
+    path = str(tmp_path / "games.jsonl")
+    _write_archive(path, [loop.serialize() for loop in loops], compressed)
+    records = list(read_game_records(path, config=SMALL_CONFIG))
+    assert len(records) == len(loops)
+    for record, loop in zip(records, loops):
+        assert record.player_strategies == {
+            p: strategy.strategy_name for p, strategy in loop.player_strategies.items()
+        }
+        assert record.starting_player == loop.starting_player
+        assert record.winning_player == loop.winning_player
+        assert not record.adjudicated
+        assert record.boards == loop.boards
+        assert record.turns == loop.turns
+
+
+def test_read_game_records_filters_on_headers(tmp_path):
+    loops = _play()
+    # Only the headers of games that are kept are ever parsed
+    lines = [loop.serialize().replace('"boards": [', '"boards": [}') for loop in loops]
+    path = str(tmp_path / "games.jsonl")
+    _write_archive(path, lines)
+
+    def _read(**filters):
+        return list(read_game_records(path, config=SMALL_CONFIG, **filters))
+
+    assert len(_read(strategy="always-minimum")) == len(loops)
+    assert _read(strategy="always-maximum") == []
+    for player in Player:
+        assert all(r.starting_player == player for r in _read(starting_player=player))
+        assert [r.winning_player for r in _read(winners=[player, None])] == [
+            loop.winning_player
+            for loop in loops
+            if loop.winning_player in (player, None)
+        ]
+    with pytest.raises(json.JSONDecodeError):
+        _read()[0].turns
+
+
+def test_read_game_records_reads_games_written_in_other_ways(tmp_path):
+    loops = _play(3)
+    path = str(tmp_path / "games.jsonl")
+    lines = [json.dumps(json.loads(loop.serialize()), sort_keys=True) for loop in loops]
+    _write_archive(path, lines)
+    for record, loop in zip(read_game_records(path, config=SMALL_CONFIG), loops):
+        assert record.winning_player == loop.winning_player
+        assert record.boards == loop.boards
@@ -0,0 +1,76 @@
+import pytest
+
+from mancala.mancala import Player
+from mancala.shared_results import (
+    RESULT_ROW_SIZE,
+    SharedResultTable,
+    pack_results,
+    unpack_results,
+)
+from mancala.simulation import GameResult
+
+
+def _get_result(winning_player=Player.ONE, plies=31) -> GameResult:
+    return GameResult(
+        winning_player=winning_player,
+        starting_player=Player.TWO,
+        plies=plies,
+        player_one_goal=26,
+        player_two_goal=14,
+        adjudicated=True,
+    )
+
+
+def test_shared_result_table_requires_positive_number_of_games():
+    with pytest.raises(ValueError):
+        SharedResultTable(0)
+
+
+def test_shared_result_table_round_trips_results():
+    with SharedResultTable(3) as table:
+        assert len(table) == 3
+        assert not any(table.is_written(i) for i in range(3))
+
+        table.write(1, _get_result())
+        assert table.is_written(1)
+        assert table.read(1) == _get_result()
+
+        with pytest.raises(ValueError):
+            table.read(0)
+
+
+def test_shared_result_table_checks_indexes():
+    with SharedResultTable(2) as table:
+        with pytest.raises(IndexError):
+            table.write(2, _get_result())
+        with pytest.raises(IndexError):
+            table.is_written(-1)
+
+
+def test_shared_result_table_can_be_attached_to_by_name():
+    with SharedResultTable(2) as table:
+        with SharedResultTable.attach(table.name, 2) as attached_table:
+            attached_table.write(0, _get_result(Player.TWO))
+            attached_table.write(1, _get_result(None, plies=60))
+
+        assert list(table) == [_get_result(Player.TWO), _get_result(None, plies=60)]
+
+
+def test_shared_result_table_counts_winners():
+    with SharedResultTable(4) as table:
+        for index, winning_player in enumerate([Player.ONE, None, Player.ONE]):
+            table.write(index, _get_result(winning_player))
+        with pytest.raises(ValueError):
+            table.count_winners()
+
+        table.write(3, _get_result(Player.TWO))
+        assert table.count_winners() == {Player.ONE: 2, Player.TWO: 1, None: 1}
+
+
+def test_results_are_packed_as_table_rows():
+    results = [_get_result(), _get_result(winning_player=None, plies=40)]
+    block = pack_results(results)
+    assert len(block) == 2 * RESULT_ROW_SIZE
+    assert unpack_results(block) == results
+    with pytest.raises(ValueError):
+        unpack_results(block[:-1])
@@ -2,6 +2,7 @@ import json
 
 import pytest
 
+from mancala.config import GameConfig
 from mancala.mancala import Player, PlayerRow, get_new_board
 from mancala.serialize import to_serializable
 from mancala.simulation import SimulationLoop
@@ -116,6 +117,95 @@ def test_simulation_loop_stops_if_there_is_a_tie():
     assert last_board[Player.TWO].goal == 24
 
 
+def test_simulation_loop_provides_game_result():
+    loop = SimulationLoop(
+        player_one=AlwaysMinimumPlayerStrategy(),
+        player_two=AlwaysMaximumPlayerStrategy(),
+        starting_player=Player.TWO,
+    )
+    with pytest.raises(ValueError):
+        loop.get_result()
+
+    loop.run()
+    result = loop.get_result()
+    assert result.winning_player == Player.ONE
+    assert result.starting_player == Player.TWO
+    assert result.plies == len(loop.turns)
+    assert result.player_one_goal == loop.boards[-1][Player.ONE].goal
+    assert result.player_two_goal == loop.boards[-1][Player.TWO].goal
+    assert result.adjudicated is False
+
+
+def test_simulation_loop_plays_out_full_game_by_default():
+    loop = SimulationLoop(
+        player_one=AlwaysMinimumPlayerStrategy(),
+        player_two=AlwaysMinimumPlayerStrategy(),
+    )
+    assert loop.adjudicate_when_decided is False
+    loop.run()
+    assert loop.adjudicated is False
+
+
+@pytest.mark.parametrize("player", Player)
+def test_simulation_loop_can_adjudicate_when_outcome_is_decided(player):
+    full_loop = SimulationLoop(
+        player_one=AlwaysMinimumPlayerStrategy(),
+        player_two=AlwaysMinimumPlayerStrategy(),
+        starting_player=player,
+    )
+    full_loop.run()
+
+    adjudicated_loop = SimulationLoop(
+        player_one=AlwaysMinimumPlayerStrategy(),
+        player_two=AlwaysMinimumPlayerStrategy(),
+        starting_player=player,
+        adjudicate_when_decided=True,
+    )
+    assert adjudicated_loop.adjudicate_when_decided is True
+    assert adjudicated_loop.adjudicated is False
+    adjudicated_loop.run()
+    assert adjudicated_loop.has_run is True
+    assert adjudicated_loop.adjudicated is True
+    assert adjudicated_loop.winning_player == full_loop.winning_player
+    assert len(adjudicated_loop.turns) < len(full_loop.turns)
+    assert adjudicated_loop.turns == full_loop.turns[: len(adjudicated_loop.turns)]
+
+    adjudicated_loop.run(reset_simulation=True)
+    assert adjudicated_loop.adjudicated is True
+
+
+@pytest.mark.parametrize("number_of_bins", [4, 8])
+@pytest.mark.parametrize("number_of_starting_pieces", [3, 6])
+def test_simulation_loop_plays_other_game_configs(
+    number_of_bins, number_of_starting_pieces
+):
+    config = GameConfig(number_of_bins, number_of_starting_pieces)
+    loop = SimulationLoop(
+        player_one=ExampleRandomPlayerStrategy(config),
+        player_two=AlwaysMinimumPlayerStrategy(config),
+        config=config,
+    )
+    assert loop.config == config
+    assert loop.boards[0] == get_new_board(config)
+
+    loop.run()
+    last_board = loop.boards[-1]
+    assert all(len(row.bins) == number_of_bins for row in last_board.values())
+    assert sum(sum(row.bins) + row.goal for row in last_board.values()) == (
+        config.total_pieces
+    )
+    if loop.winning_player is not None:
+        assert last_board[loop.winning_player].goal > config.winning_threshold
+
+
+def test_simulation_loop_requires_strategies_for_its_config():
+    with pytest.raises(ValueError):
+        SimulationLoop(
+            player_one=ExampleRandomPlayerStrategy(GameConfig(4, 3)),
+            player_two=ExampleRandomPlayerStrategy(GameConfig(4, 3)),
+        )
+
+
 def test_simulation_loop_serialization():
     p1 = AlwaysMinimumPlayerStrategy()
     p2 = AlwaysMaximumPlayerStrategy()
@@ -124,6 +214,7 @@ def test_simulation_loop_serialization():
         "player_strategies",
         "starting_player",
         "winning_player",
+        "adjudicated",
         "turns",
         "boards",
     }
@@ -136,6 +227,7 @@ def test_simulation_loop_serialization():
     assert prerun_serialization["player_strategies"]["two"] == p2.strategy_name
     assert prerun_serialization["starting_player"] in ["one", "two"]
     assert prerun_serialization["winning_player"] is None
+    assert prerun_serialization["adjudicated"] is False
     assert len(prerun_serialization["turns"]) == 0
     assert len(prerun_serialization["boards"]) == 1
     assert prerun_serialization["boards"][0] == {
@@ -160,6 +252,7 @@ def test_simulation_loop_serialization():
     assert (
         postrun_serialization["winning_player"] == "one"
     )  # minimum strategy always wins
+    assert postrun_serialization["adjudicated"] is False
     assert len(postrun_serialization["turns"]) > 0
     assert postrun_serialization["turns"] == [
         to_serializable(turn) for turn in loop.turns
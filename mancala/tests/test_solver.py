@@ -0,0 +1,200 @@
+import filecmp
+import json
+import os
+import random
+from functools import lru_cache
+from itertools import product
+
+import pytest
+
+import mancala.solver
+from mancala.adjudicate import get_decided_outcome
+from mancala.config import GameConfig
+from mancala.mancala import Board, Player, PlayerRow, play_move
+from mancala.solver import PROGRESS_FILE_NAME, ValueTable, main, solve
+
+SMALL_CONFIG = GameConfig(3, 2)
+
+
+@pytest.fixture(scope="module")
+def small_solve_directory(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("solve"))
+    assert list(solve(directory, SMALL_CONFIG)) == list(range(13))
+    return directory
+
+
+@lru_cache(maxsize=None)
+def _get_remaining_margin(player_bins, opponent_bins):
+    """Plain minimax over the game played until the player to move is out of pieces."""
+    if not any(player_bins):
+        return -sum(opponent_bins)
+    margins = []
+    for selected_bin, pieces in enumerate(player_bins):
+        if pieces == 0:
+            continue
+        new_player_bins = list(player_bins)
+        new_opponent_bins = list(opponent_bins)
+        goal_pieces, extra_turn, _ = play_move(
+            new_player_bins, new_opponent_bins, selected_bin, SMALL_CONFIG
+        )
+        if extra_turn:
+            remaining = _get_remaining_margin(
+                tuple(new_player_bins), tuple(new_opponent_bins)
+            )
+        else:
+            remaining = -_get_remaining_margin(
+                tuple(new_opponent_bins), tuple(new_player_bins)
+            )
+        margins.append(goal_pieces + remaining)
+    return max(margins)
+
+
+def _get_layer_files(directory):
+    return sorted(f for f in os.listdir(directory) if f.endswith(".values"))
+
+
+def _assert_same_values(directory, other_directory):
+    layer_files = _get_layer_files(directory)
+    assert layer_files == _get_layer_files(other_directory)
+    _, mismatch, errors = filecmp.cmpfiles(
+        directory, other_directory, layer_files, shallow=False
+    )
+    assert mismatch == errors == []
+
+
+def test_solve_matches_minimax(small_solve_directory):
+    with ValueTable(small_solve_directory, SMALL_CONFIG) as values:
+        assert values.solved_pieces == 12
+        for bins in product(range(5), repeat=6):
+            if sum(bins) > 12:
+                continue
+            assert values.remaining_margin(bins[:3], bins[3:]) == (
+                _get_remaining_margin(bins[:3], bins[3:])
+            )
+        # The player moving first wins the small game by two pieces
+        assert values.remaining_margin([2, 2, 2], [2, 2, 2]) == 2
+
+
+def test_value_table_values(small_solve_directory):
+    board = Board(
+        {
+            Player.ONE: PlayerRow([1, 0, 2], 3, SMALL_CONFIG),
+            Player.TWO: PlayerRow([0, 3, 1], 2, SMALL_CONFIG),
+        }
+    )
+    with ValueTable(small_solve_directory, SMALL_CONFIG) as values:
+        for player in Player:
+            opponent = Player.ONE if player == Player.TWO else Player.TWO
+            value = values.value(board, player)
+            assert value == board[player].goal - board[opponent].goal + (
+                _get_remaining_margin(
+                    tuple(board[player].bins), tuple(board[opponent].bins)
+                )
+            )
+            move_values = values.get_move_values(board, player)
+            assert sorted(move_values) == [
+                b for b, pieces in enumerate(board[player].bins) if pieces
+            ]
+            assert max(move_values.values()) == value
+
+
+def test_value_sign_agrees_with_decided_outcomes(tmp_path):
+    list(solve(str(tmp_path), max_pieces_in_bins=6))
+    rng = random.Random(0)
+    with ValueTable(str(tmp_path)) as values:
+        assert values.solved_pieces == 6
+        for _ in range(300):
+            bins = [0] * 12
+            for _ in range(rng.randint(1, 6)):
+                bins[rng.randrange(12)] += 1
+            player_one_goal = rng.randint(18, 48 - sum(bins) - 18)
+            board = Board(
+                {
+                    Player.ONE: PlayerRow(bins[:6], player_one_goal),
+                    Player.TWO: PlayerRow(bins[6:], 48 - sum(bins) - player_one_goal),
+                }
+            )
+            player = rng.choice(list(Player))
+            value = values.value(board, player)
+            decided, winner = get_decided_outcome(board, player)
+            if decided:
+                opponent = Player.ONE if player == Player.TWO else Player.TWO
+                expected = {1: player, 0: None, -1: opponent}[(value > 0) - (value < 0)]
+                assert winner == expected
+
+
+def test_solve_resumes_from_progress(tmp_path, small_solve_directory, monkeypatch):
+    directory = str(tmp_path)
+    assert list(solve(directory, SMALL_CONFIG, max_pieces_in_bins=5)) == [
+        0,
+        1,
+        2,
+        3,
+        4,
+        5,
+    ]
+
+    # Interrupt the solve part of the way through a layer
+    solve_ranks = mancala.solver._solve_ranks
+    calls = []
+
+    def _interrupted_solve_ranks(*args):
+        calls.append(args)
+        if len(calls) > 10:
+            raise KeyboardInterrupt
+        return solve_ranks(*args)
+
+    monkeypatch.setattr(mancala.solver, "_solve_ranks", _interrupted_solve_ranks)
+    with pytest.raises(KeyboardInterrupt):
+        list(solve(directory, SMALL_CONFIG))
+    monkeypatch.setattr(mancala.solver, "_solve_ranks", solve_ranks)
+
+    with ValueTable(directory, SMALL_CONFIG) as values:
+        assert values.solved_pieces == 5
+    with open(os.path.join(directory, PROGRESS_FILE_NAME)) as f:
+        assert json.load(f)["solved_potential"] > 0
+    assert list(solve(directory, SMALL_CONFIG)) == list(range(6, 13))
+    _assert_same_values(directory, small_solve_directory)
+    assert list(solve(directory, SMALL_CONFIG)) == []
+
+
+def test_solve_in_processes(tmp_path, small_solve_directory):
+    directory = str(tmp_path)
+    assert list(solve(directory, SMALL_CONFIG, processes=2)) == list(range(13))
+    _assert_same_values(directory, small_solve_directory)
+
+
+def test_solve_rejects_incorrect_arguments(tmp_path, small_solve_directory):
+    with pytest.raises(ValueError):
+        next(solve(str(tmp_path), SMALL_CONFIG, max_pieces_in_bins=13))
+    with pytest.raises(ValueError):
+        next(solve(str(tmp_path), SMALL_CONFIG, max_pieces_in_bins=-1))
+    with pytest.raises(ValueError):
+        next(solve(str(tmp_path), GameConfig(11, 6)))
+    with pytest.raises(ValueError):
+        next(solve(small_solve_directory, GameConfig(3, 3)))
+    with pytest.raises(ValueError):
+        ValueTable(small_solve_directory)
+
+
+def test_value_table_requires_solved_positions(tmp_path):
+    list(solve(str(tmp_path), SMALL_CONFIG, max_pieces_in_bins=3))
+    values = ValueTable(str(tmp_path), SMALL_CONFIG)
+    assert values.remaining_margin([1, 1, 0], [0, 0, 1]) == 1
+    with pytest.raises(ValueError):
+        values.remaining_margin([1, 1, 1], [0, 0, 1])
+    values.close()
+    assert os.path.exists(os.path.join(str(tmp_path), PROGRESS_FILE_NAME))
+
+
+def test_main(capsys, tmp_path):
+    argv = [str(tmp_path), "--bins", "3", "--pieces", "1", "--processes", "1"]
+    assert main(argv + ["--max-pieces-in-bins", "4"]) == 0
+    output = capsys.readouterr().out.splitlines()
+    assert len(output) == 5
+    assert output[0] == "solved              1 positions with 0 pieces in bins"
+
+    assert main(argv) == 0
+    output = capsys.readouterr().out.splitlines()
+    assert output[0] == "solved            252 positions with 5 pieces in bins"
+    assert output[-1].startswith("the player to move first finishes")
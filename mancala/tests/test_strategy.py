@@ -1,15 +1,30 @@
+import json
+import random
 from typing import List
 
 import pytest
 
+from mancala.analysis import MoveAnalysis
+from mancala.config import GameConfig
 from mancala.mancala import Board, Player, PlayerRow
+from mancala.simulation import SimulationLoop
+from mancala.solver import ValueTable, solve
 from mancala.strategy import (
+    AlphaBetaPlayerStrategy,
     AlwaysMaximumPlayerStrategy,
     AlwaysMinimumPlayerStrategy,
     EvenGoalOrPiecesOnOtherSideStrategy,
     EvenGoalStealAndPiecesOnOtherSideStrategy,
     ExampleRandomPlayerStrategy,
+    LinearValueStrategy,
+    MOVE_FEATURES,
+    PerfectPlayStrategy,
     PlayerStrategy,
+    VALUE_FEATURES,
+    WeightedFeatureStrategy,
+    get_move_features,
+    get_simple_strategies,
+    get_value_features,
 )
 
 
@@ -181,7 +196,277 @@ def test_even_goal_stealing_shedding_chooses_correct_bin(boards, expected_select
     )
 
 
+def test_even_goal_strategies_count_whole_laps_of_the_board():
+    # 14 pieces in bin 0 go once around the board and back into the goal
+    row = PlayerRow(bins=[14, 0, 0, 12, 0, 0], goal=0)
+    opponent_row = PlayerRow(bins=[1, 0, 0, 0, 0, 0], goal=0)
+    assert EvenGoalOrPiecesOnOtherSideStrategy().choose_bin(row) == 0
+    assert (
+        EvenGoalStealAndPiecesOnOtherSideStrategy().choose_bin(row, opponent_row) == 0
+    )
+
+
+def test_even_goal_stealing_shedding_only_steals_within_its_own_row():
+    strategy = EvenGoalStealAndPiecesOnOtherSideStrategy()
+    # 9 pieces in bin 0 come back around to the empty bin 4 and capture 6, but
+    # only steals landing without leaving the row count, so bin 3 steals 1
+    row = PlayerRow(bins=[9, 0, 0, 1, 0, 0], goal=0)
+    opponent_row = PlayerRow(bins=[0, 0, 1, 0, 5, 0], goal=0)
+    assert strategy.choose_bin(row, opponent_row) == 3
+
+    # 11 pieces in bin 1 wrap around to capture, though less than a lap
+    row = PlayerRow(bins=[0, 11, 10, 0, 1, 0], goal=0)
+    opponent_row = PlayerRow(bins=[0, 0, 8, 8, 10, 2], goal=0)
+    assert strategy.choose_bin(row, opponent_row) == 4
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        AlwaysMaximumPlayerStrategy(),
+        EvenGoalOrPiecesOnOtherSideStrategy(),
+        EvenGoalStealAndPiecesOnOtherSideStrategy(),
+    ],
+)
+def test_player_strategy_chooses_bin_from_analysis(strategy):
+    rng = random.Random(0)
+    for _ in range(50):
+        player_row = PlayerRow(bins=[rng.randint(1, 15) for _ in range(6)], goal=0)
+        opponent_row = PlayerRow(bins=[rng.randint(0, 15) for _ in range(6)], goal=0)
+        assert strategy.choose_bin_from_analysis(
+            MoveAnalysis(player_row, opponent_row)
+        ) == strategy.choose_bin(player_row, opponent_row)
+
+
 def test_even_goal_stealing_shedding_requires_opponent_row():
     strategy = EvenGoalStealAndPiecesOnOtherSideStrategy()
     with pytest.raises(ValueError):
         strategy.choose_bin(player_row=PlayerRow.get_new_player_row())
+
+
+def test_get_move_features():
+    analysis = MoveAnalysis(
+        PlayerRow(bins=[0, 1, 3, 0, 9, 0], goal=2),
+        PlayerRow(bins=[5, 0, 0, 0, 0, 0], goal=0),
+    )
+    assert get_move_features(analysis, 1) == (0, 5, 6, 0, 1, 2)
+    assert get_move_features(analysis, 2) == (1, 0, 1, 0, 3, 3)
+    assert get_move_features(analysis, 4) == (0, 0, 1, 4, 9, 5)
+
+
+@pytest.mark.parametrize(
+    "weights,expected_selection",
+    [
+        ((1, 0, 0, 0, 0, 0), 2),
+        ((0, 1, 0, 0, 0, 0), 1),
+        ((0, 0, 0, 1, 0, 0), 4),
+        ((0, 0, 0, 0, -1, 0), 1),
+        # Every move scores the same, so the first is chosen
+        ((0, 0, 0, 0, 0, 0), 1),
+    ],
+)
+def test_weighted_feature_strategy_chooses_best_scoring_bin(
+    weights, expected_selection
+):
+    strategy = WeightedFeatureStrategy(weights)
+    assert strategy.weights == weights
+    assert (
+        strategy.choose_bin(
+            PlayerRow(bins=[0, 1, 3, 0, 9, 0], goal=2),
+            PlayerRow(bins=[5, 0, 0, 0, 0, 0], goal=0),
+        )
+        == expected_selection
+    )
+
+
+def test_weighted_feature_strategy_rejects_incorrect_arguments():
+    with pytest.raises(ValueError):
+        WeightedFeatureStrategy([1.0])
+    strategy = WeightedFeatureStrategy([0.5] * len(MOVE_FEATURES))
+    assert strategy.strategy_name == "weighted-features-0.5,0.5,0.5,0.5,0.5,0.5"
+    with pytest.raises(ValueError):
+        strategy.choose_bin(PlayerRow.get_new_player_row())
+    with pytest.raises(ValueError):
+        strategy.choose_bin(
+            PlayerRow(bins=[0] * 6, goal=0), PlayerRow.get_new_player_row()
+        )
+
+
+def test_get_value_features():
+    position = (0, 1, 3, 0, 9, 0, 2, 5, 0, 0, 0, 0, 0, 0)
+    assert get_value_features(position, Player.ONE, Player.ONE) == (
+        2,
+        13,
+        5,
+        1,
+        1,
+        0,
+        5,
+        0,
+    )
+    assert get_value_features(position, Player.TWO, Player.ONE) == (
+        -2,
+        5,
+        13,
+        0,
+        0,
+        1,
+        0,
+        5,
+    )
+
+
+LINEAR_VALUE_WEIGHTS = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0, 1.0, -1.0)
+
+
+def test_linear_value_strategy_chooses_best_valued_bin():
+    strategy = LinearValueStrategy(LINEAR_VALUE_WEIGHTS)
+    assert strategy.weights == LINEAR_VALUE_WEIGHTS
+    assert strategy.strategy_name == "linear-value-1,0,0,1,0,0,1,-1"
+    # Stealing the five pieces beats the extra turn
+    player_row = PlayerRow(bins=[0, 1, 3, 0, 9, 0], goal=2)
+    opponent_row = PlayerRow(bins=[5, 0, 0, 0, 0, 0], goal=0)
+    assert strategy.choose_bin(player_row, opponent_row) == 1
+
+
+def test_linear_value_strategy_takes_winning_moves():
+    # Every move is worth the same to these weights, but the capture wins
+    strategy = LinearValueStrategy([0.0] * len(VALUE_FEATURES))
+    player_row = PlayerRow(bins=[2, 0, 0, 1, 0, 0], goal=23)
+    opponent_row = PlayerRow(bins=[0, 0, 3, 0, 0, 0], goal=19)
+    assert strategy.choose_bin(player_row, opponent_row) == 3
+
+
+def test_linear_value_strategy_chooses_bins_for_many_games():
+    strategy = LinearValueStrategy(LINEAR_VALUE_WEIGHTS)
+    rows = [
+        (PlayerRow.get_new_player_row(), PlayerRow.get_new_player_row()),
+        (
+            PlayerRow(bins=[0, 1, 3, 0, 9, 0], goal=2),
+            PlayerRow(bins=[5, 0, 0, 0, 0, 0], goal=0),
+        ),
+        (
+            PlayerRow(bins=[2, 0, 0, 1, 0, 0], goal=23),
+            PlayerRow(bins=[0, 0, 3, 0, 0, 0], goal=19),
+        ),
+    ]
+    # The same games with Player.TWO to move
+    parents = [((*o.bins, o.goal, *p.bins, p.goal), Player.TWO) for p, o in rows]
+    assert strategy.choose_bins(parents) == [strategy.choose_bin(*r) for r in rows]
+    with pytest.raises(ValueError):
+        strategy.choose_bins([((0,) * 13 + (48,), Player.ONE)])
+
+
+def test_linear_value_strategy_beats_one_ply_heuristics():
+    for opponent in (AlwaysMinimumPlayerStrategy(), AlwaysMaximumPlayerStrategy()):
+        for starting_player in Player:
+            loop = SimulationLoop(
+                player_one=LinearValueStrategy(LINEAR_VALUE_WEIGHTS),
+                player_two=opponent,
+                starting_player=starting_player,
+            )
+            loop.run()
+            assert loop.winning_player == Player.ONE
+
+
+def test_linear_value_strategy_loads_weights_from_a_file(tmp_path):
+    path = tmp_path / "weights.json"
+    path.write_text(json.dumps(dict(zip(VALUE_FEATURES, LINEAR_VALUE_WEIGHTS))))
+    strategy = LinearValueStrategy.from_file(str(path), GameConfig(4, 3))
+    assert strategy.weights == LINEAR_VALUE_WEIGHTS
+    assert strategy.config == GameConfig(4, 3)
+    path.write_text(json.dumps({"goal-difference": 1.0}))
+    with pytest.raises(ValueError):
+        LinearValueStrategy.from_file(str(path))
+
+
+def test_linear_value_strategy_rejects_incorrect_arguments():
+    with pytest.raises(ValueError):
+        LinearValueStrategy([1.0])
+    strategy = LinearValueStrategy(LINEAR_VALUE_WEIGHTS)
+    with pytest.raises(ValueError):
+        strategy.choose_bin(PlayerRow.get_new_player_row())
+    with pytest.raises(ValueError):
+        strategy.choose_bin(
+            PlayerRow(bins=[0] * 6, goal=0), PlayerRow.get_new_player_row()
+        )
+
+
+def test_strategies_say_whether_they_are_thread_safe():
+    for strategy in get_simple_strategies().values():
+        assert strategy.thread_safe
+    assert WeightedFeatureStrategy([0.0] * len(MOVE_FEATURES)).thread_safe
+    assert LinearValueStrategy(LINEAR_VALUE_WEIGHTS).thread_safe
+    # The transposition table is kept between moves
+    assert not AlphaBetaPlayerStrategy(1).thread_safe
+
+
+@pytest.fixture(scope="module")
+def small_value_table(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("solve"))
+    list(solve(directory, GameConfig(3, 2)))
+    with ValueTable(directory, GameConfig(3, 2)) as value_table:
+        yield value_table
+
+
+def test_perfect_play_strategy_chooses_best_move(small_value_table):
+    config = GameConfig(3, 2)
+    strategy = PerfectPlayStrategy(small_value_table, config)
+    assert strategy.strategy_name == "perfect-play"
+    assert strategy.config == config
+
+    # Capturing the opponent's three pieces beats scoring the single piece
+    player_row = PlayerRow(bins=[0, 1, 1], goal=4, config=config)
+    opponent_row = PlayerRow(bins=[3, 1, 0], goal=2, config=config)
+    assert strategy.choose_bin(player_row, opponent_row) == 1
+
+    with pytest.raises(ValueError):
+        strategy.choose_bin(PlayerRow(bins=[0, 0, 0], goal=6, config=config))
+    with pytest.raises(ValueError):
+        strategy.choose_bin(player_row)
+
+
+def test_perfect_play_strategy_wins_when_moving_first(small_value_table):
+    config = GameConfig(3, 2)
+    for _ in range(20):
+        loop = SimulationLoop(
+            player_one=PerfectPlayStrategy(small_value_table, config),
+            player_two=ExampleRandomPlayerStrategy(config),
+            starting_player=Player.ONE,
+            config=config,
+        )
+        loop.run()
+        assert loop.winning_player == Player.ONE
+
+
+def test_alpha_beta_player_strategy():
+    strategy = AlphaBetaPlayerStrategy(depth=4)
+    assert strategy.strategy_name == "alpha-beta-depth-4"
+    assert strategy.depth == 4
+    new_row = PlayerRow.get_new_player_row()
+    # Bin 3 ends in the goal, earning another turn
+    assert strategy.choose_bin(new_row, new_row) == 3
+
+    with pytest.raises(ValueError):
+        AlphaBetaPlayerStrategy(depth=0)
+    with pytest.raises(ValueError):
+        strategy.choose_bin(PlayerRow(bins=[0, 0, 0, 0, 0, 0], goal=10), new_row)
+    with pytest.raises(ValueError):
+        strategy.choose_bin(new_row)
+
+
+def test_alpha_beta_player_strategy_beats_random_player():
+    config = GameConfig(4, 3)
+    random.seed(0)
+    loop = SimulationLoop(
+        player_one=AlphaBetaPlayerStrategy(6, config),
+        player_two=ExampleRandomPlayerStrategy(config),
+        config=config,
+    )
+    loop.run()
+    assert loop.winning_player == Player.ONE
+
+
+def test_get_simple_strategies_are_named():
+    for name, strategy in get_simple_strategies().items():
+        assert strategy.strategy_name == name
@@ -0,0 +1,37 @@
+import io
+
+import pytest
+
+from mancala.config import GameConfig
+from mancala.strategy import get_simple_strategies
+from mancala.stub_bot import answer, main, serve
+
+
+def test_answer():
+    strategy = get_simple_strategies(GameConfig(3, 2))["always-maximum"]
+    assert answer("7 1 3 0 2 2 0 2 0\n", strategy) == "7 1"
+
+
+def test_serve_answers_every_line(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    stdout = io.StringIO()
+    serve(
+        get_simple_strategies()["always-minimum"],
+        io.StringIO("0 4 4 4 4 4 4 0 4 4 4 4 4 4 0\n1 0 0 0 0 2 1 9 0 0 0 0 0 0 0\n"),
+        stdout,
+        delay=0.5,
+    )
+    assert stdout.getvalue() == "0 0\n1 5\n"
+    assert sleeps == [0.5, 0.5]
+
+
+def test_main(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO("3 1 0 2 0 2 0 0 0\n"))
+    assert main(["--strategy", "always-maximum", "--bins", "3", "--pieces", "1"]) == 0
+    assert capsys.readouterr().out == "3 2\n"
+
+
+def test_main_rejects_unknown_strategies():
+    with pytest.raises(SystemExit):
+        main(["--strategy", "no-such-strategy"])
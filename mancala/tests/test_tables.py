@@ -0,0 +1,32 @@
+import pytest
+
+from mancala.config import GameConfig
+from mancala.tables import LANDS_IN_GOAL, LANDS_IN_OPPONENTS_ROW, get_game_tables
+
+
+def test_get_game_tables_are_cached_per_config():
+    assert get_game_tables() is get_game_tables()
+    assert get_game_tables(GameConfig(4, 3)) is get_game_tables(GameConfig(4, 3))
+    assert get_game_tables(GameConfig(4, 3)) is not get_game_tables(GameConfig(4, 4))
+
+
+@pytest.mark.parametrize("number_of_bins", range(4, 9))
+@pytest.mark.parametrize("number_of_starting_pieces", range(3, 7))
+def test_game_tables_match_config(number_of_bins, number_of_starting_pieces):
+    config = GameConfig(number_of_bins, number_of_starting_pieces)
+    tables = get_game_tables(config)
+    assert tables.config == config
+    assert tables.lap_length == 2 * number_of_bins + 1
+    assert tables.winning_threshold == number_of_bins * number_of_starting_pieces
+    assert tables.starting_bins == tuple([number_of_starting_pieces] * number_of_bins)
+    assert tables.capture_bins == tuple(range(number_of_bins))
+
+    for selected_bin, landing in enumerate(tables.landing):
+        # Every lap visits each bin of the player once, the goal once and the
+        # opponent's row, ending back in the selected bin
+        assert len(landing) == tables.lap_length
+        assert landing.count(LANDS_IN_GOAL) == 1
+        assert landing.count(LANDS_IN_OPPONENTS_ROW) == number_of_bins
+        assert sorted(b for b in landing if b >= 0) == list(range(number_of_bins))
+        assert landing[selected_bin] == LANDS_IN_GOAL
+        assert landing[-1] == selected_bin
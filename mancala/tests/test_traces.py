@@ -0,0 +1,104 @@
+import pytest
+
+from mancala.batch import play_games, simulate_games
+from mancala.config import GameConfig
+from mancala.mancala import Player
+from mancala.simulation import SimulationLoop
+from mancala.strategy import ExampleRandomPlayerStrategy
+from mancala.traces import (
+    STRATA,
+    UNSTRATIFIED,
+    MatchupSummary,
+    TraceReservoir,
+    simulate_games_with_traces,
+)
+
+SMALL_CONFIG = GameConfig(4, 3)
+
+
+def _simulate(games, sample_size, stratified):
+    strategy = ExampleRandomPlayerStrategy(SMALL_CONFIG)
+    return simulate_games_with_traces(
+        strategy,
+        strategy,
+        games,
+        sample_size,
+        stratified=stratified,
+        seed=4,
+        config=SMALL_CONFIG,
+    )
+
+
+def test_simulate_games_with_traces_counts_every_game():
+    summary, reservoir = _simulate(50, 3, stratified=False)
+    strategy = ExampleRandomPlayerStrategy(SMALL_CONFIG)
+    results = list(simulate_games(strategy, strategy, 50, seed=4, config=SMALL_CONFIG))
+    assert summary.games == 50
+    assert summary.wins == {
+        player: sum(r.winning_player == player for r in results)
+        for player in (Player.ONE, Player.TWO, None)
+    }
+    assert summary.adjudicated == 0
+    assert summary.mean_plies == sum(r.plies for r in results) / 50
+    assert summary.shortest_plies == min(r.plies for r in results)
+    assert summary.longest_plies == max(r.plies for r in results)
+
+    assert reservoir.size == 3
+    assert not reservoir.stratified
+    [traces] = reservoir.samples.values()
+    assert len(traces) == 3
+    for trace in traces:
+        # The traces are those of the batch run's games
+        assert trace.result == results[trace.game_index]
+        assert len(trace.turns) == trace.result.plies
+        final_board = trace.boards[-1]
+        assert final_board[Player.ONE].goal == trace.result.player_one_goal
+        assert final_board[Player.TWO].goal == trace.result.player_two_goal
+
+
+def test_trace_reservoir_samples_games_uniformly():
+    loop = SimulationLoop(
+        ExampleRandomPlayerStrategy(SMALL_CONFIG),
+        ExampleRandomPlayerStrategy(SMALL_CONFIG),
+        config=SMALL_CONFIG,
+    )
+    loop.run()
+    kept = [0] * 10
+    for seed in range(500):
+        reservoir = TraceReservoir(2, seed=seed)
+        for game_index in range(10):
+            reservoir.offer(game_index, loop)
+        for trace in reservoir.samples[UNSTRATIFIED]:
+            kept[trace.game_index] += 1
+    # Each game is kept 100 times in expectation
+    assert all(60 < count < 140 for count in kept)
+
+
+def test_trace_reservoir_stratifies_by_outcome_and_length():
+    summary, reservoir = _simulate(60, 2, stratified=True)
+    samples = reservoir.samples
+    assert list(samples) == list(STRATA)
+    strategy = ExampleRandomPlayerStrategy(SMALL_CONFIG)
+    loops = list(play_games(strategy, strategy, 60, seed=4, config=SMALL_CONFIG))
+    for name, player in (
+        ("player-one-wins", Player.ONE),
+        ("player-two-wins", Player.TWO),
+        ("ties", None),
+    ):
+        assert len(samples[name]) == min(2, summary.wins[player])
+        assert all(t.result.winning_player == player for t in samples[name])
+
+    # Ties in length keep the earlier games
+    by_length = sorted(range(60), key=lambda i: (len(loops[i].turns), i))
+    by_length_descending = sorted(range(60), key=lambda i: (-len(loops[i].turns), i))
+    assert [t.game_index for t in samples["shortest"]] == sorted(by_length[:2])
+    assert [t.game_index for t in samples["longest"]] == sorted(
+        by_length_descending[:2]
+    )
+
+
+def test_reservoir_and_summary_reject_incorrect_arguments():
+    with pytest.raises(ValueError):
+        TraceReservoir(0)
+    with pytest.raises(ValueError):
+        MatchupSummary().mean_plies
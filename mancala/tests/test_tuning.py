@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from mancala.config import GameConfig
+from mancala.strategy import MOVE_FEATURES, AlwaysMinimumPlayerStrategy
+from mancala.tuning import evaluate_weights, main, tune
+
+SMALL_CONFIG = GameConfig(4, 3)
+WEIGHTS = (1.0, 1.0, 0.5, 0.2, 0.0, -0.1)
+
+
+def test_evaluate_weights_uses_common_random_numbers():
+    reference = [AlwaysMinimumPlayerStrategy(SMALL_CONFIG)]
+    fitness = evaluate_weights(WEIGHTS, reference, 10, seed=3, config=SMALL_CONFIG)
+    assert 0 <= fitness <= 1
+    assert fitness == evaluate_weights(
+        WEIGHTS, reference, 10, seed=3, config=SMALL_CONFIG
+    )
+
+
+def _tune(path, generations, processes=1):
+    return list(
+        tune(
+            str(path),
+            generations,
+            population_size=4,
+            games=4,
+            seed=1,
+            processes=processes,
+            config=SMALL_CONFIG,
+        )
+    )
+
+
+def test_tune_writes_a_checkpoint_every_generation(tmp_path):
+    path = tmp_path / "tuning.json"
+    generations = _tune(path, 2)
+    assert [g.number for g in generations] == [0, 1]
+    for generation in generations:
+        assert len(generation.best_weights) == len(MOVE_FEATURES)
+        assert generation.mean_fitness <= generation.best_fitness
+    checkpoint = json.loads(path.read_text())
+    assert checkpoint["generation"] == 2
+    assert len(checkpoint["population"]) == 4
+    # The elite is carried over unchanged
+    assert tuple(checkpoint["population"][0]) == generations[1].best_weights
+
+
+def test_tune_resumes_from_its_checkpoint(tmp_path):
+    uninterrupted = _tune(tmp_path / "uninterrupted.json", 3)
+    path = tmp_path / "resumed.json"
+    _tune(path, 2)
+    assert _tune(path, 3) == uninterrupted[2:]
+    assert _tune(path, 3) == []
+
+
+def test_tune_spreads_candidates_over_processes(tmp_path):
+    assert _tune(tmp_path / "parallel.json", 1, processes=2) == _tune(
+        tmp_path / "serial.json", 1
+    )
+
+
+def test_tune_rejects_incorrect_arguments(tmp_path):
+    path = str(tmp_path / "tuning.json")
+    with pytest.raises(ValueError):
+        next(tune(path, 1, population_size=0))
+    with pytest.raises(ValueError):
+        next(tune(path, 1, population_size=2, elite=3))
+    with pytest.raises(ValueError):
+        next(tune(path, 1, reference=[AlwaysMinimumPlayerStrategy(SMALL_CONFIG)]))
+    with open(path, "w") as f:
+        json.dump({"generation": 1, "population": [[1.0, 2.0]]}, f)
+    with pytest.raises(ValueError):
+        next(tune(path, 2))
+
+
+def test_main(tmp_path, capsys):
+    path = str(tmp_path / "tuning.json")
+    argv = [path, "--generations", "2", "--population-size", "3", "--games", "2"]
+    assert main(argv + ["--processes", "1", "--bins", "4", "--pieces", "3"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split(":")[0] for line in lines] == ["Generation 0", "Generation 1"]
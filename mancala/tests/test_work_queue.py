@@ -0,0 +1,186 @@
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from mancala.batch import simulate_games
+from mancala.config import GameConfig
+from mancala.shared_results import pack_results
+from mancala.strategy import get_simple_strategies
+from mancala.work_queue import WorkQueue, WorkUnit, main, run_worker, serve_work_queue
+
+SMALL_CONFIG = GameConfig(4, 3)
+MATCHUPS = [
+    ("random-selection", "always-minimum"),
+    ("always-maximum", "random-selection"),
+]
+
+
+def _simulate(player_one, player_two, games, seed=0, first_game=0):
+    strategies = get_simple_strategies(SMALL_CONFIG)
+    return list(
+        simulate_games(
+            strategies[player_one],
+            strategies[player_two],
+            games,
+            seed=seed,
+            first_game=first_game,
+            config=SMALL_CONFIG,
+        )
+    )
+
+
+def _play(queue, unit_index):
+    unit = queue.units[unit_index]
+    return pack_results(
+        _simulate(
+            unit.player_one,
+            unit.player_two,
+            unit.stop - unit.start,
+            seed=unit.seed,
+            first_game=unit.start,
+        )
+    )
+
+
+def test_work_queue_reassigns_expired_leases():
+    now = [0.0]
+    queue = WorkQueue(
+        MATCHUPS[:1], 5, chunk_size=2, seed=1, lease_seconds=10, clock=lambda: now[0]
+    )
+    assert queue.units == [
+        WorkUnit("random-selection", "always-minimum", 1, 0, 2),
+        WorkUnit("random-selection", "always-minimum", 1, 2, 4),
+        WorkUnit("random-selection", "always-minimum", 1, 4, 5),
+    ]
+    assert [queue.lease(), queue.lease(), queue.lease()] == [0, 1, 2]
+    assert queue.lease() is None
+    assert queue.complete(1, _play(queue, 1))
+    now[0] = 10.0
+    # Units 0 and 2 were not played in time, unit 1 was
+    assert [queue.lease(), queue.lease(), queue.lease()] == [0, 2, None]
+    assert queue.remaining == 2
+
+
+def test_work_queue_merges_results_idempotently():
+    queue = WorkQueue(MATCHUPS, 5, chunk_size=2, seed=1)
+    with pytest.raises(ValueError):
+        queue.get_results(*MATCHUPS[0])
+    for unit_index in reversed(range(len(queue.units))):
+        assert queue.complete(unit_index, _play(queue, unit_index))
+    # A late worker posting a unit again changes nothing
+    assert not queue.complete(0, _play(queue, 0))
+    assert queue.done
+    assert queue.lease() is None
+    for matchup in MATCHUPS:
+        assert queue.get_results(*matchup) == _simulate(*matchup, 5, seed=1)
+
+
+def test_work_queue_rejects_incorrect_arguments():
+    with pytest.raises(ValueError):
+        WorkQueue(MATCHUPS, 5, chunk_size=0)
+    with pytest.raises(ValueError):
+        WorkQueue(MATCHUPS * 2, 5)
+    queue = WorkQueue(MATCHUPS, 5, chunk_size=2)
+    with pytest.raises(ValueError):
+        queue.complete(6, b"")
+    with pytest.raises(ValueError):
+        queue.complete(0, _play(queue, 0)[:-1])
+
+
+def _request(connection, request):
+    connection.sendall(json.dumps(request).encode() + b"\n")
+    return json.loads(connection.makefile().readline())
+
+
+def test_workers_play_every_unit(importable_package):
+    queue = WorkQueue(MATCHUPS, 12, chunk_size=3, seed=2, lease_seconds=0.5)
+
+    async def _run():
+        server = await serve_work_queue(queue, wait_seconds=0.05, config=SMALL_CONFIG)
+        port = server.sockets[0].getsockname()[1]
+        loop = asyncio.get_running_loop()
+
+        def _abandon_a_unit():
+            # A worker leasing a unit and going away without playing it
+            with socket.create_connection(("127.0.0.1", port)) as connection:
+                assert _request(connection, {"lease": True})["unit"] == 0
+                assert "error" in _request(connection, {"complete": 99})
+
+        await loop.run_in_executor(None, _abandon_a_unit)
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "-m", "mancala.work_queue", "work"]
+                + ["--port", str(port)],
+                stdout=subprocess.PIPE,
+            )
+            for _ in range(2)
+        ]
+        completed = await loop.run_in_executor(None, run_worker, "127.0.0.1", port)
+        # Workers only leave once every unit is played
+        outputs = await asyncio.gather(
+            *(loop.run_in_executor(None, worker.communicate) for worker in workers)
+        )
+        server.close()
+        await server.wait_closed()
+        return completed, [stdout for stdout, _ in outputs]
+
+    completed, outputs = asyncio.run(_run())
+    assert queue.done
+    assert completed + sum(int(output.split()[1]) for output in outputs) >= 8
+    for matchup in MATCHUPS:
+        assert queue.get_results(*matchup) == _simulate(*matchup, 12, seed=2)
+
+
+def test_workers_stop_on_coordinator_errors():
+    async def _run():
+        async def _handle(reader, writer):
+            await reader.readline()
+            writer.write(b'{"error": "broken"}\n')
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            with pytest.raises(ValueError):
+                await asyncio.get_running_loop().run_in_executor(
+                    None, run_worker, "127.0.0.1", port
+                )
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(_run())
+
+
+def _get_free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_workers_give_up_connecting():
+    with pytest.raises(ConnectionRefusedError):
+        run_worker("127.0.0.1", _get_free_port(), connect_timeout=0.2)
+
+
+def test_main(capsys):
+    port = str(_get_free_port())
+    worker = threading.Thread(target=main, args=(["work", "--port", port],))
+    worker.start()
+    argv = ["coordinate", "always-minimum:always-maximum", "--games", "4"]
+    assert main(argv + ["--chunk-size", "2", "--port", port, "--bins", "4"]) == 0
+    worker.join()
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == f"Coordinating 2 units on port {port}"
+    assert "Completed 2 units" in lines
+    assert lines[-1].startswith("always-minimum vs always-maximum: ")
+    with pytest.raises(SystemExit):
+        main(["coordinate", "always-minimum"])
+    with pytest.raises(SystemExit):
+        main(["coordinate", "always-minimum:no-such-strategy"])
@@ -0,0 +1,177 @@
+import heapq
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from mancala.batch import play_games
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Board, Player, Turn
+from mancala.simulation import GameResult, SimulationLoop
+from mancala.strategy import PlayerStrategy
+
+# How a stratified reservoir splits up games, by outcome and by length
+STRATA = ("player-one-wins", "player-two-wins", "ties", "longest", "shortest")
+UNSTRATIFIED = "all"
+
+_OUTCOME_STRATA: Dict[Optional[Player], str] = {
+    Player.ONE: "player-one-wins",
+    Player.TWO: "player-two-wins",
+    None: "ties",
+}
+
+
+@dataclass(frozen=True)
+class GameTrace:
+    game_index: int
+    result: GameResult
+    turns: Tuple[Turn, ...]
+    boards: Tuple[Board, ...]
+
+
+def _trace_game(game_index: int, loop: SimulationLoop) -> GameTrace:
+    return GameTrace(
+        game_index=game_index,
+        result=loop.get_result(),
+        turns=tuple(loop.turns),
+        boards=tuple(loop.boards),
+    )
+
+
+class MatchupSummary:
+    """Counts over every game of a matchup, in constant memory."""
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.wins: Dict[Optional[Player], int] = {Player.ONE: 0, Player.TWO: 0, None: 0}
+        self.adjudicated = 0
+        self.total_plies = 0
+        self.shortest_plies: Optional[int] = None
+        self.longest_plies: Optional[int] = None
+
+    @property
+    def mean_plies(self) -> float:
+        if self.games == 0:
+            raise ValueError("no games have been recorded")
+        return self.total_plies / self.games
+
+    def record(self, result: GameResult) -> None:
+        self.games += 1
+        self.wins[result.winning_player] += 1
+        self.adjudicated += result.adjudicated
+        self.total_plies += result.plies
+        if self.shortest_plies is None or result.plies < self.shortest_plies:
+            self.shortest_plies = result.plies
+        if self.longest_plies is None or result.plies > self.longest_plies:
+            self.longest_plies = result.plies
+
+
+class TraceReservoir:
+    """A uniform sample of at most `size` full game traces, in bounded memory.
+
+    Games are offered one at a time and kept with reservoir sampling, so
+    each game offered is equally likely to be in the sample however many
+    are played. When `stratified`, wins of each player and ties are sampled
+    separately and the `size` longest and shortest games are kept as well.
+    Traces are only built for the games kept.
+
+    """
+
+    def __init__(self, size: int, stratified: bool = False, seed: int = 0):
+        if size <= 0:
+            raise ValueError("size should be positive")
+        self._size = size
+        self._stratified = stratified
+        # Games reseed the global generator, so sampling draws from its own
+        self._rng = random.Random(seed)
+        strata = STRATA if stratified else (UNSTRATIFIED,)
+        self._samples: Dict[str, List[GameTrace]] = {name: [] for name in strata}
+        self._offered = {name: 0 for name in strata}
+        # Min-heaps whose root is the game to drop first
+        self._extremes: Dict[str, List[Tuple[int, int, GameTrace]]] = {
+            "longest": [],
+            "shortest": [],
+        }
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def stratified(self) -> bool:
+        return self._stratified
+
+    @property
+    def samples(self) -> Dict[str, List[GameTrace]]:
+        """The traces kept for each stratum, in the order they were played."""
+        samples = dict(self._samples)
+        if self._stratified:
+            for name, heap in self._extremes.items():
+                samples[name] = [trace for _, _, trace in heap]
+        return {
+            name: sorted(traces, key=lambda trace: trace.game_index)
+            for name, traces in samples.items()
+        }
+
+    def _sample(self, name: str, game_index: int, loop: SimulationLoop) -> None:
+        self._offered[name] += 1
+        traces = self._samples[name]
+        if len(traces) < self._size:
+            traces.append(_trace_game(game_index, loop))
+        else:
+            replaced = self._rng.randrange(self._offered[name])
+            if replaced < self._size:
+                traces[replaced] = _trace_game(game_index, loop)
+
+    def _keep_extreme(
+        self, name: str, length_key: int, game_index: int, loop: SimulationLoop
+    ) -> None:
+        heap = self._extremes[name]
+        # Ties in length keep the earlier games
+        key = (length_key, -game_index)
+        if len(heap) < self._size:
+            heapq.heappush(heap, (*key, _trace_game(game_index, loop)))
+        elif key > heap[0][:2]:
+            heapq.heapreplace(heap, (*key, _trace_game(game_index, loop)))
+
+    def offer(self, game_index: int, loop: SimulationLoop) -> None:
+        if not self._stratified:
+            self._sample(UNSTRATIFIED, game_index, loop)
+            return
+        self._sample(_OUTCOME_STRATA[loop.winning_player], game_index, loop)
+        plies = len(loop.turns)
+        self._keep_extreme("longest", plies, game_index, loop)
+        self._keep_extreme("shortest", -plies, game_index, loop)
+
+
+def simulate_games_with_traces(
+    player_one: PlayerStrategy,
+    player_two: PlayerStrategy,
+    games: int,
+    sample_size: int,
+    stratified: bool = False,
+    starting_player: Optional[Player] = None,
+    adjudicate_when_decided: bool = False,
+    seed: int = 0,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Tuple[MatchupSummary, TraceReservoir]:
+    """Play a matchup, counting every game but keeping only a sample of traces.
+
+    Games are seeded as with `mancala.batch.simulate_games`, so the traces
+    kept are those of the same games a batch run with `seed` plays.
+
+    """
+    summary = MatchupSummary()
+    reservoir = TraceReservoir(sample_size, stratified, seed)
+    loops = play_games(
+        player_one,
+        player_two,
+        games,
+        starting_player=starting_player,
+        adjudicate_when_decided=adjudicate_when_decided,
+        seed=seed,
+        config=config,
+    )
+    for game_index, loop in enumerate(loops):
+        summary.record(loop.get_result())
+        reservoir.offer(game_index, loop)
+    return summary, reservoir
@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from mancala.batch import simulate_games
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player
+from mancala.strategy import (
+    MOVE_FEATURES,
+    PlayerStrategy,
+    WeightedFeatureStrategy,
+    get_simple_strategies,
+)
+
+Weights = Tuple[float, ...]
+
+# Generations draw their random numbers from the seed and their number
+_GENERATION_SEED_STRIDE = 2 ** 20
+
+
+@dataclass(frozen=True)
+class Generation:
+    number: int
+    best_weights: Weights
+    best_fitness: float
+    mean_fitness: float
+
+
+def evaluate_weights(
+    weights: Weights,
+    reference: Sequence[PlayerStrategy],
+    games: int,
+    seed: int,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> float:
+    """Share of `games` games won against each of `reference`, ties counting half.
+
+    Games are seeded from `seed` and their index, so candidates evaluated
+    with the same seed meet the same starting players and random choices.
+
+    """
+    candidate = WeightedFeatureStrategy(weights, config)
+    score = 0.0
+    for opponent in reference:
+        for result in simulate_games(
+            candidate, opponent, games, seed=seed, config=config
+        ):
+            if result.winning_player is None:
+                score += 0.5
+            elif result.winning_player == Player.ONE:
+                score += 1
+    return score / (games * len(reference))
+
+
+def _read_checkpoint(path: str) -> Tuple[int, List[Weights]]:
+    with open(path) as f:
+        checkpoint = json.load(f)
+    return checkpoint["generation"], [tuple(w) for w in checkpoint["population"]]
+
+
+def _write_checkpoint(path: str, generation: int, population: List[Weights]) -> None:
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as f:
+        json.dump({"generation": generation, "population": population}, f)
+    os.replace(temporary_path, path)
+
+
+def _breed(
+    ranked: List[Weights],
+    population_size: int,
+    elite: int,
+    mutation_scale: float,
+    rng: random.Random,
+) -> List[Weights]:
+    """The next population: the elite unchanged, then mutated crossovers."""
+
+    def _select() -> Weights:
+        # The fitter of two candidates drawn at random
+        return ranked[min(rng.randrange(len(ranked)), rng.randrange(len(ranked)))]
+
+    population = ranked[:elite]
+    while len(population) < population_size:
+        first, second = _select(), _select()
+        population.append(
+            tuple(
+                rng.choice((a, b)) + rng.gauss(0, mutation_scale)
+                for a, b in zip(first, second)
+            )
+        )
+    return population
+
+
+def tune(
+    checkpoint_path: str,
+    generations: int,
+    population_size: int = 16,
+    games: int = 100,
+    elite: int = 2,
+    mutation_scale: float = 0.5,
+    seed: int = 0,
+    processes: Optional[int] = None,
+    reference: Optional[Sequence[PlayerStrategy]] = None,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> Iterator[Generation]:
+    """Evolve `WeightedFeatureStrategy` weights with a genetic algorithm.
+
+    Every candidate of a generation plays `games` games against each of the
+    `reference` strategies, the built-in ones by default, from the same
+    seed. Candidates are evaluated across `processes` worker processes.
+    The population is written to `checkpoint_path` after each generation
+    and a tuning run finding it there carries on from it, up to
+    `generations` generations in all. Yields each generation evaluated.
+
+    """
+    if population_size <= 0:
+        raise ValueError("population_size should be positive")
+    if not 0 <= elite <= population_size:
+        raise ValueError("elite should be between 0 and population_size")
+    if reference is None:
+        reference = list(get_simple_strategies(config).values())
+    if any(strategy.config != config for strategy in reference):
+        raise ValueError("reference strategies must use the same config")
+
+    if os.path.exists(checkpoint_path):
+        first_generation, population = _read_checkpoint(checkpoint_path)
+        if any(len(weights) != len(MOVE_FEATURES) for weights in population):
+            raise ValueError(f"{checkpoint_path} is not a checkpoint of these features")
+    else:
+        rng = random.Random(seed * _GENERATION_SEED_STRIDE)
+        first_generation = 0
+        population = [
+            tuple(rng.gauss(0, 1) for _ in MOVE_FEATURES)
+            for _ in range(population_size)
+        ]
+        _write_checkpoint(checkpoint_path, first_generation, population)
+
+    processes = processes or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=processes) if processes > 1 else None
+    try:
+        for number in range(first_generation, generations):
+            generation_seed = seed * _GENERATION_SEED_STRIDE + number
+            arguments = (
+                population,
+                [reference] * len(population),
+                [games] * len(population),
+                [generation_seed] * len(population),
+                [config] * len(population),
+            )
+            if executor is None:
+                fitnesses = list(map(evaluate_weights, *arguments))
+            else:
+                fitnesses = list(executor.map(evaluate_weights, *arguments))
+
+            order = sorted(range(len(population)), key=lambda i: -fitnesses[i])
+            ranked = [population[i] for i in order]
+            population = _breed(
+                ranked,
+                population_size,
+                elite,
+                mutation_scale,
+                random.Random(generation_seed + 1),
+            )
+            _write_checkpoint(checkpoint_path, number + 1, population)
+            yield Generation(
+                number=number,
+                best_weights=ranked[0],
+                best_fitness=fitnesses[order[0]],
+                mean_fitness=sum(fitnesses) / len(fitnesses),
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.tuning",
+        description="Tune the weights of a weighted-feature strategy.",
+    )
+    parser.add_argument("checkpoint_path")
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--population-size", type=int, default=16)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins)
+    parser.add_argument(
+        "--pieces", type=int, default=DEFAULT_GAME_CONFIG.number_of_starting_pieces
+    )
+    args = parser.parse_args(argv)
+
+    for generation in tune(
+        args.checkpoint_path,
+        args.generations,
+        population_size=args.population_size,
+        games=args.games,
+        seed=args.seed,
+        processes=args.processes,
+        config=GameConfig(args.bins, args.pieces),
+    ):
+        weights = ", ".join(f"{w:.3f}" for w in generation.best_weights)
+        print(
+            f"Generation {generation.number}: best {generation.best_fitness:.3f}"
+            f" (mean {generation.mean_fitness:.3f}) with weights {weights}"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())
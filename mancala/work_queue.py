@@ -0,0 +1,307 @@
+import argparse
+import asyncio
+import base64
+import json
+import socket
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from mancala.batch import simulate_games
+from mancala.config import DEFAULT_GAME_CONFIG, GameConfig
+from mancala.mancala import Player
+from mancala.shared_results import RESULT_ROW_SIZE, pack_results, unpack_results
+from mancala.simulation import GameResult
+from mancala.strategy import get_simple_strategies
+
+Matchup = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    player_one: str
+    player_two: str
+    seed: int
+    start: int
+    stop: int
+
+
+class WorkQueue:
+    """Games of several matchups split into units, leased out to workers.
+
+    A unit is leased to one worker at a time, and handed out again once its
+    lease has expired without a result, so units of workers that went away
+    are played by others. Results are blocks of result table rows. Units
+    are played from their own seed and index range, so any worker playing
+    one posts the same block, and only the first block is kept.
+
+    """
+
+    def __init__(
+        self,
+        matchups: Sequence[Matchup],
+        games: int,
+        chunk_size: int = 1000,
+        seed: int = 0,
+        lease_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size should be positive")
+        if len(set(matchups)) != len(matchups):
+            raise ValueError("matchups must be unique")
+        self._units = [
+            WorkUnit(
+                player_one, player_two, seed, start, min(start + chunk_size, games)
+            )
+            for player_one, player_two in matchups
+            for start in range(0, games, chunk_size)
+        ]
+        self._lease_seconds = lease_seconds
+        self._clock = clock
+        self._deadlines: Dict[int, float] = {}
+        self._blocks: Dict[int, bytes] = {}
+
+    @property
+    def units(self) -> List[WorkUnit]:
+        return self._units
+
+    @property
+    def remaining(self) -> int:
+        """How many units have no result yet."""
+        return len(self._units) - len(self._blocks)
+
+    @property
+    def done(self) -> bool:
+        return self.remaining == 0
+
+    def lease(self) -> Optional[int]:
+        """The index of a unit to play, or `None` while all are leased or done."""
+        now = self._clock()
+        for unit_index in range(len(self._units)):
+            if unit_index in self._blocks:
+                continue
+            if self._deadlines.get(unit_index, now) <= now:
+                self._deadlines[unit_index] = now + self._lease_seconds
+                return unit_index
+        return None
+
+    def complete(self, unit_index: int, block: bytes) -> bool:
+        """Record the results of a unit, returning whether they were new."""
+        if not 0 <= unit_index < len(self._units):
+            raise ValueError(f"there is no unit {unit_index}")
+        unit = self._units[unit_index]
+        if len(block) != (unit.stop - unit.start) * RESULT_ROW_SIZE:
+            raise ValueError(f"the results of unit {unit_index} are incomplete")
+        if unit_index in self._blocks:
+            return False
+        self._blocks[unit_index] = block
+        self._deadlines.pop(unit_index, None)
+        return True
+
+    def get_results(self, player_one: str, player_two: str) -> List[GameResult]:
+        """The results of every game of a matchup, in the order of the games."""
+        results = []
+        for unit_index, unit in enumerate(self._units):
+            if (unit.player_one, unit.player_two) != (player_one, player_two):
+                continue
+            if unit_index not in self._blocks:
+                raise ValueError(f"unit {unit_index} has not been played yet")
+            results.extend(unpack_results(self._blocks[unit_index]))
+        return results
+
+
+def _answer(
+    queue: WorkQueue, request: Dict[str, Any], wait_seconds: float, config: GameConfig
+) -> Dict[str, Any]:
+    if "complete" in request:
+        block = base64.b64decode(request["results"])
+        return {"accepted": queue.complete(int(request["complete"]), block)}
+    if queue.done:
+        return {"done": True}
+    unit_index = queue.lease()
+    if unit_index is None:
+        return {"wait": wait_seconds}
+    unit = queue.units[unit_index]
+    return {
+        "unit": unit_index,
+        "player_one": unit.player_one,
+        "player_two": unit.player_two,
+        "seed": unit.seed,
+        "start": unit.start,
+        "stop": unit.stop,
+        "bins": config.number_of_bins,
+        "pieces": config.number_of_starting_pieces,
+    }
+
+
+async def serve_work_queue(
+    queue: WorkQueue,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    wait_seconds: float = 0.5,
+    config: GameConfig = DEFAULT_GAME_CONFIG,
+) -> asyncio.base_events.Server:
+    """Hand out the units of `queue` to workers connecting over TCP.
+
+    Workers send one JSON object per line: `{"lease": true}` asks for a
+    unit, answered with the unit and its game config, with how long to
+    wait before asking again while every unit is leased, or with
+    `{"done": true}`. `{"complete": <unit>, "results": <base64 rows>}`
+    posts the results of a unit.
+
+    """
+
+    async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = _answer(queue, json.loads(line), wait_seconds, config)
+                except (ValueError, KeyError, TypeError) as error:
+                    reply = {"error": str(error)}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(_handle, host, port)
+
+
+def _connect(host: str, port: int, connect_timeout: float) -> socket.socket:
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            return socket.create_connection((host, port))
+        except ConnectionRefusedError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+
+def run_worker(host: str, port: int, connect_timeout: float = 10.0) -> int:
+    """Play units leased from a coordinator until it is done, returning how many.
+
+    Connection attempts are retried for `connect_timeout` seconds, so
+    workers can be started before the coordinator.
+
+    """
+    completed = 0
+    with _connect(host, port, connect_timeout) as connection:
+        stream = connection.makefile("rw")
+
+        def _request(request: Dict[str, Any]) -> Dict[str, Any]:
+            stream.write(json.dumps(request) + "\n")
+            stream.flush()
+            line = stream.readline()
+            # A coordinator going away has nothing left to hand out
+            reply = json.loads(line) if line else {"done": True}
+            if "error" in reply:
+                raise ValueError(f"the coordinator answered: {reply['error']}")
+            return reply
+
+        while True:
+            reply = _request({"lease": True})
+            if reply.get("done"):
+                return completed
+            if "wait" in reply:
+                time.sleep(reply["wait"])
+                continue
+
+            config = GameConfig(reply["bins"], reply["pieces"])
+            strategies = get_simple_strategies(config)
+            results = simulate_games(
+                strategies[reply["player_one"]],
+                strategies[reply["player_two"]],
+                reply["stop"] - reply["start"],
+                seed=reply["seed"],
+                first_game=reply["start"],
+                config=config,
+            )
+            block = base64.b64encode(pack_results(results)).decode("ascii")
+            reply = _request({"complete": reply["unit"], "results": block})
+            completed += bool(reply.get("accepted"))
+
+
+def _parse_matchup(text: str) -> Matchup:
+    player_one, separator, player_two = text.partition(":")
+    if not separator:
+        raise argparse.ArgumentTypeError("matchups are written player-one:player-two")
+    return player_one, player_two
+
+
+async def _coordinate(queue: WorkQueue, args: argparse.Namespace) -> None:
+    server = await serve_work_queue(
+        queue,
+        args.host,
+        args.port,
+        config=GameConfig(args.bins, args.pieces),
+    )
+    port = server.sockets[0].getsockname()[1]
+    print(f"Coordinating {len(queue.units)} units on port {port}", flush=True)
+    try:
+        while not queue.done:
+            await asyncio.sleep(0.1)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mancala.work_queue",
+        description="Spread the games of matchups over workers on several hosts.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    coordinator = subparsers.add_parser("coordinate")
+    coordinator.add_argument("matchups", nargs="+", type=_parse_matchup)
+    coordinator.add_argument("--games", type=int, default=10_000)
+    coordinator.add_argument("--chunk-size", type=int, default=1000)
+    coordinator.add_argument("--seed", type=int, default=0)
+    coordinator.add_argument("--lease-seconds", type=float, default=60.0)
+    coordinator.add_argument("--host", default="127.0.0.1")
+    coordinator.add_argument("--port", type=int, default=0)
+    coordinator.add_argument(
+        "--bins", type=int, default=DEFAULT_GAME_CONFIG.number_of_bins
+    )
+    coordinator.add_argument(
+        "--pieces", type=int, default=DEFAULT_GAME_CONFIG.number_of_starting_pieces
+    )
+    worker = subparsers.add_parser("work")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, required=True)
+    worker.add_argument("--connect-timeout", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "work":
+        completed = run_worker(args.host, args.port, args.connect_timeout)
+        print(f"Completed {completed} units")
+        return 0
+
+    strategies = get_simple_strategies(GameConfig(args.bins, args.pieces))
+    for matchup in args.matchups:
+        if any(name not in strategies for name in matchup):
+            parser.error(f"strategies must be one of {', '.join(sorted(strategies))}")
+    queue = WorkQueue(
+        args.matchups,
+        args.games,
+        chunk_size=args.chunk_size,
+        seed=args.seed,
+        lease_seconds=args.lease_seconds,
+    )
+    asyncio.run(_coordinate(queue, args))
+    for player_one, player_two in args.matchups:
+        results = queue.get_results(player_one, player_two)
+        wins = [
+            sum(r.winning_player == p for r in results)
+            for p in (Player.ONE, Player.TWO, None)
+        ]
+        print(f"{player_one} vs {player_two}: {wins[0]} / {wins[1]} / {wins[2]}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: nocover
+    sys.exit(main())